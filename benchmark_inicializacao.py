@@ -0,0 +1,87 @@
+# ==========================================================
+#   BENCHMARK DO TEMPO DE INICIALIZAÇÃO
+# ==========================================================
+# Mede o import "a frio" de cadastro_paciente (o que o main.py carrega antes de desenhar o menu)
+# com python -X importtime, em processos novos, e falha se passar do orçamento de tempo
+# ou se algum pacote pesado (pandas, requests, oracledb, tabulate, pyarrow) for carregado no início.
+#
+# Uso (no terminal):
+#   python benchmark_inicializacao.py
+#   python benchmark_inicializacao.py --orcamento-ms 150 --execucoes 10
+#
+# Retorna código de saída 1 quando o orçamento é estourado (pode ser usado em CI).
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+PACOTES_PESADOS = ["pandas", "requests", "oracledb", "tabulate", "pyarrow", "numpy"]
+
+
+def medir_import(_modulo: str) -> tuple[float, float, dict]:
+    """Importa o módulo em um processo novo. Retorna (tempo_import_ms, tempo_total_processo_ms, tempos_por_modulo_ms)."""
+    diretorio = os.path.dirname(os.path.abspath(__file__))
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {_modulo}"],
+        cwd=diretorio, capture_output=True, text=True, check=True
+    )
+    total_ms = (time.perf_counter() - inicio) * 1000
+
+    tempos = {}
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "|" not in linha:
+            continue
+        partes = linha[len("import time:"):].split("|")
+        if not partes[1].strip().isdigit():
+            continue  # linha de cabeçalho
+        nome = partes[2].strip()
+        tempos[nome] = int(partes[1]) / 1000
+
+    return tempos.get(_modulo, 0.0), total_ms, tempos
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mede o tempo de import de cadastro_paciente e compara com um orçamento.")
+    parser.add_argument("--modulo", default="cadastro_paciente", help="módulo a importar (padrão: cadastro_paciente)")
+    parser.add_argument("--execucoes", type=int, default=7, help="quantidade de processos medidos")
+    parser.add_argument("--orcamento-ms", type=float, default=100.0, help="tempo máximo de import (mediana), em ms")
+    args = parser.parse_args()
+
+    medidas_import = []
+    medidas_total = []
+    carregados = set()
+    for _ in range(args.execucoes):
+        tempo_import, tempo_total, tempos = medir_import(args.modulo)
+        medidas_import.append(tempo_import)
+        medidas_total.append(tempo_total)
+        carregados |= {nome.split(".")[0] for nome in tempos if nome.split(".")[0] in PACOTES_PESADOS}
+
+    mediana = statistics.median(medidas_import)
+    print(f"Import de {args.modulo}: mediana {mediana:.1f}ms | mín {min(medidas_import):.1f}ms | "
+          f"máx {max(medidas_import):.1f}ms ({args.execucoes} execuções)")
+    print(f"Processo completo (inclui o próprio interpretador): mediana {statistics.median(medidas_total):.1f}ms")
+
+    _, _, tempos = medir_import(args.modulo)
+    print("\nMódulos mais lentos (tempo acumulado):")
+    for nome, ms in sorted(tempos.items(), key=lambda item: item[1], reverse=True)[:8]:
+        print(f"  {ms:8.1f}ms  {nome}")
+
+    falhou = False
+    if carregados:
+        print(f"\nFALHA: pacotes pesados carregados na inicialização: {', '.join(sorted(carregados))}")
+        falhou = True
+    if mediana > args.orcamento_ms:
+        print(f"\nFALHA: import levou {mediana:.1f}ms, acima do orçamento de {args.orcamento_ms:.0f}ms")
+        falhou = True
+
+    if not falhou:
+        print(f"\nOK: dentro do orçamento de {args.orcamento_ms:.0f}ms e sem pacotes pesados no início.")
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+# ==========================================================
+#   BENCHMARK DO ACESSO A DADOS E DA RENDERIZAÇÃO
+# ==========================================================
+# Popula bancos SQLite locais com 10 mil, 100 mil e 1 milhão de pacientes sintéticos (sempre os mesmos dados)
+# e mede os caminhos mais usados do programa:
+#   - banco: select_paciente, select_paciente_por_id, select_paciente_pagina, insert_paciente, insert_pacientes_em_lote,
+#            consultar_paciente_por_texto (contém / prefixo), consultar_paciente_composto, exportar_pacientes_stream
+#   - memória: exportar_para_json, imprimir_resultado_tabulate_oracle e formatar_valor sobre uma amostra
+#
+# Para cada caso registra vazão, latências p50/p95/p99 e o pico de memória alocada (tracemalloc, em uma execução à parte),
+# e compara com a base salva: piora acima da tolerância é marcada como REGRESSÃO (código de saída 1).
+# Os bancos ficam em --diretorio e são reaproveitados nas próximas execuções
+# (a primeira carga de 1 milhão de pacientes, com o índice de trigramas, leva alguns minutos).
+#
+# Uso (no terminal):
+#   python benchmark_pacientes.py --salvar-base                 (mede e grava benchmark_base.json)
+#   python benchmark_pacientes.py                               (mede e compara com a base)
+#   python benchmark_pacientes.py --tamanhos 10000 --consultas 500 --tolerancia 0.3
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+import tracemalloc
+
+from benchmark_tabela import gerar_pacientes_sinteticos, dados_cadastro
+from cadastro_paciente import (
+    COMANDO_INSERT_PACIENTE,
+    CAMPOS_PREVIEW,
+    conectar_sqlite,
+    contar_pacientes,
+    reconstruir_indice_trigramas,
+    select_paciente,
+    select_paciente_stream,
+    select_paciente_por_id,
+    select_paciente_pagina,
+    insert_paciente,
+    insert_pacientes_em_lote,
+    consultar_paciente_por_texto,
+    consultar_paciente_composto,
+    exportar_para_json,
+    imprimir_resultado_tabulate_oracle,
+    formatar_valor,
+    limpar_cache_preview,
+    remover_do_indice_fuzzy,
+)
+from exportacao_pacientes import exportar_pacientes_stream
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000]
+TAMANHO_LOTE_CARGA = 5000
+ARQUIVO_BASE_PADRAO = "benchmark_base.json"
+TEXTOS_BUSCA = ["silva", "souza", "oliveira", "pereira", "araujo", "carvalho"]
+PREFIXOS_BUSCA = ["ana", "bru", "car", "die", "ela", "fab", "gab", "hei", "iri", "joa"]
+MARGEM_ABSOLUTA_MS = 1.0
+MARGEM_ABSOLUTA_KIB = 512
+
+
+# ========= CARGA DOS DADOS SINTÉTICOS =========
+def popular_banco(_caminho: str, _quantidade: int) -> float:
+    """Cria (ou reaproveita) o banco com _quantidade pacientes sintéticos e o índice de trigramas.
+    Retorna o tempo gasto na carga, em segundos (0 quando o banco já estava pronto)."""
+    sucesso, conexao = conectar_sqlite(_caminho)
+    if not sucesso:
+        raise RuntimeError(f"Erro ao abrir {_caminho}: {conexao}")
+
+    try:
+        _, total = contar_pacientes(conexao)
+        if total == _quantidade:
+            return 0.0
+
+        inicio = time.perf_counter()
+        conexao.execute("DELETE FROM T_PACIENTE_TRIGRAMA")
+        conexao.execute("DELETE FROM T_PACIENTE")
+        conexao.commit()
+
+        cur = conexao.cursor()
+        for numero_lote, posicao in enumerate(range(0, _quantidade, TAMANHO_LOTE_CARGA)):
+            tamanho = min(TAMANHO_LOTE_CARGA, _quantidade - posicao)
+            linhas = []
+            for paciente in gerar_pacientes_sinteticos(tamanho, _semente=numero_lote):
+                linhas.append(dados_cadastro(paciente))
+            cur.executemany(COMANDO_INSERT_PACIENTE, linhas)
+            conexao.commit()
+            print(f"\r  carregando {_quantidade:,} pacientes: {posicao + tamanho:,}", end="", flush=True)
+        cur.close()
+
+        sucesso, erro = reconstruir_indice_trigramas(conexao)
+        if not sucesso:
+            raise RuntimeError(f"Erro ao indexar trigramas: {erro}")
+        conexao.execute("ANALYZE")
+        print()
+
+        return time.perf_counter() - inicio
+
+    finally:
+        conexao.close()
+
+# ========= MEDIÇÃO =========
+def percentil(_valores: list[float], _p: int) -> float:
+    """Percentil _p (1 a 99) dos tempos medidos."""
+    if len(_valores) < 2:
+        return _valores[0] if _valores else 0.0
+    return statistics.quantiles(_valores, n=100, method="inclusive")[_p - 1]
+
+def medir_caso(_funcao, _execucoes: int, _unidades: int) -> dict:
+    """
+    Executa _funcao(i) _execucoes vezes (i = número da execução) e mais uma vez com tracemalloc ligado.
+    _unidades é a quantidade processada por execução (linhas, consultas...), usada no cálculo da vazão.
+    Retorna p50/p95/p99 (ms), vazão (unidades/s) e pico de memória (KiB).
+    """
+    tempos = []
+    for i in range(_execucoes):
+        inicio = time.perf_counter()
+        _funcao(i)
+        tempos.append(time.perf_counter() - inicio)
+
+    # O tracemalloc deixa o código bem mais lento: a memória é medida numa execução separada
+    tracemalloc.start()
+    try:
+        _funcao(_execucoes)
+        pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    mediana = statistics.median(tempos)
+    return {
+        "execucoes": _execucoes,
+        "p50_ms": mediana * 1000,
+        "p95_ms": percentil(tempos, 95) * 1000,
+        "p99_ms": percentil(tempos, 99) * 1000,
+        "vazao": _unidades / mediana if mediana else 0.0,
+        "pico_memoria_kib": pico / 1024
+    }
+
+def _exigir(_resultado: tuple, _caso: str):
+    """Interrompe o benchmark se a função medida devolveu (False, erro)."""
+    sucesso, valor = _resultado
+    if not sucesso:
+        raise RuntimeError(f"{_caso}: {valor}")
+    return valor
+
+def _exigir_registros(_resultado: tuple, _caso: str):
+    """Como _exigir, mas também interrompe se a busca não encontrou nada: os textos buscados
+    sempre existem nos dados sintéticos, então uma lista vazia indica busca quebrada (e tempo irreal)."""
+    registros = _exigir(_resultado, _caso)
+    if not registros:
+        raise RuntimeError(f"{_caso}: a busca não retornou pacientes.")
+    return registros
+
+def medir_tamanho(_caminho: str, _quantidade: int, _repeticoes: int, _consultas: int, _buscas: int, _amostra: int) -> dict:
+    """Mede todos os casos no banco com _quantidade pacientes. Retorna {caso: métricas}.
+    _consultas vale para os casos de uma linha (por ID, página, cadastro) e _buscas para as buscas textuais/compostas."""
+    sucesso, conexao = conectar_sqlite(_caminho)
+    if not sucesso:
+        raise RuntimeError(f"Erro ao abrir {_caminho}: {conexao}")
+
+    aleatorio = random.Random(_quantidade)
+    ids = [aleatorio.randint(1, _quantidade) for _ in range(_consultas + 1)]
+    textos = [aleatorio.choice(TEXTOS_BUSCA) for _ in range(_buscas + 1)]
+    prefixos = [aleatorio.choice(PREFIXOS_BUSCA) for _ in range(_buscas + 1)]
+    numeros = [aleatorio.randint(1, 2990) for _ in range(_buscas + 1)]
+    novos = [dados_cadastro(paciente) for paciente in gerar_pacientes_sinteticos(_consultas + 1, _semente=-1)]
+    lote_novos = [dados_cadastro(paciente) for paciente in gerar_pacientes_sinteticos(TAMANHO_LOTE_CARGA, _semente=-2)]
+    diretorio_saida = tempfile.mkdtemp(prefix="benchmark_pacientes_")
+
+    amostra = list(select_paciente_stream(conexao, "*", _filtro_sql=f"WHERE ID_PACIENTE <= {_amostra} ORDER BY ID_PACIENTE"))
+    celulas = [valor for registro in amostra for valor in registro.values()]
+
+    casos = [
+        ("select_paciente", lambda i: _exigir(select_paciente(conexao, CAMPOS_PREVIEW), "select_paciente"),
+         _repeticoes, _quantidade),
+        ("select_paciente_por_id", lambda i: _exigir(select_paciente_por_id(conexao, "*", ids[i]), "select_paciente_por_id"),
+         _consultas, 1),
+        ("select_paciente_pagina", lambda i: _exigir(select_paciente_pagina(conexao, CAMPOS_PREVIEW, _apos_id=ids[i]), "select_paciente_pagina"),
+         _consultas, 1),
+        ("insert_paciente", lambda i: _exigir(insert_paciente(conexao, novos[i]), "insert_paciente"),
+         _consultas, 1),
+        ("insert_pacientes_em_lote", lambda i: _exigir(insert_pacientes_em_lote(conexao, lote_novos), "insert_pacientes_em_lote"),
+         _repeticoes, len(lote_novos)),
+        ("buscar_texto_contem", lambda i: _exigir_registros(consultar_paciente_por_texto(
+            conexao, "NM_COMPLETO", textos[i], "ID_PACIENTE, NM_COMPLETO"), "buscar_texto_contem"),
+         _buscas, 1),
+        ("buscar_texto_prefixo", lambda i: _exigir_registros(consultar_paciente_por_texto(
+            conexao, "NM_COMPLETO", prefixos[i], "ID_PACIENTE, NM_COMPLETO", "prefixo"), "buscar_texto_prefixo"),
+         _buscas, 1),
+        # Igualdade em um número sorteado: pode não haver paciente, então só falhas interrompem
+        ("buscar_composto", lambda i: _exigir(consultar_paciente_composto(conexao, [
+            {"tipo": "numero", "coluna": "NUMERO_ENDERECO", "operador": "=", "valor": numeros[i]},
+            {"tipo": "em", "coluna": "STATUS_CONSULTA", "valores": ["Agendada", "Realizada"]}
+         ], "ID_PACIENTE, NM_COMPLETO"), "buscar_composto"), _buscas, 1),
+        ("exportar_pacientes_stream", lambda i: _exigir(exportar_pacientes_stream(
+            conexao, os.path.join(diretorio_saida, "pacientes.ndjson"), _formato="ndjson"), "exportar_pacientes_stream"),
+         _repeticoes, _quantidade),
+        ("exportar_para_json", lambda i: _exigir(exportar_para_json(amostra, os.path.join(diretorio_saida, "amostra.json")), "exportar_para_json"),
+         _repeticoes, len(amostra)),
+        ("imprimir_resultado_tabulate_oracle", lambda i: _exigir(imprimir_resultado_tabulate_oracle(amostra), "imprimir_resultado_tabulate_oracle"),
+         _repeticoes, len(amostra)),
+        ("formatar_valor", lambda i: [formatar_valor(valor) for valor in celulas],
+         _repeticoes, len(celulas)),
+    ]
+
+    maior_id = conexao.execute("SELECT MAX(ID_PACIENTE) FROM T_PACIENTE").fetchone()[0]
+    maior_exclusao = conexao.execute("SELECT COALESCE(MAX(ID_EXCLUSAO), 0) FROM T_PACIENTE_EXCLUIDO").fetchone()[0]
+    resultados = {}
+    try:
+        for nome, funcao, execucoes, unidades in casos:
+            limpar_cache_preview()
+            resultados[nome] = medir_caso(funcao, execucoes, unidades)
+            print(f"  {nome:<36} {resultados[nome]['p50_ms']:>10.2f}ms", flush=True)
+    finally:
+        # Desfaz os cadastros dos casos de insert (e as marcas de exclusão geradas pelo trigger)
+        # para o banco continuar reaproveitável
+        conexao.execute("DELETE FROM T_PACIENTE WHERE ID_PACIENTE > :maior_id", {"maior_id": maior_id})
+        conexao.execute("DELETE FROM T_PACIENTE_EXCLUIDO WHERE ID_EXCLUSAO > :maior_exclusao", {"maior_exclusao": maior_exclusao})
+        conexao.commit()
+        remover_do_indice_fuzzy()
+        conexao.close()
+        shutil.rmtree(diretorio_saida, ignore_errors=True)
+
+    return resultados
+
+# ========= COMPARAÇÃO COM A BASE =========
+def comparar_com_base(_atual: dict, _base: dict, _tolerancia: float) -> list[str]:
+    """Lista as regressões: p50 ou pico de memória acima da base + tolerância.
+    Diferenças menores que MARGEM_ABSOLUTA_MS / MARGEM_ABSOLUTA_KIB são ruído de medição e não contam."""
+    regressoes = []
+    for tamanho, casos in _atual.items():
+        for caso, metricas in casos.items():
+            referencia = _base.get(tamanho, {}).get(caso)
+            if not referencia:
+                continue
+            if metricas["p50_ms"] > max(referencia["p50_ms"] * (1 + _tolerancia), referencia["p50_ms"] + MARGEM_ABSOLUTA_MS):
+                regressoes.append(f"{tamanho} {caso}: p50 {referencia['p50_ms']:.2f}ms -> {metricas['p50_ms']:.2f}ms")
+            if metricas["pico_memoria_kib"] > max(referencia["pico_memoria_kib"] * (1 + _tolerancia),
+                                                  referencia["pico_memoria_kib"] + MARGEM_ABSOLUTA_KIB):
+                regressoes.append(f"{tamanho} {caso}: memória {referencia['pico_memoria_kib']:.0f}KiB -> {metricas['pico_memoria_kib']:.0f}KiB")
+    return regressoes
+
+def imprimir_relatorio(_atual: dict, _base: dict) -> None:
+    print(f"\n{'tamanho':>9} | {'caso':<36} | {'p50':>10} | {'p99':>10} | {'vazão/s':>12} | {'memória':>10} | vs base")
+    print("-" * 112)
+    for tamanho, casos in _atual.items():
+        for caso, metricas in casos.items():
+            referencia = _base.get(tamanho, {}).get(caso)
+            comparacao = f"{metricas['p50_ms'] / referencia['p50_ms']:.2f}x" if referencia and referencia["p50_ms"] else "-"
+            print(f"{int(tamanho):>9,} | {caso:<36} | {metricas['p50_ms']:>8.2f}ms | {metricas['p99_ms']:>8.2f}ms | "
+                  f"{metricas['vazao']:>12,.0f} | {metricas['pico_memoria_kib']:>7.0f}KiB | {comparacao}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de consultas, cadastro, busca, exportação e renderização de pacientes.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO, help="quantidades de pacientes nos bancos")
+    parser.add_argument("--repeticoes", type=int, default=3, help="execuções dos casos de tabela inteira / amostra")
+    parser.add_argument("--consultas", type=int, default=200, help="execuções dos casos de uma consulta / um cadastro")
+    parser.add_argument("--buscas", type=int, default=20, help="execuções dos casos de busca (texto e composta)")
+    parser.add_argument("--amostra", type=int, default=2000, help="linhas da amostra usada na exportação JSON e na tabela")
+    parser.add_argument("--diretorio", default="benchmark_dados", help="onde os bancos SQLite ficam guardados")
+    parser.add_argument("--base", default=ARQUIVO_BASE_PADRAO, help=f"arquivo da base de comparação (padrão: {ARQUIVO_BASE_PADRAO})")
+    parser.add_argument("--salvar-base", action="store_true", help="grava os resultados como nova base")
+    parser.add_argument("--tolerancia", type=float, default=0.20, help="piora aceita antes de marcar regressão (padrão: 0.20)")
+    args = parser.parse_args()
+
+    os.makedirs(args.diretorio, exist_ok=True)
+
+    atual = {}
+    for quantidade in args.tamanhos:
+        caminho = os.path.join(args.diretorio, f"benchmark_pacientes_{quantidade}.db")
+        tempo_carga = popular_banco(caminho, quantidade)
+        if tempo_carga:
+            print(f"  banco com {quantidade:,} pacientes criado em {tempo_carga:.1f}s")
+
+        print(f"\nMedindo {quantidade:,} pacientes:")
+        atual[str(quantidade)] = medir_tamanho(caminho, quantidade, args.repeticoes, args.consultas, args.buscas, args.amostra)
+
+    base = {}
+    if os.path.exists(args.base):
+        with open(args.base, "r", encoding="utf-8") as arquivo:
+            base = json.load(arquivo).get("resultados", {})
+
+    imprimir_relatorio(atual, base)
+
+    if args.salvar_base:
+        # Mantém na base os tamanhos que não foram medidos desta vez
+        with open(args.base, "w", encoding="utf-8") as arquivo:
+            json.dump({
+                "python": platform.python_version(),
+                "plataforma": platform.platform(),
+                "gerado_em": time.strftime("%d/%m/%Y %H:%M"),
+                "resultados": {**base, **atual}
+            }, arquivo, ensure_ascii=False, indent=4)
+        print(f"\nBase gravada em {args.base}")
+        return 0
+
+    if not base:
+        print(f"\nSem base para comparar ({args.base}). Rode com --salvar-base para criar uma.")
+        return 0
+
+    regressoes = comparar_com_base(atual, base, args.tolerancia)
+    if regressoes:
+        print(f"\nREGRESSÃO (tolerância de {args.tolerancia:.0%}):")
+        for regressao in regressoes:
+            print(f"  {regressao}")
+        return 1
+
+    print(f"\nOK: nenhuma regressão acima de {args.tolerancia:.0%} em relação à base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# ==========================================================
+#   BENCHMARK DA IMPRESSÃO DE TABELAS
+# ==========================================================
+# Compara o renderizador fancy_grid sem pandas (imprimir_resultado_tabulate_oracle / gerar_linhas_tabela)
+# com o caminho anterior (pandas + formatar_valor via apply + tabulate).
+# Os dados são pacientes sintéticos com as mesmas colunas de T_PACIENTE; não precisa de banco.
+#
+# Uso (no terminal):
+#   python benchmark_tabela.py
+#   python benchmark_tabela.py --linhas 100 1000 5000 --repeticoes 3
+
+import sys
+import time
+import random
+import argparse
+from datetime import datetime, date, timedelta
+
+from cadastro_paciente import (
+    gerar_linhas_tabela,
+    imprimir_resultado_tabulate_oracle,
+    imprimir_resultado_tabulate_pandas,
+)
+
+
+def gerar_pacientes_sinteticos(_quantidade: int, _semente: int = 42) -> list[dict]:
+    """Gera registros no formato devolvido pelas consultas (chaves em maiúsculas, datas como datetime)."""
+    aleatorio = random.Random(_semente)
+    nomes = ["Ana", "Bruno", "Carla", "Diego", "Elaine", "Fábio", "Gabriela", "Heitor", "Íris", "João"]
+    sobrenomes = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Lima", "Carvalho", "Araújo"]
+    especialidades = ["Cardiologia", "Dermatologia", "Ortopedia", "Pediatria", "Clínico Geral"]
+    status = ["Agendada", "Realizada", "Cancelada"]
+    inicio = datetime(2025, 1, 1, 8, 0)
+
+    pacientes = []
+    for i in range(1, _quantidade + 1):
+        pacientes.append({
+            "ID_PACIENTE": i,
+            "NM_COMPLETO": f"{aleatorio.choice(nomes)} {aleatorio.choice(sobrenomes)} {aleatorio.choice(sobrenomes)} de Almeida",
+            "DT_NASCIMENTO": date(1950, 1, 1) + timedelta(days=aleatorio.randint(0, 25000)),
+            "SEXO": aleatorio.choice("MF"),
+            "CPF": f"{aleatorio.randint(0, 99999999999):011d}",
+            "CEP": f"{aleatorio.randint(1000000, 99999999):08d}",
+            "RUA": "Avenida Paulista, conjunto comercial",
+            "CIDADE": "São Paulo",
+            "ESTADO": "SP",
+            "NUMERO_ENDERECO": aleatorio.randint(1, 3000),
+            "EMAIL": f"paciente{i}@exemplo.com.br",
+            "DT_HORA_CONSULTA": inicio + timedelta(minutes=30 * aleatorio.randint(0, 20000)),
+            "ESPECIALIDADE": aleatorio.choice(especialidades),
+            "STATUS_CONSULTA": aleatorio.choice(status),
+        })
+    return pacientes
+
+
+def dados_cadastro(_paciente: dict) -> dict:
+    """Converte um registro de gerar_pacientes_sinteticos no dicionário de solicitar_dados_paciente
+    (o formato de insert_paciente, insert_pacientes_em_lote e do POST /pacientes)."""
+    return {
+        "nome_completo": _paciente["NM_COMPLETO"],
+        "data_nascimento": _paciente["DT_NASCIMENTO"].strftime("%d/%m/%Y"),
+        "sexo": _paciente["SEXO"],
+        "cpf": _paciente["CPF"],
+        "rg": _paciente["CPF"][:9],
+        "estado_civil": "Solteiro",
+        "cep": _paciente["CEP"],
+        "rua": _paciente["RUA"],
+        "bairro": "Bela Vista",
+        "cidade": _paciente["CIDADE"],
+        "estado": _paciente["ESTADO"],
+        "numero_endereco": _paciente["NUMERO_ENDERECO"],
+        "celular": "11999990000",
+        "email": _paciente["EMAIL"],
+        "brasileiro": "S",
+        "convenio": "N",
+        "data_hora_consulta": _paciente["DT_HORA_CONSULTA"].strftime("%d/%m/%Y %H:%M"),
+        "tipo_consulta": "Rotina",
+        "especialidade": _paciente["ESPECIALIDADE"],
+        "status_consulta": _paciente["STATUS_CONSULTA"],
+    }
+
+
+def medir(_funcao, _repeticoes: int) -> float:
+    """Menor tempo (em segundos) entre as repetições."""
+    melhor = float("inf")
+    for _ in range(_repeticoes):
+        inicio = time.perf_counter()
+        _funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compara o renderizador de tabelas sem pandas com o caminho pandas + tabulate.")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100, 1000, 5000], help="tamanhos de resultado a medir")
+    parser.add_argument("--repeticoes", type=int, default=3, help="repetições por medida (vale o menor tempo)")
+    args = parser.parse_args()
+
+    print(f"{'linhas':>8} | {'pandas+tabulate':>15} | {'novo':>10} | {'1ª linha':>10} | {'ganho':>7} | saída idêntica")
+    print("-" * 78)
+
+    for quantidade in args.linhas:
+        dados = gerar_pacientes_sinteticos(quantidade)
+
+        tempo_antigo = medir(lambda: imprimir_resultado_tabulate_pandas(dados), args.repeticoes)
+        tempo_novo = medir(lambda: imprimir_resultado_tabulate_oracle(dados), args.repeticoes)
+        tempo_primeira_linha = medir(lambda: next(gerar_linhas_tabela(dados)), args.repeticoes)
+
+        identica = imprimir_resultado_tabulate_pandas(dados)[1] == imprimir_resultado_tabulate_oracle(dados)[1]
+
+        print(f"{quantidade:>8} | {tempo_antigo * 1000:>13.1f}ms | {tempo_novo * 1000:>8.1f}ms | "
+              f"{tempo_primeira_linha * 1000:>8.1f}ms | {tempo_antigo / tempo_novo:>6.1f}x | {'sim' if identica else 'NÃO'}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@
 #         pip install tabulate
 #         pip install requests
 #         pip install pandas
+#         pip install pyarrow   (opcional, para exportar em Parquet/Arrow; ver exportacao_pacientes.py)
 
 # COMANDO SQL PARA ORACLE:
 
@@ -49,6 +50,31 @@ FOR EACH ROW
 BEGIN
     :NEW.DT_ULTIMA_ATUALIZACAO := SYSTIMESTAMP;
 END;
+
+-- Índice usado pela atualização incremental do preview (registros alterados desde a última leitura)
+CREATE INDEX IX_PACIENTE_DT_ATUALIZACAO ON T_PACIENTE (DT_ULTIMA_ATUALIZACAO);
+
+-- Registro de exclusões (tombstones) usado pela exportação delta
+-- ID_PACIENTE nulo indica que todos os pacientes foram apagados de uma vez
+CREATE TABLE T_PACIENTE_EXCLUIDO (
+    ID_EXCLUSAO        NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    ID_PACIENTE        NUMBER,
+    DT_EXCLUSAO        TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+);
+
+CREATE INDEX IX_PAC_EXCLUIDO_DT ON T_PACIENTE_EXCLUIDO (DT_EXCLUSAO);
+
+-- Trigger que registra cada paciente removido
+CREATE OR REPLACE TRIGGER trg_t_paciente_exclusao
+AFTER DELETE ON T_PACIENTE
+FOR EACH ROW
+BEGIN
+    INSERT INTO T_PACIENTE_EXCLUIDO (ID_PACIENTE) VALUES (:OLD.ID_PACIENTE);
+END;
+
+-- Busca textual indexada (índices de prefixo e tabela de trigramas T_PACIENTE_TRIGRAMA):
+-- execute uma vez no Python: criar_estruturas_busca_textual(conn)
+-- (os comandos podem ser vistos com gerar_ddl_busca_textual())
 """
 
 # Este programa utiliza a API pública do ViaCEP para consultar informações de endereços
@@ -59,18 +85,53 @@ END;
 
 # Execute o programa pelo arquivo principal: main.py
 # (no terminal: python main.py)
+# Sem Oracle, com o banco SQLite local: PACIENTES_BACKEND=sqlite python main.py
+
+from __future__ import annotations
 
 # --- Bibliotecas padrão ---
 import os
 import re
+import sys
 import json
-from datetime import datetime, date
-
-# --- Pacotes externos ---
-import oracledb
-import requests
-import pandas as pd
-from tabulate import tabulate
+import csv
+import gzip
+import mmap
+import time
+import struct
+import sqlite3
+import itertools
+import threading
+import importlib.util
+from datetime import datetime, date, timedelta
+from functools import lru_cache
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Pacotes externos (carregados no primeiro uso) ---
+# Os pacotes pesados só são importados de fato quando algum atributo deles é usado,
+# para que o menu apareça sem esperar pelo pandas/requests/oracledb.
+# O tabulate é importado dentro de imprimir_resultado_tabulate_pandas e o pyarrow em exportacao_pacientes.py.
+def _importar_sob_demanda(_nome: str):
+    """Registra o módulo em sys.modules sem executá-lo (importlib.util.LazyLoader).
+    O import acontece no primeiro acesso a um atributo. Retorna None se o pacote não estiver instalado."""
+    if _nome in sys.modules:
+        return sys.modules[_nome]
+
+    spec = importlib.util.find_spec(_nome)
+    if spec is None:
+        return None
+
+    carregador = importlib.util.LazyLoader(spec.loader)
+    spec.loader = carregador
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[_nome] = modulo
+    carregador.exec_module(modulo)
+    return modulo
+
+oracledb = _importar_sob_demanda("oracledb")
+requests = _importar_sob_demanda("requests")
+pd = _importar_sob_demanda("pandas")
 
 # ==========================================================
 #   SUBALGORITMOS
@@ -287,6 +348,33 @@ def obter_multiplas_opcoes_dict(_msg_input: str, _msg_erro: str, _opcoes_dict: d
 
     return valores_str, valores_lista
 
+def obter_lista_ids(_msg_input: str, _msg_erro: str) -> list[int]:
+    """Solicita uma lista de IDs separados por vírgula, aceitando também faixas (ex: 1, 5, 10-20).
+    Retorna os IDs sem repetição, na ordem em que foram digitados."""
+
+    ids = []
+
+    while not ids:
+        entrada = input(_msg_input).strip()
+
+        try:
+            for parte in entrada.split(","):
+                parte = parte.strip()
+                if not parte:
+                    continue
+                if "-" in parte:
+                    inicio, fim = (int(p) for p in parte.split("-", 1))
+                    ids.extend(range(min(inicio, fim), max(inicio, fim) + 1))
+                else:
+                    ids.append(int(parte))
+        except ValueError:
+            ids = []
+
+        if not ids:
+            print(f"{_msg_erro}\n")
+
+    return list(dict.fromkeys(ids))
+
 # ==========================================================
 #   VALIDAÇÃO DE DADOS PARA CADASTRO (PACIENTE)
 # ==========================================================
@@ -363,8 +451,548 @@ def obter_rg(_msg_input: str, _msg_erro: str) -> str:
 
     return rg
 
+# ==========================================================
+#   CACHE DE CEP (SQLITE LOCAL)
+# ==========================================================
+
+# Configuração da consulta ao ViaCEP e do cache persistente de CEPs.
+CONFIG_VIACEP = {
+    "url_base": "https://viacep.com.br/ws",
+    "timeout_segundos": 5
+}
+
+CONFIG_CACHE_CEP = {
+    "caminho": "cache_cep.db",
+    "ttl_segundos": 30 * 24 * 60 * 60,       # endereços válidos: 30 dias
+    "ttl_negativo_segundos": 24 * 60 * 60,   # CEPs inexistentes ("erro"): 1 dia
+    "tamanho_max": 50000                     # acima disso remove os menos usados (LRU)
+}
+
+ESTATISTICAS_CACHE_CEP = {
+    "acertos": 0,
+    "acertos_negativos": 0,
+    "falhas": 0,
+    "expirados": 0,
+    "removidos_lru": 0
+}
+
+_estado_cache_cep = {"conexao": None, "trava": threading.Lock()}
+
+def _abrir_cache_cep() -> sqlite3.Connection:
+    """Abre (uma única vez) o arquivo SQLite do cache de CEP e cria a tabela se necessário."""
+    if _estado_cache_cep["conexao"] is None:
+        conexao_cache = sqlite3.connect(CONFIG_CACHE_CEP["caminho"], check_same_thread=False)
+        conexao_cache.execute("""
+            CREATE TABLE IF NOT EXISTS T_CACHE_CEP (
+                CEP              TEXT PRIMARY KEY,
+                DADOS            TEXT,
+                ENCONTRADO       INTEGER NOT NULL,
+                DT_GRAVACAO      REAL NOT NULL,
+                DT_ULTIMO_ACESSO REAL NOT NULL
+            )
+        """)
+        conexao_cache.execute("CREATE INDEX IF NOT EXISTS IX_CACHE_CEP_ACESSO ON T_CACHE_CEP (DT_ULTIMO_ACESSO)")
+        conexao_cache.commit()
+        _estado_cache_cep["conexao"] = conexao_cache
+    return _estado_cache_cep["conexao"]
+
+def configurar_cache_cep(caminho: str = None, ttl_segundos: int = None,
+                         ttl_negativo_segundos: int = None, tamanho_max: int = None) -> None:
+    """Altera a configuração do cache de CEP. Trocar o caminho fecha o arquivo atual."""
+    with _estado_cache_cep["trava"]:
+        if caminho is not None and caminho != CONFIG_CACHE_CEP["caminho"]:
+            if _estado_cache_cep["conexao"] is not None:
+                _estado_cache_cep["conexao"].close()
+                _estado_cache_cep["conexao"] = None
+            CONFIG_CACHE_CEP["caminho"] = caminho
+        if ttl_segundos is not None:
+            CONFIG_CACHE_CEP["ttl_segundos"] = ttl_segundos
+        if ttl_negativo_segundos is not None:
+            CONFIG_CACHE_CEP["ttl_negativo_segundos"] = ttl_negativo_segundos
+        if tamanho_max is not None:
+            CONFIG_CACHE_CEP["tamanho_max"] = tamanho_max
+
+def _remover_excedentes_cache_cep(conexao_cache: sqlite3.Connection) -> None:
+    """Remove as entradas menos acessadas quando o cache passa do tamanho máximo (LRU)."""
+    total = conexao_cache.execute("SELECT COUNT(*) FROM T_CACHE_CEP").fetchone()[0]
+    excedente = total - CONFIG_CACHE_CEP["tamanho_max"]
+    if excedente > 0:
+        conexao_cache.execute("""
+            DELETE FROM T_CACHE_CEP WHERE CEP IN (
+                SELECT CEP FROM T_CACHE_CEP ORDER BY DT_ULTIMO_ACESSO LIMIT ?
+            )
+        """, (excedente,))
+        ESTATISTICAS_CACHE_CEP["removidos_lru"] += excedente
+
+def buscar_cep_em_cache(_cep: str, _aceitar_expirado: bool = False) -> tuple[bool, any]:
+    """Procura o CEP no cache local.
+    Retorna (True, endereço) para acerto, (True, None) para CEP sabidamente inexistente
+    e (False, None) quando o CEP não está no cache ou expirou.
+    Entradas vencidas continuam gravadas (a próxima consulta ao ViaCEP as sobrescreve e o LRU as remove):
+    com _aceitar_expirado=True elas também são devolvidas (usado quando o ViaCEP está fora) e a ausência
+    não conta como falha, pois a consulta normal do mesmo CEP já contou."""
+    agora = time.time()
+
+    with _estado_cache_cep["trava"]:
+        conexao_cache = _abrir_cache_cep()
+        linha = conexao_cache.execute(
+            "SELECT DADOS, ENCONTRADO, DT_GRAVACAO FROM T_CACHE_CEP WHERE CEP = ?", (_cep,)
+        ).fetchone()
+
+        if linha is None:
+            if not _aceitar_expirado:
+                ESTATISTICAS_CACHE_CEP["falhas"] += 1
+            return False, None
+
+        dados, encontrado, dt_gravacao = linha
+        ttl = CONFIG_CACHE_CEP["ttl_segundos"] if encontrado else CONFIG_CACHE_CEP["ttl_negativo_segundos"]
+
+        if agora - dt_gravacao > ttl and not _aceitar_expirado:
+            ESTATISTICAS_CACHE_CEP["expirados"] += 1
+            ESTATISTICAS_CACHE_CEP["falhas"] += 1
+            return False, None
+
+        conexao_cache.execute("UPDATE T_CACHE_CEP SET DT_ULTIMO_ACESSO = ? WHERE CEP = ?", (agora, _cep))
+        conexao_cache.commit()
+
+        if encontrado:
+            ESTATISTICAS_CACHE_CEP["acertos"] += 1
+        else:
+            ESTATISTICAS_CACHE_CEP["acertos_negativos"] += 1
+
+    return True, json.loads(dados) if encontrado else None
+
+def salvar_cep_em_cache(_cep: str, _endereco: dict | None) -> None:
+    """Grava o endereço do CEP no cache. Endereço None registra um CEP inexistente (cache negativo)."""
+    agora = time.time()
+    dados = json.dumps(_endereco, ensure_ascii=False) if _endereco is not None else None
+
+    with _estado_cache_cep["trava"]:
+        conexao_cache = _abrir_cache_cep()
+        conexao_cache.execute(
+            "INSERT OR REPLACE INTO T_CACHE_CEP (CEP, DADOS, ENCONTRADO, DT_GRAVACAO, DT_ULTIMO_ACESSO) VALUES (?, ?, ?, ?, ?)",
+            (_cep, dados, 1 if _endereco is not None else 0, agora, agora)
+        )
+        _remover_excedentes_cache_cep(conexao_cache)
+        conexao_cache.commit()
+
+def obter_estatisticas_cache_cep() -> dict:
+    """Retorna os contadores do cache de CEP (acertos, falhas, expirados, removidos) e o total de entradas."""
+    with _estado_cache_cep["trava"]:
+        total = _abrir_cache_cep().execute("SELECT COUNT(*) FROM T_CACHE_CEP").fetchone()[0]
+
+    estatisticas = dict(ESTATISTICAS_CACHE_CEP)
+    estatisticas["entradas"] = total
+    return estatisticas
+
+def aquecer_cache_cep(_conexao) -> tuple[bool, any]:
+    """Preenche o cache com os endereços já gravados em T_PACIENTE (CEP, RUA, BAIRRO, CIDADE, ESTADO).
+    Não sobrescreve entradas existentes. Retorna (True, quantidade_inserida) ou (False, erro)."""
+    try:
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute("""
+                SELECT DISTINCT CEP, RUA, BAIRRO, CIDADE, ESTADO
+                FROM T_PACIENTE
+                WHERE CEP IS NOT NULL
+            """)
+            resultados = cur.fetchall()
+            cur.close()
+
+        agora = time.time()
+        registros = []
+        for cep, rua, bairro, cidade, estado in resultados:
+            cep = str(cep).strip()
+            if not (cep.isdigit() and len(cep) == 8):
+                continue
+            endereco = {
+                "cep": f"{cep[:5]}-{cep[5:]}",
+                "logradouro": rua or "",
+                "bairro": bairro or "",
+                "cidade": cidade or "",
+                "estado": estado or ""
+            }
+            registros.append((cep, json.dumps(endereco, ensure_ascii=False), 1, agora, agora))
+
+        with _estado_cache_cep["trava"]:
+            conexao_cache = _abrir_cache_cep()
+            antes = conexao_cache.total_changes
+            conexao_cache.executemany(
+                "INSERT OR IGNORE INTO T_CACHE_CEP (CEP, DADOS, ENCONTRADO, DT_GRAVACAO, DT_ULTIMO_ACESSO) VALUES (?, ?, ?, ?, ?)",
+                registros
+            )
+            inseridos = conexao_cache.total_changes - antes
+            _remover_excedentes_cache_cep(conexao_cache)
+            conexao_cache.commit()
+
+        return True, inseridos
+
+    except Exception as e:
+        return False, e
+
+# ==========================================================
+#   ÍNDICE OFFLINE DE CEP (ARQUIVO BINÁRIO MAPEADO EM MEMÓRIA)
+# ==========================================================
+
+# Formato do arquivo (little-endian):
+#   cabeçalho : MAGICO (8 bytes) + quantidade de registros (uint32) + reservado (uint32)
+#   registros : quantidade x (cep uint32, deslocamento uint32, tamanho uint32), ordenados por CEP
+#   textos    : "logradouro\x1fbairro\x1fcidade\x1festado" em UTF-8, referenciados pelos registros
+
+MAGICO_INDICE_CEP = b"CEPIDX1\x00"
+_CABECALHO_INDICE_CEP = struct.Struct("<8sII")
+_REGISTRO_INDICE_CEP = struct.Struct("<III")
+_SEPARADOR_INDICE_CEP = "\x1f"
+
+# Resolvedor usado por consultar_cep: "viacep", "indice" ou "indice_e_viacep"
+CONFIG_RESOLVEDOR_CEP = {
+    "resolvedor": "viacep",
+    "caminho_indice": "indice_cep.bin"
+}
+
+_estado_indice_cep = {"caminho": None, "arquivo": None, "mapa": None, "quantidade": 0, "trava": threading.RLock()}
+
+def configurar_resolvedor_cep(resolvedor: str, caminho_indice: str = None) -> None:
+    """Escolhe como consultar_cep resolve endereços: 'viacep', 'indice' ou 'indice_e_viacep'."""
+    if resolvedor not in ("viacep", "indice", "indice_e_viacep"):
+        raise ValueError(f"Resolvedor de CEP desconhecido: {resolvedor}")
+    CONFIG_RESOLVEDOR_CEP["resolvedor"] = resolvedor
+    if caminho_indice is not None:
+        CONFIG_RESOLVEDOR_CEP["caminho_indice"] = caminho_indice
+
+def construir_indice_cep(_caminho_csv: str, _caminho_indice: str, _delimitador: str = None) -> tuple[bool, any]:
+    """Converte um CSV de CEPs no arquivo binário ordenado usado por buscar_cep_no_indice.
+    O CSV precisa de cabeçalho com as colunas cep, logradouro, bairro, cidade (ou localidade)
+    e estado (ou uf). Retorna (True, quantidade_de_ceps) ou (False, erro)."""
+    try:
+        with open(_caminho_csv, "r", encoding="utf-8-sig", newline="") as arquivo_csv:
+            if _delimitador is None:
+                _delimitador = csv.Sniffer().sniff(arquivo_csv.read(4096), delimiters=",;|\t").delimiter
+                arquivo_csv.seek(0)
+
+            leitor = csv.DictReader(arquivo_csv, delimiter=_delimitador)
+            colunas = {}
+            for nome in leitor.fieldnames or []:
+                colunas[nome.strip().lower()] = nome
+
+            def coluna(*opcoes):
+                for opcao in opcoes:
+                    if opcao in colunas:
+                        return colunas[opcao]
+                raise ValueError(f"Coluna obrigatória ausente no CSV: {opcoes[0]}")
+
+            col_cep = coluna("cep")
+            col_rua = coluna("logradouro", "rua")
+            col_bairro = coluna("bairro")
+            col_cidade = coluna("cidade", "localidade")
+            col_estado = coluna("estado", "uf")
+
+            enderecos = {}
+            for linha in leitor:
+                cep = (linha[col_cep] or "").replace("-", "").replace(".", "").strip()
+                if not (cep.isdigit() and len(cep) == 8):
+                    continue
+                campos = []
+                for nome_coluna in (col_rua, col_bairro, col_cidade, col_estado):
+                    campos.append((linha[nome_coluna] or "").strip().replace(_SEPARADOR_INDICE_CEP, " "))
+                enderecos[int(cep)] = _SEPARADOR_INDICE_CEP.join(campos).encode("utf-8")
+
+        ceps_ordenados = sorted(enderecos)
+        inicio_textos = _CABECALHO_INDICE_CEP.size + _REGISTRO_INDICE_CEP.size * len(ceps_ordenados)
+
+        caminho_temporario = f"{_caminho_indice}.tmp"
+        with open(caminho_temporario, "wb") as arquivo_indice:
+            arquivo_indice.write(_CABECALHO_INDICE_CEP.pack(MAGICO_INDICE_CEP, len(ceps_ordenados), 0))
+
+            deslocamento = inicio_textos
+            for cep in ceps_ordenados:
+                texto = enderecos[cep]
+                arquivo_indice.write(_REGISTRO_INDICE_CEP.pack(cep, deslocamento, len(texto)))
+                deslocamento += len(texto)
+
+            for cep in ceps_ordenados:
+                arquivo_indice.write(enderecos[cep])
+
+        fechar_indice_cep()
+        os.replace(caminho_temporario, _caminho_indice)
+
+        return True, len(ceps_ordenados)
+
+    except Exception as e:
+        return False, e
+
+def _abrir_indice_cep() -> mmap.mmap:
+    """Mapeia o arquivo do índice em memória (somente leitura) na primeira consulta."""
+    caminho = CONFIG_RESOLVEDOR_CEP["caminho_indice"]
+
+    with _estado_indice_cep["trava"]:
+        if _estado_indice_cep["mapa"] is None or _estado_indice_cep["caminho"] != caminho:
+            fechar_indice_cep()
+            arquivo = open(caminho, "rb")
+            mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+            magico, quantidade, _ = _CABECALHO_INDICE_CEP.unpack_from(mapa, 0)
+            if magico != MAGICO_INDICE_CEP:
+                mapa.close()
+                arquivo.close()
+                raise ValueError(f"Arquivo '{caminho}' não é um índice de CEP válido.")
+
+            _estado_indice_cep.update({"caminho": caminho, "arquivo": arquivo, "mapa": mapa, "quantidade": quantidade})
+
+        return _estado_indice_cep["mapa"]
+
+def fechar_indice_cep() -> None:
+    """Libera o mapeamento do índice de CEP, se estiver aberto."""
+    with _estado_indice_cep["trava"]:
+        if _estado_indice_cep["mapa"] is not None:
+            _estado_indice_cep["mapa"].close()
+            _estado_indice_cep["arquivo"].close()
+        _estado_indice_cep.update({"caminho": None, "arquivo": None, "mapa": None, "quantidade": 0})
+
+def buscar_cep_no_indice(_cep: str) -> dict | None:
+    """Busca binária do CEP (somente dígitos) no índice offline.
+    Retorna o endereço no mesmo formato de obter_endereco ou None se o CEP não estiver no índice."""
+    mapa = _abrir_indice_cep()
+    alvo = int(_cep)
+
+    inicio = 0
+    fim = _estado_indice_cep["quantidade"] - 1
+    while inicio <= fim:
+        meio = (inicio + fim) // 2
+        cep, deslocamento, tamanho = _REGISTRO_INDICE_CEP.unpack_from(
+            mapa, _CABECALHO_INDICE_CEP.size + meio * _REGISTRO_INDICE_CEP.size
+        )
+        if cep < alvo:
+            inicio = meio + 1
+        elif cep > alvo:
+            fim = meio - 1
+        else:
+            logradouro, bairro, cidade, estado = mapa[deslocamento:deslocamento + tamanho].decode("utf-8").split(_SEPARADOR_INDICE_CEP)
+            return {
+                "cep": f"{_cep[:5]}-{_cep[5:]}",
+                "logradouro": logradouro,
+                "bairro": bairro,
+                "cidade": cidade,
+                "estado": estado
+            }
+
+    return None
+
+# ========= CONSULTA DE CEP =========
+_estado_sessao_viacep = {"sessao": None, "trava": threading.Lock()}
+
+def _criar_sessao_viacep(_tamanho_pool: int) -> requests.Session:
+    """Cria uma sessão HTTP com conexões keep-alive reaproveitáveis (até _tamanho_pool simultâneas)."""
+    sessao = requests.Session()
+    adaptador = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=_tamanho_pool)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+def _obter_sessao_viacep() -> requests.Session:
+    """Retorna a sessão HTTP compartilhada pelas consultas individuais de CEP."""
+    with _estado_sessao_viacep["trava"]:
+        if _estado_sessao_viacep["sessao"] is None:
+            _estado_sessao_viacep["sessao"] = _criar_sessao_viacep(4)
+        return _estado_sessao_viacep["sessao"]
+
+def _consultar_viacep(_cep: str, _sessao: requests.Session) -> dict | None:
+    """Faz a requisição ao ViaCEP (com timeout) e devolve o endereço, ou None para CEP inexistente.
+    Respostas HTTP de erro e falhas de rede geram exceção."""
+    response = _sessao.get(f"{CONFIG_VIACEP['url_base']}/{_cep}/json/", timeout=CONFIG_VIACEP["timeout_segundos"])
+    response.raise_for_status()
+    data = response.json()
+
+    if "erro" in data:
+        return None
+
+    return {
+        "cep": data.get("cep", ""),
+        "logradouro": data.get("logradouro", ""),
+        "bairro": data.get("bairro", ""),
+        "cidade": data.get("localidade", ""),
+        "estado": data.get("uf", "")
+    }
+
+def consultar_cep(_cep: str) -> dict | None:
+    """Retorna o endereço do CEP (somente dígitos) usando o cache local e, se necessário, o ViaCEP.
+    Retorna None se o CEP não existir. Erros de rede são propagados para quem chamou.
+    Com o resolvedor 'indice' a consulta é feita só no índice offline; com 'indice_e_viacep'
+    o índice é consultado primeiro e o ViaCEP apenas para CEPs ausentes dele."""
+    resolvedor = CONFIG_RESOLVEDOR_CEP["resolvedor"]
+
+    if resolvedor in ("indice", "indice_e_viacep"):
+        endereco = buscar_cep_no_indice(_cep)
+        if endereco is not None or resolvedor == "indice":
+            return endereco
+
+    encontrado_cache, endereco = buscar_cep_em_cache(_cep)
+    if encontrado_cache:
+        return endereco
+
+    endereco = _consultar_viacep(_cep, _obter_sessao_viacep())
+    salvar_cep_em_cache(_cep, endereco)
+    return endereco
+
+# ==========================================================
+#   CONSULTA DE CEPS EM LOTE
+# ==========================================================
+
+CONFIG_LOTE_CEP = {
+    "trabalhadores": 8,                     # requisições simultâneas
+    "requisicoes_por_segundo": 10.0,        # limite do balde de tokens
+    "rajada": 10,                           # tokens acumuláveis (rajada máxima)
+    "tentativas": 3,                        # tentativas por CEP
+    "espera_base_segundos": 0.5,            # backoff exponencial: 0.5s, 1s, 2s...
+    "limite_falhas_circuito": 5,            # falhas seguidas que abrem o circuito
+    "tempo_circuito_aberto_segundos": 30.0  # tempo sem chamar o ViaCEP após abrir
+}
+
+def _criar_balde_tokens(_taxa: float, _capacidade: int) -> dict:
+    """Cria o estado de um limitador do tipo balde de tokens."""
+    return {
+        "taxa": _taxa,
+        "capacidade": _capacidade,
+        "tokens": float(_capacidade),
+        "atualizado": time.monotonic(),
+        "trava": threading.Lock()
+    }
+
+def _aguardar_token(_balde: dict) -> None:
+    """Bloqueia até haver um token disponível no balde e o consome."""
+    while True:
+        with _balde["trava"]:
+            agora = time.monotonic()
+            _balde["tokens"] = min(_balde["capacidade"], _balde["tokens"] + (agora - _balde["atualizado"]) * _balde["taxa"])
+            _balde["atualizado"] = agora
+
+            if _balde["tokens"] >= 1:
+                _balde["tokens"] -= 1
+                return
+
+            espera = (1 - _balde["tokens"]) / _balde["taxa"]
+
+        time.sleep(espera)
+
+def _criar_disjuntor(_limite_falhas: int, _tempo_aberto: float) -> dict:
+    """Cria o estado de um disjuntor (circuit breaker) para as chamadas ao ViaCEP."""
+    return {
+        "limite_falhas": _limite_falhas,
+        "tempo_aberto": _tempo_aberto,
+        "falhas_seguidas": 0,
+        "aberto_ate": 0.0,
+        "trava": threading.Lock()
+    }
+
+def _disjuntor_aberto(_disjuntor: dict) -> bool:
+    """Indica se o circuito está aberto (chamadas ao ViaCEP suspensas)."""
+    with _disjuntor["trava"]:
+        return time.monotonic() < _disjuntor["aberto_ate"]
+
+def _registrar_resultado_disjuntor(_disjuntor: dict, _sucesso: bool) -> None:
+    """Zera o contador de falhas no sucesso; abre o circuito ao atingir o limite de falhas seguidas."""
+    with _disjuntor["trava"]:
+        if _sucesso:
+            _disjuntor["falhas_seguidas"] = 0
+        else:
+            _disjuntor["falhas_seguidas"] += 1
+            if _disjuntor["falhas_seguidas"] >= _disjuntor["limite_falhas"]:
+                _disjuntor["aberto_ate"] = time.monotonic() + _disjuntor["tempo_aberto"]
+
+def _resolver_cep_do_lote(_cep: str, _sessao: requests.Session, _balde: dict, _disjuntor: dict) -> tuple[str, any, any]:
+    """Resolve um CEP do lote: índice offline, cache, ViaCEP (com tentativas) e, por último, cache vencido.
+    Retorna (cep, endereço ou None, erro ou None); exceções viram o erro do próprio CEP."""
+    try:
+        resolvedor = CONFIG_RESOLVEDOR_CEP["resolvedor"]
+
+        if resolvedor in ("indice", "indice_e_viacep"):
+            endereco = buscar_cep_no_indice(_cep)
+            if endereco is not None or resolvedor == "indice":
+                return _cep, endereco, None
+
+        encontrado_cache, endereco = buscar_cep_em_cache(_cep)
+        if encontrado_cache:
+            return _cep, endereco, None
+
+        ultimo_erro = "Circuito aberto: ViaCEP temporariamente indisponível."
+
+        for tentativa in range(CONFIG_LOTE_CEP["tentativas"]):
+            if _disjuntor_aberto(_disjuntor):
+                break
+
+            _aguardar_token(_balde)
+
+            try:
+                endereco = _consultar_viacep(_cep, _sessao)
+                _registrar_resultado_disjuntor(_disjuntor, True)
+                salvar_cep_em_cache(_cep, endereco)
+                return _cep, endereco, None
+
+            except Exception as e:
+                _registrar_resultado_disjuntor(_disjuntor, False)
+                ultimo_erro = str(e)
+                if tentativa < CONFIG_LOTE_CEP["tentativas"] - 1:
+                    time.sleep(CONFIG_LOTE_CEP["espera_base_segundos"] * (2 ** tentativa))
+
+        # ViaCEP indisponível: usa o que houver no cache, mesmo vencido
+        encontrado_cache, endereco = buscar_cep_em_cache(_cep, _aceitar_expirado=True)
+        if encontrado_cache:
+            return _cep, endereco, None
+
+        return _cep, None, ultimo_erro
+
+    except Exception as e:
+        # Índice corrompido/ausente ou falha no cache: o erro fica só neste CEP, o resto do lote segue
+        return _cep, None, f"Erro ao resolver o CEP: {e}"
+
+def resolver_ceps_em_lote(_ceps, _trabalhadores: int = None) -> tuple[dict, dict]:
+    """Resolve muitos CEPs de forma concorrente, com sessão HTTP compartilhada (keep-alive),
+    limite de requisições por segundo, timeout, novas tentativas com backoff e circuit breaker.
+    Retorna (enderecos, erros):
+      enderecos -> {cep: endereço no formato de obter_endereco, ou None se o CEP não existir}
+      erros     -> {cep: mensagem} para CEPs inválidos ou que não puderam ser consultados.
+    Os CEPs das chaves são normalizados para 8 dígitos."""
+    trabalhadores = _trabalhadores or CONFIG_LOTE_CEP["trabalhadores"]
+
+    enderecos = {}
+    erros = {}
+    ceps_validos = []
+
+    for cep in _ceps:
+        cep_limpo = str(cep).strip().replace("-", "").replace(".", "").replace(" ", "")
+        if not (cep_limpo.isdigit() and len(cep_limpo) == 8):
+            erros[str(cep)] = "CEP inválido."
+        elif cep_limpo not in enderecos:
+            enderecos[cep_limpo] = None
+            ceps_validos.append(cep_limpo)
+
+    if not ceps_validos:
+        return enderecos, erros
+
+    balde = _criar_balde_tokens(CONFIG_LOTE_CEP["requisicoes_por_segundo"], CONFIG_LOTE_CEP["rajada"])
+    disjuntor = _criar_disjuntor(CONFIG_LOTE_CEP["limite_falhas_circuito"], CONFIG_LOTE_CEP["tempo_circuito_aberto_segundos"])
+    sessao = _criar_sessao_viacep(trabalhadores)
+
+    try:
+        with ThreadPoolExecutor(max_workers=trabalhadores) as executor:
+            futuros = []
+            for cep in ceps_validos:
+                futuros.append(executor.submit(_resolver_cep_do_lote, cep, sessao, balde, disjuntor))
+
+            for futuro in futuros:
+                cep, endereco, erro = futuro.result()
+                if erro is None:
+                    enderecos[cep] = endereco
+                else:
+                    del enderecos[cep]
+                    erros[cep] = erro
+    finally:
+        sessao.close()
+
+    return enderecos, erros
+
 def obter_endereco(_msg_input: str, _msg_erro: str) -> dict:
-    """Consulta a API ViaCEP com o CEP informado e retorna o endereço completo.
+    """Consulta o endereço do CEP informado (cache local ou API ViaCEP) e retorna o endereço completo.
     Aceita CEP com ou sem traço, exibe mensagem de erro personalizada.
     API pública: https://viacep.com.br
     """
@@ -379,20 +1007,10 @@ def obter_endereco(_msg_input: str, _msg_erro: str) -> dict:
             continue
 
         try:
-            response = requests.get(f"https://viacep.com.br/ws/{cep}/json/")
-            data = response.json()
+            endereco = consultar_cep(cep)
 
-            if "erro" in data:
+            if endereco is None:
                 print(f"{_msg_erro}\n") # CEP inválido ou não encontrado. Tente novamente.
-                endereco = None
-            else:
-                endereco = {
-                    "cep": data.get("cep", ""),
-                    "logradouro": data.get("logradouro", ""),
-                    "bairro": data.get("bairro", ""),
-                    "cidade": data.get("localidade", ""),
-                    "estado": data.get("uf", "")
-                }
 
         except Exception:
             print(f"{_msg_erro}\n")
@@ -545,6 +1163,235 @@ Escolha: """, "Opção inválida!", status_consulta_dict)
 
     return retorno
 
+def solicitar_filtros_pesquisa() -> list[dict]:
+    """Pergunta ao usuário os filtros da pesquisa combinada, um de cada vez,
+       e retorna a lista no formato aceito por montar_consulta_paciente().
+    """
+    filtros = []
+    colunas_texto = [c for c in COLUNAS_T_PACIENTE if c not in COLUNAS_NUMERICAS and c not in COLUNAS_DATA]
+    colunas_texto_dict = {i: c for i, c in enumerate(colunas_texto, start=1)}
+    colunas_numericas_dict = {i: c for i, c in enumerate(COLUNAS_NUMERICAS, start=1)}
+    colunas_data_dict = {i: c for i, c in enumerate(COLUNAS_DATA, start=1)}
+    colunas_lista_dict = {i: c for i, c in enumerate(COLUNAS_T_PACIENTE, start=1)}
+
+    def _menu_colunas(_colunas_dict: dict) -> str:
+        linhas = [f"{i} - {c}" for i, c in _colunas_dict.items()]
+        return "Escolha a coluna:\n" + "\n".join(linhas) + "\nEscolha: "
+
+    tipo = -1
+    while tipo != 0:
+        print(f"\nFiltros adicionados: {len(filtros)}")
+        print("1 - TEXTO (contém / começa com / igual)")
+        print("2 - COMPARAÇÃO NUMÉRICA")
+        print("3 - FAIXA NUMÉRICA (ENTRE)")
+        print("4 - PERÍODO DE DATAS")
+        print("5 - LISTA DE VALORES")
+        print("0 - EXECUTAR PESQUISA\n")
+        tipo = obter_int_intervalado("Escolha: ", "Entrada inválida.", 0, 5)
+        print()
+
+        match tipo:
+            case 1:
+                coluna = obter_opcao_dict(_menu_colunas(colunas_texto_dict), "Opção inválida!", colunas_texto_dict)
+                modo = obter_opcao_dict("""\nModo de pesquisa:
+1 - Contém
+2 - Começa com
+3 - Igual
+Escolha: """, "Opção inválida!", {1: "contem", 2: "prefixo", 3: "igual"})
+                valor = obter_texto("\nDigite o texto: ", "Entrada inválida!")
+                filtros.append({"tipo": "texto", "coluna": coluna, "modo": modo, "valor": valor})
+
+            case 2:
+                coluna = obter_opcao_dict(_menu_colunas(colunas_numericas_dict), "Opção inválida!", colunas_numericas_dict)
+                operador = obter_opcao_dict("""\nOperador:
+1 - Igual (=)
+2 - Maior (>)
+3 - Menor (<)
+4 - Maior ou igual (>=)
+5 - Menor ou igual (<=)
+6 - Diferente (<>)
+Escolha: """, "Opção inválida!", {i: op for i, op in enumerate(OPERADORES_COMPARACAO, start=1)})
+                valor = obter_int("\nDigite o valor: ", "Entrada inválida. Digite um número inteiro.")
+                filtros.append({"tipo": "numero", "coluna": coluna, "operador": operador, "valor": valor})
+
+            case 3:
+                coluna = obter_opcao_dict(_menu_colunas(colunas_numericas_dict), "Opção inválida!", colunas_numericas_dict)
+                inicio = obter_int("\nValor inicial: ", "Entrada inválida. Digite um número inteiro.")
+                fim = obter_int("Valor final: ", "Entrada inválida. Digite um número inteiro.")
+                filtros.append({"tipo": "entre", "coluna": coluna, "inicio": min(inicio, fim), "fim": max(inicio, fim)})
+
+            case 4:
+                coluna = obter_opcao_dict(_menu_colunas(colunas_data_dict), "Opção inválida!", colunas_data_dict)
+                inicio = obter_data("\nData inicial (dd/mm/aaaa): ", "Data inválida!")
+                fim = obter_data("Data final (dd/mm/aaaa): ", "Data inválida!")
+                filtros.append({"tipo": "entre", "coluna": coluna, "inicio": inicio, "fim": fim})
+
+            case 5:
+                coluna = obter_opcao_dict(_menu_colunas(colunas_lista_dict), "Opção inválida!", colunas_lista_dict)
+                valores = [v.strip() for v in obter_texto("\nDigite os valores separados por ',': ", "Entrada inválida!").split(",") if v.strip()]
+                try:
+                    if coluna in COLUNAS_NUMERICAS:
+                        valores = [int(v) for v in valores]
+                    elif coluna in COLUNAS_DATA:
+                        valores = [datetime.strptime(v, "%d/%m/%Y") for v in valores]
+                except ValueError:
+                    print("\nValores inválidos para a coluna escolhida. Filtro ignorado.")
+                    continue
+                if valores:
+                    filtros.append({"tipo": "em", "coluna": coluna, "valores": valores})
+
+    return filtros
+
+# Campos do menu de atualização (mesma numeração usada no main.py)
+CAMPOS_ATUALIZACAO = {
+    1: "NM_COMPLETO",
+    2: "DATA_NASCIMENTO",
+    3: "SEXO",
+    4: "CPF",
+    5: "RG",
+    6: "ESTADO_CIVIL",
+    7: "BRASILEIRO",
+    8: "ENDERECO",
+    9: "NUMERO_ENDERECO",
+    10: "CELULAR",
+    11: "EMAIL",
+    12: "CONVENIO",
+    13: "DATA_HORA_CONSULTA",
+    14: "TIPO_CONSULTA",
+    15: "ESPECIALIDADE",
+    16: "STATUS_CONSULTA"
+}
+
+MENU_CAMPOS_ATUALIZACAO = """1 - Nome
+2 - Data de Nascimento
+3 - Sexo
+4 - CPF
+5 - RG
+6 - Estado Civil
+7 - Brasileiro?
+8 - Endereço
+9 - Número do Endereço
+10 - Celular
+11 - E-mail
+12 - Convênio
+13 - Data/Hora Consulta
+14 - Tipo de Consulta
+15 - Especialidade
+16 - Status da Consulta
+"""
+
+def solicitar_valor_campo(_campo: str):
+    """Pergunta o novo valor de um campo do menu de atualização, com a validação própria do campo.
+    Retorna None se o campo não for reconhecido."""
+    match _campo.upper():
+        # DADOS DO PACIENTE
+        case "NM_COMPLETO":
+            valor = obter_texto("\nNome do paciente: ", "Nome inválido!")
+        case "DATA_NASCIMENTO":
+            valor = obter_data("\nData de nascimento (dd/mm/aaaa): ", "Data inválida!")
+        case "SEXO":
+            valor = obter_m_f("\nSexo [M/F]: ", "Entrada inválida! Digite M ou F.")
+        case "CPF":
+            valor = obter_cpf("\nCPF (somente números, ex: 12345678901): ", "CPF inválido!")
+        case "RG":
+            valor = obter_rg("\nRG (somente números, ex: 123456789): ", "RG inválido!")
+        case "ESTADO_CIVIL":
+            estado_civil_dict = {1: "Solteiro", 2: "Casado", 3: "Divorciado", 4: "Viuvo"}
+            valor = obter_opcao_dict("""\nEstado civil
+1 - Solteiro
+2 - Casado
+3 - Divorciado
+4 - Viuvo
+Escolha: """, "Opção inválida!", estado_civil_dict)
+        case "BRASILEIRO" | "CONVENIO":
+            valor = obter_sim_nao(f"\n{_campo.replace('_', ' ').capitalize()}? [S/N]: ", "Entrada inválida!")
+        case "ENDERECO":
+            valor = obter_endereco("\nCEP (ex: 01310200): ", "CEP inválido!")
+        case "NUMERO_ENDERECO":
+            valor = obter_int("\nNúmero da residência (ex: 123): ", "Número inválido!")
+        case "CELULAR":
+            valor = obter_texto("\nCelular (DDD + número — ex: 11987654321): ", "Número inválido!")
+        case "EMAIL":
+            valor = obter_email("\nInforme o e-mail (exemplo: exemplo@email.com)\nE-mail: ", "E-mail inválido!")
+
+        # DADOS DA CONSULTA
+        case "DATA_HORA_CONSULTA":
+            valor = obter_data_hora("\nDigite a data e hora da consulta (ex: 25/10/2025 14:30): ", "Data e hora inválida!")
+        case "TIPO_CONSULTA":
+            tipo_consulta_dict = {1: "Retorno", 2: "Emergencia", 3: "Rotina", 4: "Exame", 5: "Geral"}
+            valor = obter_opcao_dict("""\nTipo de consulta
+1 - Retorno
+2 - Emergencia
+3 - Rotina
+4 - Exame
+5 - Geral
+Escolha: """, "Opção inválida!", tipo_consulta_dict)
+        case "ESPECIALIDADE":
+            especialidade_dict = {
+                1: "Cardiologia", 2: "Neurologia", 3: "Ortopedia",
+                4: "Dermatologia", 5: "Pediatria", 6: "Oftalmologia",
+                7: "Clínico Geral"
+            }
+            valor = obter_opcao_dict("""\nEspecialidade
+1 - Cardiologia
+2 - Neurologia
+3 - Ortopedia
+4 - Dermatologia
+5 - Pediatria
+6 - Oftalmologia
+7 - Clínico Geral
+Escolha: """, "Opção inválida!", especialidade_dict)
+        case "STATUS_CONSULTA":
+            status_consulta_dict = {1: "Realizada", 2: "Cancelada", 3: "Absenteísmo"}
+            valor = obter_opcao_dict("""Status da consulta
+1 - Realizada
+2 - Cancelada
+3 - Absenteísmo
+Escolha: """, "Opção inválida!", status_consulta_dict)
+
+        case _:
+            valor = None
+
+    return valor
+
+def colunas_do_campo(_campo: str, _valor) -> dict:
+    """Converte o valor de um campo do menu de atualização em {COLUNA: valor} de T_PACIENTE.
+    O endereço vira CEP/RUA/BAIRRO/CIDADE/ESTADO e as respostas Sim/Não viram 'S'/'N'."""
+    campo = _campo.upper()
+
+    match campo:
+        case "DATA_NASCIMENTO":
+            return {"DT_NASCIMENTO": _valor}
+        case "DATA_HORA_CONSULTA":
+            return {"DT_HORA_CONSULTA": _valor}
+        case "BRASILEIRO" | "CONVENIO":
+            return {campo: "S" if _valor else "N"}
+        case "ENDERECO":
+            return {
+                "CEP": obter_cep(_valor).replace("-", ""),
+                "RUA": obter_rua(_valor)[:100],
+                "BAIRRO": obter_bairro(_valor)[:50],
+                "CIDADE": obter_cidade(_valor)[:50],
+                "ESTADO": obter_estado(_valor)[:2]
+            }
+        case _:
+            return {campo: _valor}
+
+def solicitar_valores_atualizacao() -> dict:
+    """Pergunta quais campos alterar (um ou mais) e o novo valor de cada um.
+    Retorna {COLUNA: valor} no formato aceito por atualizar_pacientes_em_lote()."""
+    texto_campos, lista_campos = obter_multiplas_opcoes_dict(
+        "Escolha os campos que deseja atualizar (separe os números por ','):\n" + MENU_CAMPOS_ATUALIZACAO + "Escolha: ",
+        "Erro! Escolha os campos separando os números por ',' .",
+        CAMPOS_ATUALIZACAO
+    )
+
+    valores = {}
+    for campo in lista_campos:
+        valores.update(colunas_do_campo(campo, solicitar_valor_campo(campo)))
+
+    return valores
+
 # ==========================================================
 #   FORMATAÇÃO DE VALORES
 # ==========================================================
@@ -569,16 +1416,237 @@ def formatar_valor(valor, largura_max: int = 20) -> str:
             linhas.append(texto[i:i+largura_max])
         return "\n".join(linhas)
 
+# ========= FORMATAÇÃO EM LOTE (POR COLUNA) =========
+# Mesmo resultado de formatar_valor, aplicado a uma coluna inteira de uma vez:
+# datas repetidas são formatadas uma única vez, textos curtos passam direto
+# e textos longos repetidos reaproveitam a quebra já feita.
+# Larguras máximas das colunas de texto curtas de T_PACIENTE (valores dentro do esquema nunca precisam de quebra).
+LARGURA_COLUNAS_CURTAS = {
+    "SEXO": 1, "BRASILEIRO": 1, "CONVENIO": 1, "ESTADO": 2,
+    "CEP": 8, "RG": 9, "CPF": 11, "CELULAR": 11
+}
+
+@lru_cache(maxsize=8192)
+def _texto_data(_valor) -> str:
+    """Data como em formatar_valor: 'dd/mm/aaaa', com ' hh:mm' quando é datetime com horário."""
+    if isinstance(_valor, datetime) and _valor.time() != datetime.min.time():
+        return _valor.strftime("%d/%m/%Y %H:%M")
+    return _valor.strftime("%d/%m/%Y")
+
+@lru_cache(maxsize=8192)
+def _texto_data_hora(_valor) -> str:
+    """Datetime sempre com horário ('dd/mm/aaaa hh:mm'), formato usado nas exportações JSON."""
+    return _valor.strftime("%d/%m/%Y %H:%M")
+
+def _quebrar_texto(_texto: str, _largura_max: int) -> str:
+    """Quebra o texto em linhas de no máximo _largura_max caracteres (mesma regra de formatar_valor)."""
+    return "\n".join(_texto[i:i + _largura_max] for i in range(0, len(_texto), _largura_max))
+
+def formatar_coluna(_valores: list, largura_max: int = 20, _coluna: str = None) -> list[str]:
+    """
+    Formata todos os valores de uma coluna, com saída idêntica a [formatar_valor(v, largura_max) for v in _valores].
+    Com o nome da coluna, colunas curtas conhecidas (LARGURA_COLUNAS_CURTAS) usam um caminho direto.
+    """
+    largura_conhecida = LARGURA_COLUNAS_CURTAS.get(str(_coluna).upper()) if _coluna else None
+    if largura_conhecida is not None and largura_conhecida <= largura_max:
+        return ["" if v is None else v if v.__class__ is str and len(v) <= largura_max else formatar_valor(v, largura_max)
+                for v in _valores]
+
+    datas = {}
+    quebrados = {}
+    resultado = []
+    for valor in _valores:
+        classe = valor.__class__
+        if classe is str or classe is int:
+            texto = valor if classe is str else str(valor)
+            if len(texto) > largura_max:
+                quebrado = quebrados.get(texto)
+                if quebrado is None:
+                    quebrado = quebrados[texto] = _quebrar_texto(texto, largura_max)
+                texto = quebrado
+        elif valor is None:
+            texto = ""
+        elif classe is datetime or classe is date:
+            texto = datas.get(valor)
+            if texto is None:
+                texto = datas[valor] = _texto_data(valor)
+        else:
+            texto = formatar_valor(valor, largura_max)
+        resultado.append(texto)
+    return resultado
+
+def formatar_registros(_registros: list, _colunas: list[str], largura_max: int = 20) -> list[list[str]]:
+    """Formata registros (dicionários ou tuplas) coluna a coluna. Retorna uma lista de colunas já formatadas."""
+    if _registros and isinstance(_registros[0], dict):
+        colunas_valores = [[registro.get(coluna) for registro in _registros] for coluna in _colunas]
+    else:
+        quantidade = len(_colunas)
+        colunas_valores = [[registro[i] if i < len(registro) else None for registro in _registros]
+                           for i in range(quantidade)]
+
+    return [formatar_coluna(valores, largura_max, coluna) for valores, coluna in zip(colunas_valores, _colunas)]
+
 # ==========================================================
 #   IMPRESSÃO DE RESULTADOS ORACLE
 # ==========================================================
 
+# ========= TABELA FANCY_GRID SEM PANDAS =========
+# Mesmo layout do tabulate(tablefmt="fancy_grid", numalign="right", stralign="left"):
+# colunas cujos valores são todos números ficam alinhadas à direita, textos à esquerda,
+# e a largura mínima de cada coluna é o cabeçalho + 2.
+_ORDEM_TIPOS_TABELA = {None: 0, bool: 1, int: 2, float: 3, str: 5}
+_NUMERO_COM_MILHAR = re.compile(r"^[+-]?[0-9]{1,3}(?:,[0-9]{3})+(\.[0-9]*)?$")
+
+def _tipo_celula_tabela(_texto: str):
+    """Tipo que o tabulate deduziria para a célula (None para vazia)."""
+    if not _texto:
+        return None
+    if _texto in ("True", "False"):
+        return bool
+    try:
+        int(_texto)
+        return int
+    except ValueError:
+        pass
+    milhar = _NUMERO_COM_MILHAR.match(_texto)
+    if milhar:
+        return float if milhar.group(1) else int
+    try:
+        numero = float(_texto)
+    except ValueError:
+        return str
+    if numero != numero or numero in (float("inf"), float("-inf")):
+        return float if _texto.lower() in ("inf", "-inf", "nan") else str
+    return float
+
+def _celula_numerica(_texto: str) -> str:
+    """Formata uma célula de coluna float como o tabulate (formato 'g')."""
+    if not _texto:
+        return _texto
+    try:
+        return format(float(_texto.replace(",", "")), "g")
+    except ValueError:
+        return _texto
+
+def _preparar_tabela(_dados, _largura_max: int) -> tuple[list[str], list[list[list[str]]], list[int], list[bool]]:
+    """
+    Formata os dados coluna a coluna (formatar_registros), deduz o tipo de cada coluna e mede as larguras.
+    Retorna (cabeçalhos, linhas já quebradas em sublinhas, larguras, alinhar_direita).
+    """
+    if hasattr(_dados, "description"):
+        cabecalhos = [str(col[0]) for col in _dados.description]
+        registros = _dados.fetchall()
+    else:
+        registros = _dados
+        if isinstance(registros[0], dict):
+            cabecalhos = [str(chave) for chave in registros[0].keys()]
+        else:
+            cabecalhos = [f"Col{i + 1}" for i in range(len(registros[0]))]
+
+    colunas_formatadas = formatar_registros(registros, cabecalhos, _largura_max)
+
+    larguras = []
+    alinhar_direita = []
+    colunas_quebradas = []
+    for cabecalho, textos in zip(cabecalhos, colunas_formatadas):
+        tipo = bool
+        for texto in textos:
+            tipo_celula = _tipo_celula_tabela(texto)
+            if _ORDEM_TIPOS_TABELA[tipo_celula] > _ORDEM_TIPOS_TABELA[tipo]:
+                tipo = tipo_celula
+                if tipo is str:
+                    break
+
+        if tipo is float:
+            textos = [_celula_numerica(texto) for texto in textos]
+
+        largura = len(cabecalho) + 2
+        sublinhas_coluna = []
+        for texto in textos:
+            texto = texto.strip()
+            if "\n" in texto or "\r" in texto:
+                sublinhas = texto.splitlines()
+                for sublinha in sublinhas:
+                    if len(sublinha) > largura:
+                        largura = len(sublinha)
+            else:
+                sublinhas = [texto] if texto else []
+                if len(texto) > largura:
+                    largura = len(texto)
+            sublinhas_coluna.append(sublinhas)
+
+        larguras.append(largura)
+        alinhar_direita.append(tipo in (int, float))
+        colunas_quebradas.append(sublinhas_coluna)
+
+    linhas = [list(linha) for linha in zip(*colunas_quebradas)] if colunas_quebradas else [[] for _ in registros]
+    return cabecalhos, linhas, larguras, alinhar_direita
+
+def gerar_linhas_tabela(_dados, largura_max: int = 20):
+    """
+    Gera, linha a linha, a tabela fancy_grid dos dados (lista de dicionários, lista de tuplas ou cursor).
+    As larguras são calculadas em uma passada; depois cada linha de texto é produzida sob demanda,
+    então a tabela pode ser impressa enquanto é montada.
+    """
+    cabecalhos, linhas, larguras, alinhar_direita = _preparar_tabela(_dados, largura_max)
+
+    def _borda(_inicio: str, _traco: str, _separador: str, _fim: str) -> str:
+        return _inicio + _separador.join(_traco * (largura + 2) for largura in larguras) + _fim
+
+    def _alinhar(_texto: str, _i: int) -> str:
+        if alinhar_direita[_i]:
+            return _texto.rjust(larguras[_i])
+        return _texto.ljust(larguras[_i])
+
+    yield _borda("╒", "═", "╤", "╕")
+    yield "│ " + " │ ".join(_alinhar(cabecalho, i) for i, cabecalho in enumerate(cabecalhos)) + " │"
+    yield _borda("╞", "═", "╪", "╡")
+
+    separador_linhas = _borda("├", "─", "┼", "┤")
+    for numero, linha in enumerate(linhas):
+        if numero:
+            yield separador_linhas
+        altura = max((len(sublinhas) for sublinhas in linha), default=1) or 1
+        for k in range(altura):
+            partes = []
+            for i, sublinhas in enumerate(linha):
+                partes.append(_alinhar(sublinhas[k], i) if k < len(sublinhas) else " " * larguras[i])
+            yield "│ " + " │ ".join(partes) + " │"
+
+    yield _borda("╘", "═", "╧", "╛")
+
+def imprimir_tabela_stream(_dados, largura_max: int = 20) -> bool:
+    """Imprime a tabela diretamente no terminal, linha a linha, sem montar a string completa.
+    Retorna False (e avisa) quando não há registros."""
+    if not _dados:
+        print("Nenhum registro encontrado.")
+        return False
+
+    for linha in gerar_linhas_tabela(_dados, largura_max):
+        print(linha)
+    return True
+
 def imprimir_resultado_tabulate_oracle(resultado_cursor, largura_max: int = 20) -> tuple[bool, str]:
     """
-    Converte resultados de consulta Oracle em uma tabela formatada usando Tabulate,
+    Converte resultados de consulta Oracle em uma tabela formatada no estilo fancy_grid,
     aplicando quebra de linhas em textos longos e formatação de datas.
     Retorna uma tupla com sucesso e a string da tabela pronta para exibição.
     """
+    try:
+        # Se não houver resultados
+        if not resultado_cursor:
+            return False, "Nenhum registro encontrado."
+
+        return True, "\n".join(gerar_linhas_tabela(resultado_cursor, largura_max))
+
+    except Exception as e:
+        return False, f"Erro ao imprimir resultado: {e}"
+
+def imprimir_resultado_tabulate_pandas(resultado_cursor, largura_max: int = 20) -> tuple[bool, str]:
+    """
+    Versão anterior de imprimir_resultado_tabulate_oracle (pandas + tabulate), mantida como referência
+    para comparação de saída e de desempenho (ver benchmark_tabela.py).
+    """
     try:
         # Se não houver resultados
         if not resultado_cursor:
@@ -599,6 +1667,8 @@ def imprimir_resultado_tabulate_oracle(resultado_cursor, largura_max: int = 20)
                 for i in range(len(dados[0])):
                     headers.append(f"Col{i+1}")
 
+        from tabulate import tabulate
+
         df = pd.DataFrame(dados, columns=headers)
 
         # Formatar valores
@@ -656,29 +1726,352 @@ def conectar_oracledb(_user: str, _password: str, _dsn: str) -> tuple[bool, any]
     
     return retorno
 
+# ========= POOL DE CONEXÕES =========
+ESTATISTICAS_POOL = {
+    "emprestimos": 0,
+    "reconexoes": 0,
+    "espera_total_segundos": 0.0,
+    "espera_max_segundos": 0.0,
+    "trava": threading.Lock()   # o pool é compartilhado por threads (ex.: servidor HTTP)
+}
+
+def criar_pool_oracledb(_user: str, _password: str, _dsn: str, _min: int = 1, _max: int = 4,
+                        _incremento: int = 1, _tamanho_cache_sql: int = 50) -> tuple[bool, any]:
+    """Cria um pool de sessões Oracle e retorna (True, pool) ou (False, erro).
+    As sessões são testadas (ping) a cada empréstimo e sessões mortas são substituídas pelo pool.
+    _tamanho_cache_sql define o cache de instruções preparadas de cada sessão."""
+    try:
+        pool = oracledb.create_pool(
+            user = _user,
+            password = _password,
+            dsn = _dsn,
+            min = _min,
+            max = _max,
+            increment = _incremento,
+            stmtcachesize = _tamanho_cache_sql,
+            ping_interval = 0,
+            getmode = oracledb.POOL_GETMODE_WAIT
+        )
+
+        return (True, pool)
+
+    except Exception as e:
+        return (False, e)
+
+def adquirir_conexao(_pool: oracledb.ConnectionPool) -> oracledb.Connection:
+    """Empresta uma sessão do pool, medindo o tempo de espera.
+    Se a sessão entregue estiver inutilizável, ela é descartada e outra é pedida ao pool."""
+    inicio = time.perf_counter()
+
+    try:
+        conexao = _pool.acquire()
+    except oracledb.Error:
+        with ESTATISTICAS_POOL["trava"]:
+            ESTATISTICAS_POOL["reconexoes"] += 1
+        conexao = _pool.acquire()
+
+    if not conexao.is_healthy():
+        _pool.drop(conexao)
+        with ESTATISTICAS_POOL["trava"]:
+            ESTATISTICAS_POOL["reconexoes"] += 1
+        conexao = _pool.acquire()
+
+    espera = time.perf_counter() - inicio
+    with ESTATISTICAS_POOL["trava"]:
+        ESTATISTICAS_POOL["emprestimos"] += 1
+        ESTATISTICAS_POOL["espera_total_segundos"] += espera
+        ESTATISTICAS_POOL["espera_max_segundos"] = max(ESTATISTICAS_POOL["espera_max_segundos"], espera)
+
+    return conexao
+
+def liberar_conexao(_pool: oracledb.ConnectionPool, _conexao: oracledb.Connection) -> None:
+    """Devolve a sessão ao pool; sessões com problema são descartadas."""
+    try:
+        if _conexao.is_healthy():
+            _pool.release(_conexao)
+        else:
+            _pool.drop(_conexao)
+    except oracledb.Error:
+        pass
+
+@contextmanager
+def emprestar_conexao(_origem):
+    """Permite usar tanto uma conexão quanto um pool nas funções de CRUD:
+    com um pool, empresta uma sessão e a devolve ao final do bloco; com uma conexão, usa a própria."""
+    if not isinstance(_origem, sqlite3.Connection) and isinstance(_origem, oracledb.ConnectionPool):
+        conexao = adquirir_conexao(_origem)
+        try:
+            yield conexao
+        finally:
+            liberar_conexao(_origem, conexao)
+    else:
+        yield _origem
+
+def obter_estatisticas_pool(_pool: oracledb.ConnectionPool) -> dict:
+    """Retorna o estado do pool (sessões abertas, ocupadas, limites) e os tempos de espera medidos."""
+    with ESTATISTICAS_POOL["trava"]:
+        estatisticas = dict(ESTATISTICAS_POOL)
+    del estatisticas["trava"]
+    estatisticas["abertas"] = _pool.opened
+    estatisticas["ocupadas"] = _pool.busy
+    estatisticas["minimo"] = _pool.min
+    estatisticas["maximo"] = _pool.max
+    estatisticas["incremento"] = _pool.increment
+    estatisticas["cache_sql"] = _pool.stmtcachesize
+
+    if estatisticas["emprestimos"]:
+        estatisticas["espera_media_segundos"] = estatisticas["espera_total_segundos"] / estatisticas["emprestimos"]
+    else:
+        estatisticas["espera_media_segundos"] = 0.0
+
+    return estatisticas
+
+# ========= BANCO LOCAL (SQLITE) =========
+# Banco SQLite com o mesmo esquema de T_PACIENTE, usado para testes e uso offline.
+# As funções TO_DATE, TO_TIMESTAMP e NORMALIZAR_TEXTO são registradas na conexão
+# para que os mesmos comandos SQL do Oracle funcionem nele.
+COMANDO_CRIAR_T_PACIENTE_SQLITE = """
+CREATE TABLE IF NOT EXISTS T_PACIENTE (
+    ID_PACIENTE        INTEGER PRIMARY KEY AUTOINCREMENT,
+    NM_COMPLETO        VARCHAR(150) NOT NULL,
+    DT_NASCIMENTO      DATE NOT NULL,
+    SEXO               CHAR(1) NOT NULL,
+    CPF                VARCHAR(11),
+    RG                 VARCHAR(9),
+    ESTADO_CIVIL       VARCHAR(20),
+    BRASILEIRO         CHAR(1),
+    CEP                VARCHAR(8),
+    RUA                VARCHAR(100),
+    BAIRRO             VARCHAR(50),
+    CIDADE             VARCHAR(50),
+    ESTADO             CHAR(2),
+    NUMERO_ENDERECO    INTEGER,
+    CELULAR            VARCHAR(11),
+    EMAIL              VARCHAR(100),
+    CONVENIO           CHAR(1),
+    DT_HORA_CONSULTA   TIMESTAMP,
+    TIPO_CONSULTA      VARCHAR(20),
+    ESPECIALIDADE      VARCHAR(50),
+    STATUS_CONSULTA    VARCHAR(20),
+    DT_CADASTRO        TIMESTAMP DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%S', 'now', 'localtime')),
+    DT_ULTIMA_ATUALIZACAO TIMESTAMP DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_t_paciente_atualizacao
+AFTER UPDATE ON T_PACIENTE
+FOR EACH ROW WHEN NEW.DT_ULTIMA_ATUALIZACAO IS OLD.DT_ULTIMA_ATUALIZACAO
+BEGIN
+    UPDATE T_PACIENTE
+    SET DT_ULTIMA_ATUALIZACAO = STRFTIME('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    WHERE ID_PACIENTE = NEW.ID_PACIENTE;
+END;
+
+CREATE INDEX IF NOT EXISTS IX_PACIENTE_DT_ATUALIZACAO ON T_PACIENTE (DT_ULTIMA_ATUALIZACAO);
+
+CREATE TABLE IF NOT EXISTS T_PACIENTE_EXCLUIDO (
+    ID_EXCLUSAO        INTEGER PRIMARY KEY AUTOINCREMENT,
+    ID_PACIENTE        INTEGER,
+    DT_EXCLUSAO        TIMESTAMP DEFAULT (STRFTIME('%Y-%m-%d %H:%M:%f', 'now', 'localtime')) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS IX_PAC_EXCLUIDO_DT ON T_PACIENTE_EXCLUIDO (DT_EXCLUSAO);
+
+CREATE TRIGGER IF NOT EXISTS trg_t_paciente_exclusao
+AFTER DELETE ON T_PACIENTE
+FOR EACH ROW
+BEGIN
+    INSERT INTO T_PACIENTE_EXCLUIDO (ID_PACIENTE) VALUES (OLD.ID_PACIENTE);
+END;
+"""
+
+def _converter_to_date_sqlite(_texto, _formato):
+    """Equivalente ao TO_DATE do Oracle para os formatos usados pelo programa ('dd/mm/aaaa').
+    Chamada uma vez por linha inserida: separa os campos direto, sem o strptime (bem mais lento)."""
+    if _texto is None:
+        return None
+    dia, mes, ano = _texto.split("/")
+    return date(int(ano), int(mes), int(dia)).isoformat()
+
+def _converter_to_timestamp_sqlite(_texto, _formato):
+    """Equivalente ao TO_TIMESTAMP do Oracle para os formatos usados pelo programa ('dd/mm/aaaa hh:mm')."""
+    if _texto is None:
+        return None
+    data, hora = _texto.split(" ")
+    dia, mes, ano = data.split("/")
+    horas, minutos = hora.split(":")
+    return datetime(int(ano), int(mes), int(dia), int(horas), int(minutos)).isoformat(" ")
+
+def conectar_sqlite(_caminho: str = "pacientes_local.db") -> tuple[bool, any]:
+    """Abre (ou cria) o banco SQLite local com o esquema de T_PACIENTE, em modo WAL.
+    Retorna (True, conexão) ou (False, erro), como conectar_oracledb."""
+    try:
+        conexao_bd = sqlite3.connect(_caminho, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        conexao_bd.execute("PRAGMA journal_mode = WAL")
+        # Em WAL, NORMAL não corrompe o banco numa queda; só os últimos commits podem se perder (sem fsync a cada commit)
+        conexao_bd.execute("PRAGMA synchronous = NORMAL")
+        conexao_bd.execute("PRAGMA foreign_keys = ON")
+        conexao_bd.create_function("TO_DATE", 2, _converter_to_date_sqlite, deterministic=True)
+        conexao_bd.create_function("TO_TIMESTAMP", 2, _converter_to_timestamp_sqlite, deterministic=True)
+        conexao_bd.create_function("NORMALIZAR_TEXTO", 1, normalizar_texto, deterministic=True)
+        conexao_bd.executescript(COMANDO_CRIAR_T_PACIENTE_SQLITE)
+
+        for comando in gerar_ddl_busca_textual("sqlite"):
+            conexao_bd.execute(comando)
+        conexao_bd.commit()
+
+        return (True, conexao_bd)
+
+    except Exception as e:
+        return (False, e)
+
+def _dialeto(_conexao) -> str:
+    """Identifica o banco por trás da conexão/pool: 'sqlite' ou 'oracle'."""
+    return "sqlite" if isinstance(_conexao, sqlite3.Connection) else "oracle"
+
+def _sql_limite(_conexao, _bind: str = "tamanho") -> str:
+    """Cláusula que limita a quantidade de linhas retornadas, no dialeto do banco."""
+    return _backend(_conexao)["limite"].format(bind=_bind)
+
+# ========= BACKENDS DE ARMAZENAMENTO (ORACLE / SQLITE) =========
+# As funções de CRUD recebem a origem (pool/conexão Oracle ou conexão SQLite) e escrevem o SQL do Oracle;
+# no SQLite, as funções registradas em conectar_sqlite fazem o mesmo SQL funcionar.
+# O que precisa ser diferente em cada banco fica em BACKENDS_ARMAZENAMENTO, escolhido por _dialeto(origem):
+#   abrir / descrever           -> cria a origem (pool Oracle / arquivo SQLite) e a descreve no menu
+#   limite                      -> paginação (FETCH FIRST / LIMIT)
+#   inserir_lote                -> carga em lote (array DML com RETURNING / INSERTs na mesma transação)
+#   valor_timestamp / parametro_timestamp -> TIMESTAMP lido de expressões (MAX...) e usado em binds
+#
+# O programa usa o Oracle; para rodar sem ele (testes, benchmark, uso offline), defina as variáveis
+# PACIENTES_BACKEND=sqlite e, se quiser, PACIENTES_SQLITE=<arquivo> (padrão: pacientes_local.db).
+CONFIG_BACKEND = {
+    "tipo": os.environ.get("PACIENTES_BACKEND", "oracle").lower(),
+    "caminho_sqlite": os.environ.get("PACIENTES_SQLITE", "pacientes_local.db")
+}
+
+def _descrever_oracle(_origem) -> str:
+    """Linha de status do menu: ocupação e espera do pool de sessões."""
+    if not isinstance(_origem, oracledb.ConnectionPool):
+        return "Conexão Oracle dedicada"
+    estatisticas = obter_estatisticas_pool(_origem)
+    return (f"Pool Oracle: {estatisticas['ocupadas']} ocupadas | {estatisticas['abertas']} abertas | "
+            f"espera média {estatisticas['espera_media_segundos'] * 1000:.1f} ms")
+
+def _descrever_sqlite(_conexao) -> str:
+    caminho = _conexao.execute("PRAGMA database_list").fetchone()[2]
+    return f"Banco local SQLite: {caminho or 'em memória'} (WAL)"
+
+def _inserir_lote_oracle(_cursor, _linhas: list[dict]) -> tuple[list, list]:
+    """Um único executemany com RETURNING (array DML); linhas com erro não interrompem o lote (batch errors).
+    Retorna (IDs gerados por posição, None nas linhas com erro) e [(posição, mensagem)]."""
+    ids_var = _cursor.var(oracledb.DB_TYPE_NUMBER, arraysize=len(_linhas))
+    _cursor.setinputsizes(id_paciente=ids_var)
+    _cursor.executemany(COMANDO_INSERT_PACIENTE.rstrip() + " RETURNING ID_PACIENTE INTO :id_paciente",
+                        _linhas, batcherrors=True)
+
+    erros = []
+    for erro in _cursor.getbatcherrors():
+        erros.append((erro.offset, erro.message))
+    posicoes_com_erro = {posicao for posicao, _ in erros}
+
+    ids = []
+    for i in range(len(_linhas)):
+        ids.append(None if i in posicoes_com_erro else int(ids_var.getvalue(i)[0]))
+    return ids, erros
+
+def _inserir_lote_sqlite(_cursor, _linhas: list[dict]) -> tuple[list, list]:
+    """SQLite: um INSERT por linha na mesma transação (o banco é local, não há ida e volta a economizar)
+    lendo o lastrowid; um INSERT com erro desfaz só a própria linha, como os batch errors do Oracle.
+    Mesmo retorno de _inserir_lote_oracle."""
+    ids = []
+    erros = []
+    for i, linha in enumerate(_linhas):
+        try:
+            _cursor.execute(COMANDO_INSERT_PACIENTE, linha)
+            ids.append(_cursor.lastrowid)
+        except sqlite3.Error as e:
+            ids.append(None)
+            erros.append((i, str(e)))
+    return ids, erros
+
+def _timestamp_sqlite(_valor):
+    """No SQLite, TIMESTAMP lido de uma expressão (MAX, COALESCE...) vem como texto: converte para datetime."""
+    if isinstance(_valor, str):
+        return datetime.fromisoformat(_valor)
+    return _valor
+
+def _parametro_timestamp_sqlite(_valor):
+    """Bind comparado com colunas TIMESTAMP no SQLite: texto no formato gravado pelos DEFAULTs e triggers."""
+    if isinstance(_valor, datetime):
+        return _valor.strftime("%Y-%m-%d %H:%M:%S.") + f"{_valor.microsecond // 1000:03d}"
+    return _valor
+
+BACKENDS_ARMAZENAMENTO = {
+    "oracle": {
+        "abrir": criar_pool_oracledb,
+        "descrever": _descrever_oracle,
+        "limite": "FETCH FIRST :{bind} ROWS ONLY",
+        "inserir_lote": _inserir_lote_oracle,
+        "valor_timestamp": lambda valor: valor,
+        "parametro_timestamp": lambda valor: valor
+    },
+    "sqlite": {
+        "abrir": conectar_sqlite,
+        "descrever": _descrever_sqlite,
+        "limite": "LIMIT :{bind}",
+        "inserir_lote": _inserir_lote_sqlite,
+        "valor_timestamp": _timestamp_sqlite,
+        "parametro_timestamp": _parametro_timestamp_sqlite
+    }
+}
+
+def _backend(_conexao) -> dict:
+    """Funções e trechos de SQL do banco por trás da conexão/pool."""
+    return BACKENDS_ARMAZENAMENTO[_dialeto(_conexao)]
+
+def abrir_backend(_tipo: str = None, **_configuracao) -> tuple[bool, any]:
+    """
+    Abre a origem de dados do backend escolhido (padrão: CONFIG_BACKEND["tipo"]):
+      "oracle" -> pool de sessões (_user, _password, _dsn e, opcionalmente, _min, _max, _incremento);
+      "sqlite" -> conexão com o arquivo local (_caminho; padrão: CONFIG_BACKEND["caminho_sqlite"]).
+    Retorna (True, origem) ou (False, erro).
+    """
+    tipo = (_tipo or CONFIG_BACKEND["tipo"]).lower()
+    if tipo not in BACKENDS_ARMAZENAMENTO:
+        return (False, f"Backend de armazenamento desconhecido: {tipo}")
+
+    if tipo == "sqlite" and "_caminho" not in _configuracao:
+        _configuracao["_caminho"] = CONFIG_BACKEND["caminho_sqlite"]
+
+    return BACKENDS_ARMAZENAMENTO[tipo]["abrir"](**_configuracao)
+
+def descrever_backend(_origem) -> str:
+    """Linha de status da origem de dados (pool Oracle ou arquivo SQLite) para o menu."""
+    return _backend(_origem)["descrever"](_origem)
+
+def valor_timestamp(_conexao, _valor):
+    """TIMESTAMP lido do banco (inclusive de MAX/COALESCE) como datetime, em qualquer backend."""
+    return _backend(_conexao)["valor_timestamp"](_valor)
+
+def parametro_timestamp(_conexao, _valor):
+    """Valor de bind para comparar com colunas TIMESTAMP, no formato que o backend compara corretamente."""
+    return _backend(_conexao)["parametro_timestamp"](_valor)
+
 # ========= FUNÇÃO PARA VERIFICAR SE TABELA TEM DADOS =========
-def verifica_tabela(_conexao: oracledb.Connection, nome_tabela: str) -> bool:
+def verifica_tabela(_conexao: oracledb.Connection | oracledb.ConnectionPool, nome_tabela: str) -> bool:
     """Verifica se a tabela possui registros e retorna True ou False."""
     try:
-        cur = _conexao.cursor()
-        cur.execute(f"SELECT 1 FROM {nome_tabela} WHERE ROWNUM = 1")
-        resultado = cur.fetchone()
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute(f"SELECT 1 FROM {nome_tabela} {_sql_limite(conexao)}", {"tamanho": 1})
+            resultado = cur.fetchone()
+            cur.close()
         return bool(resultado)
     except Exception as e:
         print(f"Erro ao verificar tabela {nome_tabela}: {e}")
         return False
-    finally:
-        cur.close()
 
 # ========= INSERT PACIENTE =========
-def insert_paciente(_conexao: oracledb.Connection, _dados_paciente: dict) -> tuple[bool, any]:
-    """
-    Insere um novo paciente na tabela T_PACIENTE do banco Oracle usando os dados fornecidos.
-    Converte datas e horários para os formatos adequados e realiza commit da transação.
-    Retorna uma tupla indicando sucesso e, em caso de erro, o objeto de exceção.
-    """
-    try:
-        comando_sql = """
+COMANDO_INSERT_PACIENTE = """
         INSERT INTO T_PACIENTE (
             NM_COMPLETO, DT_NASCIMENTO, SEXO, CPF, RG, ESTADO_CIVIL, BRASILEIRO,
             CEP, RUA, BAIRRO, CIDADE, ESTADO, NUMERO_ENDERECO, CELULAR, EMAIL, CONVENIO,
@@ -690,43 +2083,197 @@ def insert_paciente(_conexao: oracledb.Connection, _dados_paciente: dict) -> tup
             TO_TIMESTAMP(:data_hora_consulta, 'DD/MM/YYYY HH24:MI'), :tipo_consulta, :especialidade, :status_consulta
         )
         """
-        cur = _conexao.cursor()
-        cur.execute(comando_sql, _dados_paciente)
-        _conexao.commit()
-        cur.close()
+
+# Chaves do dicionário montado por solicitar_dados_paciente (mesma ordem das colunas do INSERT)
+CHAVES_DADOS_PACIENTE = [
+    "nome_completo", "data_nascimento", "sexo", "cpf", "rg", "estado_civil", "brasileiro",
+    "cep", "rua", "bairro", "cidade", "estado", "numero_endereco", "celular", "email", "convenio",
+    "data_hora_consulta", "tipo_consulta", "especialidade", "status_consulta"
+]
+
+def insert_paciente(_conexao: oracledb.Connection | oracledb.ConnectionPool, _dados_paciente: dict) -> tuple[bool, any]:
+    """
+    Insere um novo paciente na tabela T_PACIENTE do banco Oracle usando os dados fornecidos.
+    Converte datas e horários para os formatos adequados e realiza commit da transação.
+    Retorna uma tupla indicando sucesso e, em caso de erro, o objeto de exceção.
+    """
+    try:
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+
+            if _dialeto(conexao) == "sqlite":
+                cur.execute(COMANDO_INSERT_PACIENTE, _dados_paciente)
+                id_paciente = cur.lastrowid
+            else:
+                id_var = cur.var(oracledb.DB_TYPE_NUMBER)
+                cur.execute(COMANDO_INSERT_PACIENTE.rstrip() + " RETURNING ID_PACIENTE INTO :id_paciente",
+                            {**_dados_paciente, "id_paciente": id_var})
+                id_paciente = int(id_var.getvalue()[0])
+
+            if trigramas_disponiveis(conexao):
+                valores_trigrama = {}
+                for campo, chave in CAMPOS_TRIGRAMA.items():
+                    valores_trigrama[campo] = _dados_paciente.get(chave)
+                indexar_trigramas_paciente(cur, id_paciente, valores_trigrama)
+
+            conexao.commit()
+            cur.close()
+
+        invalidar_cache_preview()
+        atualizar_indice_fuzzy(id_paciente, _dados_paciente.get("nome_completo"))
 
         return (True, None)
 
     except Exception as e:
         return (False, e)
 
-# ========= SELECT PACIENTE =========
-def select_paciente(_conexao: oracledb.Connection, _campos: str) -> tuple[bool, any]:
+# ========= INSERT PACIENTES EM LOTE =========
+def insert_pacientes_em_lote(_conexao: oracledb.Connection | oracledb.ConnectionPool, _pacientes, _tamanho_lote: int = 1000) -> tuple[bool, any]:
     """
-    Retorna registros da tabela T_PACIENTE como lista de dicionários.
-    Recebe uma string com os campos para SELECT (ex: id_paciente, nm_completo).
+    Insere muitos pacientes em lotes, um commit por lote, pelo caminho rápido do backend
+    (executemany/array DML no Oracle, INSERTs na mesma transação no SQLite).
+    Recebe qualquer iterável de dicionários no formato de solicitar_dados_paciente.
+    Linhas com erro não interrompem o lote (batch errors) e são relatadas individualmente.
+    Retorna (True, {"inseridos": n, "ids": [ID_PACIENTE gerados], "erros": [(posição, mensagem)]}).
+    Se um lote falhar, ele é desfeito e os anteriores continuam gravados: retorna
+    (False, {"erro": erro, "processados": linhas dos lotes gravados, "inseridos", "ids", "erros"}),
+    e a carga pode ser retomada a partir da posição "processados".
     """
+    inseridos = 0
+    ids_gerados = []
+    erros = []
+    posicao_inicial = 0
+
     try:
-        query = f"SELECT {_campos} FROM T_PACIENTE"
+        iterador = iter(_pacientes)
+
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur_trigrama = conexao.cursor()
 
-        with _conexao.cursor() as cur:
-            cur.execute(query)
+            try:
+                indexar_trigramas = trigramas_disponiveis(conexao)
+                inserir_lote = _backend(conexao)["inserir_lote"]
+
+                lote = []
+                for dados in itertools.islice(iterador, _tamanho_lote):
+                    lote.append(dados)
+
+                while lote:
+                    linhas = []
+                    for dados in lote:
+                        linha = {}
+                        for chave in CHAVES_DADOS_PACIENTE:
+                            linha[chave] = dados.get(chave)
+                        linhas.append(linha)
+
+                    ids_lote, erros_lote = inserir_lote(cur, linhas)
+
+                    linhas_trigrama = []
+                    for i, id_paciente in enumerate(ids_lote):
+                        if id_paciente is not None:
+                            valores_trigrama = {}
+                            for campo, chave in CAMPOS_TRIGRAMA.items():
+                                valores_trigrama[campo] = linhas[i][chave]
+                            linhas_trigrama.extend(_linhas_trigrama(id_paciente, valores_trigrama))
+
+                    if linhas_trigrama and indexar_trigramas:
+                        cur_trigrama.executemany(
+                            "INSERT INTO T_PACIENTE_TRIGRAMA (CAMPO, TRIGRAMA, ID_PACIENTE) VALUES (:campo, :trigrama, :id_paciente)",
+                            linhas_trigrama
+                        )
+
+                    conexao.commit()
+
+                    # Só depois do commit: progresso, cache e índice aproximado refletem apenas lotes gravados
+                    for posicao, mensagem in erros_lote:
+                        erros.append((posicao_inicial + posicao, mensagem))
+                    for i, id_paciente in enumerate(ids_lote):
+                        if id_paciente is not None:
+                            ids_gerados.append(id_paciente)
+                            atualizar_indice_fuzzy(id_paciente, linhas[i]["nome_completo"])
+                            inseridos += 1
+                    invalidar_cache_preview()
+
+                    posicao_inicial += len(lote)
+                    lote = []
+                    for dados in itertools.islice(iterador, _tamanho_lote):
+                        lote.append(dados)
+
+            except Exception:
+                conexao.rollback()  # desfaz só o lote em andamento
+                raise
+
+            finally:
+                cur_trigrama.close()
+                cur.close()
+
+        return (True, {"inseridos": inseridos, "ids": ids_gerados, "erros": erros})
+
+    except Exception as e:
+        return (False, {"erro": e, "processados": posicao_inicial, "inseridos": inseridos, "ids": ids_gerados, "erros": erros})
+
+# ========= SELECT PACIENTE (STREAMING) =========
+def _preparar_cursor_streaming(_cursor, _arraysize: int, _prefetchrows: int) -> None:
+    """Ajusta quantas linhas o cursor traz por ida ao banco (arraysize) e já na execução (prefetchrows)."""
+    _cursor.arraysize = _arraysize
+    if hasattr(_cursor, "prefetchrows"):
+        _cursor.prefetchrows = _prefetchrows
+
+def _aplicar_fabrica_dict(_cursor, _colunas: list[str]) -> None:
+    """Faz o cursor devolver cada linha diretamente como dicionário {coluna: valor}."""
+    if hasattr(_cursor, "rowfactory"):
+        _cursor.rowfactory = lambda *valores: dict(zip(_colunas, valores))
+    else:
+        _cursor.row_factory = lambda _cur, valores: dict(zip(_colunas, valores))
+
+def select_paciente_stream(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campos: str,
+                           _tamanho_lote: int = None, _arraysize: int = 1000, _prefetchrows: int = 1000,
+                           _filtro_sql: str = "", _parametros: dict = None):
+    """
+    Gera registros da tabela T_PACIENTE conforme chegam do banco, sem montar a lista completa.
+    Sem _tamanho_lote gera um dicionário por linha; com _tamanho_lote gera listas de até esse tamanho.
+    _filtro_sql é anexado após o FROM (ex: "WHERE ID_PACIENTE > :id ORDER BY ID_PACIENTE").
+    As chaves seguem select_paciente (nomes das colunas em minúsculas). Erros de banco são propagados.
+    """
+    query = f"SELECT {_campos} FROM T_PACIENTE {_filtro_sql}".rstrip()
+
+    with emprestar_conexao(_conexao) as conexao:
+        cur = conexao.cursor()
+        try:
+            _preparar_cursor_streaming(cur, _arraysize, _prefetchrows)
+            cur.execute(query, _parametros or {})
 
             colunas_cursor = []
             for c in cur.description:
                 colunas_cursor.append(c[0].lower())
+            _aplicar_fabrica_dict(cur, colunas_cursor)
 
-            resultados = cur.fetchall()
-            df = pd.DataFrame(resultados, columns=colunas_cursor)
-
+            if _tamanho_lote:
+                lote = cur.fetchmany(_tamanho_lote)
+                while lote:
+                    yield lote
+                    lote = cur.fetchmany(_tamanho_lote)
+            else:
+                for linha in cur:
+                    yield linha
+        finally:
+            cur.close()
 
-        return True, df.to_dict(orient="records")
+# ========= SELECT PACIENTE =========
+def select_paciente(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campos: str) -> tuple[bool, any]:
+    """
+    Retorna registros da tabela T_PACIENTE como lista de dicionários.
+    Recebe uma string com os campos para SELECT (ex: id_paciente, nm_completo).
+    """
+    try:
+        return True, list(select_paciente_stream(_conexao, _campos))
 
     except Exception as e:
         return False, e
 
 # ========= SELECT PACIENTE POR ID =========
-def select_paciente_por_id(_conexao: oracledb.Connection, campos: str, _id_paciente: int) -> tuple[bool, any]:
+def select_paciente_por_id(_conexao: oracledb.Connection | oracledb.ConnectionPool, campos: str, _id_paciente: int) -> tuple[bool, any]:
     """
     Recupera os dados de um paciente específico pelo ID a partir da tabela T_PACIENTE.
     Retorna apenas os campos especificados e converte o resultado em lista de dicionários.
@@ -737,248 +2284,1436 @@ def select_paciente_por_id(_conexao: oracledb.Connection, campos: str, _id_pacie
         return False, "Erro: é necessário informar o ID do paciente."
 
     try:
-        query = f"SELECT {campos} FROM T_PACIENTE WHERE id_paciente = :id_paciente"
+        resultados = list(select_paciente_stream(
+            _conexao, campos, _arraysize=2, _prefetchrows=2,
+            _filtro_sql="WHERE id_paciente = :id_paciente", _parametros={"id_paciente": _id_paciente}
+        ))
 
-        cur = _conexao.cursor()
-        cur.execute(query, {"id_paciente": _id_paciente})
+        return True, resultados
 
-        colunas_cursor = []
-        for c in cur.description:
-            colunas_cursor.append(c[0].lower())
+    except Exception as e:
+        return False, str(e)
+
+# ========= CONTAGEM DE PACIENTES =========
+def contar_pacientes(_conexao: oracledb.Connection | oracledb.ConnectionPool, _filtros: list[dict] = None) -> tuple[bool, any]:
+    """Retorna (True, total de registros em T_PACIENTE) ou (False, erro).
+    Com _filtros (formato de montar_condicoes_paciente), conta só os pacientes que atendem a eles."""
+    try:
+        with emprestar_conexao(_conexao) as conexao:
+            comando_sql = "SELECT COUNT(*) FROM T_PACIENTE"
+            parametros = {}
+            if _filtros:
+                condicoes, parametros = montar_condicoes_paciente(_filtros, _dialeto(conexao))
+                comando_sql += "\nWHERE " + "\n  AND ".join(condicoes)
+
+            cur = conexao.cursor()
+            cur.execute(comando_sql, parametros)
+            total = cur.fetchone()[0]
+            cur.close()
+
+        return True, total
 
-        resultados = cur.fetchall()
+    except Exception as e:
+        return False, e
+
+# ========= SELECT PACIENTE PAGINADO =========
+TAMANHO_PAGINA_PADRAO = 20
+CAMPOS_PREVIEW = "ID_PACIENTE, NM_COMPLETO, TIPO_CONSULTA, STATUS_CONSULTA"
+
+def select_paciente_pagina(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campos: str,
+                           _apos_id: int = None, _antes_id: int = None,
+                           _tamanho_pagina: int = TAMANHO_PAGINA_PADRAO) -> tuple[bool, any]:
+    """
+    Busca uma página de T_PACIENTE por paginação de chave (keyset) em ID_PACIENTE.
+    Com _apos_id traz os próximos registros depois desse ID; com _antes_id traz a página anterior a ele;
+    sem nenhum dos dois traz a primeira página.
+    Retorna (True, {"linhas": [...], "primeiro_id", "ultimo_id", "tem_anterior", "tem_proxima"}) ou (False, erro).
+    """
+    try:
+        campos = "T_PACIENTE.*" if _campos.strip() == "*" else _campos
 
+        if _antes_id is not None:
+            filtro = "WHERE ID_PACIENTE < :chave ORDER BY ID_PACIENTE DESC"
+            chave = _antes_id
+        else:
+            filtro = "WHERE ID_PACIENTE > :chave ORDER BY ID_PACIENTE"
+            chave = _apos_id if _apos_id is not None else 0
+
+        # Busca uma linha a mais para saber se existe outra página na mesma direção
+        linhas = list(select_paciente_stream(
+            _conexao, f"ID_PACIENTE AS CHAVE_PAGINACAO, {campos}",
+            _arraysize=_tamanho_pagina + 1, _prefetchrows=_tamanho_pagina + 1,
+            _filtro_sql=f"{filtro} {_sql_limite(_conexao)}",
+            _parametros={"chave": chave, "tamanho": _tamanho_pagina + 1}
+        ))
+
+        existe_mais = len(linhas) > _tamanho_pagina
+        linhas = linhas[:_tamanho_pagina]
+
+        if _antes_id is not None:
+            linhas.reverse()
+
+        chaves = []
+        for linha in linhas:
+            chaves.append(linha.pop("chave_paginacao"))
+
+        pagina = {
+            "linhas": linhas,
+            "primeiro_id": chaves[0] if chaves else None,
+            "ultimo_id": chaves[-1] if chaves else None,
+            "tem_anterior": existe_mais if _antes_id is not None else _apos_id is not None,
+            "tem_proxima": existe_mais if _antes_id is None else True
+        }
+
+        return True, pagina
+
+    except Exception as e:
+        return False, e
+
+# ========= CACHE DO PREVIEW DE PACIENTES =========
+# Guarda a primeira página do preview, o total e a tabela já renderizada.
+# Alterações feitas pelo próprio programa invalidam o cache; alterações de outros usuários
+# são trazidas por uma atualização incremental (DT_ULTIMA_ATUALIZACAO >= marca d'água) após o TTL.
+CACHE_PREVIEW = {
+    "linhas": {},            # {id_paciente: linha}
+    "total": 0,
+    "marca_dagua": None,     # maior DT_ULTIMA_ATUALIZACAO já vista
+    "tabela": None,          # tabela renderizada (sem o rodapé)
+    "tamanho_pagina": None,
+    "atualizado_em": 0.0,
+    "valido": False,         # False -> recarrega a página inteira
+    "pendente": False,       # True  -> atualização incremental na próxima leitura
+    "ttl_segundos": 30,
+    "sobreposicao_segundos": 5  # relê alterações recentes para não perder transações confirmadas com atraso
+}
+
+def invalidar_cache_preview(_ids_removidos: list = None, _quantidade_removida: int = 0) -> None:
+    """Marca o preview para atualização após inserts/updates do programa.
+    Para exclusões, informe os IDs removidos e a quantidade de linhas apagadas."""
+    if _ids_removidos is None:
+        CACHE_PREVIEW["pendente"] = True
+        return
+
+    CACHE_PREVIEW["total"] = max(0, CACHE_PREVIEW["total"] - _quantidade_removida)
+    CACHE_PREVIEW["tabela"] = None
+
+    for id_paciente in _ids_removidos:
+        if id_paciente in CACHE_PREVIEW["linhas"]:
+            # Abriu um buraco na primeira página: ela precisa ser buscada de novo
+            CACHE_PREVIEW["valido"] = False
+            break
+
+def limpar_cache_preview() -> None:
+    """Descarta todo o conteúdo do cache do preview."""
+    CACHE_PREVIEW.update({
+        "linhas": {}, "total": 0, "marca_dagua": None, "tabela": None,
+        "tamanho_pagina": None, "atualizado_em": 0.0, "valido": False, "pendente": False
+    })
+
+def _recarregar_cache_preview(_conexao, _tamanho_pagina: int) -> None:
+    """Carrega do zero a primeira página, o total e a marca d'água do preview."""
+    with emprestar_conexao(_conexao) as conexao:
+        cur = conexao.cursor()
+        cur.execute("SELECT COUNT(*), MAX(DT_ULTIMA_ATUALIZACAO) FROM T_PACIENTE")
+        total, marca_dagua = cur.fetchone()
+        marca_dagua = valor_timestamp(conexao, marca_dagua)
+        cur.close()
+
+        sucesso_pagina, pagina = select_paciente_pagina(conexao, CAMPOS_PREVIEW, _tamanho_pagina=_tamanho_pagina)
+        if not sucesso_pagina:
+            raise pagina
+
+    linhas = {}
+    for linha in pagina["linhas"]:
+        linhas[linha["id_paciente"]] = linha
+
+    CACHE_PREVIEW.update({
+        "linhas": linhas, "total": total, "marca_dagua": marca_dagua, "tabela": None,
+        "tamanho_pagina": _tamanho_pagina, "valido": True, "pendente": False
+    })
+
+def _atualizar_cache_preview(_conexao, _tamanho_pagina: int) -> None:
+    """Traz só as linhas alteradas desde a marca d'água (menos a sobreposição) e as aplica à página em cache.
+    Exclusões de outras sessões não aparecem nessa consulta: o total é contado de novo e os IDs da
+    página são conferidos; se algum sumiu, a página inteira é recarregada."""
+    desde = CACHE_PREVIEW["marca_dagua"] - timedelta(seconds=CACHE_PREVIEW["sobreposicao_segundos"])
+    ids_pagina = list(CACHE_PREVIEW["linhas"])
+
+    with emprestar_conexao(_conexao) as conexao:
+        cur = conexao.cursor()
+        cur.execute(f"""
+            SELECT {CAMPOS_PREVIEW}, DT_ULTIMA_ATUALIZACAO
+            FROM T_PACIENTE
+            WHERE DT_ULTIMA_ATUALIZACAO >= :marca_dagua
+        """, {"marca_dagua": parametro_timestamp(conexao, desde)})
+
+        colunas = []
+        for c in cur.description:
+            colunas.append(c[0].lower())
+        alteradas = [dict(zip(colunas, linha)) for linha in cur.fetchall()]
+
+        cur.execute("SELECT COUNT(*) FROM T_PACIENTE")
+        total = int(cur.fetchone()[0])
+
+        presentes = set()
+        if ids_pagina:
+            binds = {}
+            for i, id_paciente in enumerate(ids_pagina):
+                binds[f"id_{i}"] = id_paciente
+            cur.execute(f"SELECT ID_PACIENTE FROM T_PACIENTE WHERE ID_PACIENTE IN ({', '.join(':' + nome for nome in binds)})", binds)
+            presentes = {int(linha[0]) for linha in cur.fetchall()}
         cur.close()
 
-        if not resultados:
-            return True, []  
+    if len(presentes) < len(ids_pagina):
+        # Outra sessão excluiu pacientes da primeira página: ela é buscada de novo
+        _recarregar_cache_preview(_conexao, _tamanho_pagina)
+        return
+
+    CACHE_PREVIEW["total"] = total
+
+    linhas = CACHE_PREVIEW["linhas"]
+    for alterada in alteradas:
+        marca_dagua = alterada.pop("dt_ultima_atualizacao")
+        CACHE_PREVIEW["marca_dagua"] = max(CACHE_PREVIEW["marca_dagua"], marca_dagua)
+
+        id_paciente = alterada["id_paciente"]
+        if id_paciente in linhas or len(linhas) < _tamanho_pagina or id_paciente < max(linhas):
+            if linhas.get(id_paciente) != alterada:
+                linhas[id_paciente] = alterada
+                CACHE_PREVIEW["tabela"] = None
 
-        df = pd.DataFrame(resultados, columns=colunas_cursor)
-        return True, df.to_dict(orient="records")
+    # Mantém apenas os menores IDs (primeira página)
+    while len(linhas) > _tamanho_pagina:
+        del linhas[max(linhas)]
+
+    CACHE_PREVIEW["pendente"] = False
+
+def montar_preview_pacientes(_conexao: oracledb.Connection | oracledb.ConnectionPool,
+                             _tamanho_pagina: int = TAMANHO_PAGINA_PADRAO) -> tuple[bool, str]:
+    """Monta a tabela de preview (ID, nome, tipo e status da consulta) só com a primeira página
+    e o total de pacientes. Usa o cache do preview: sem alterações pendentes e dentro do TTL
+    não há consulta ao banco nem nova renderização. Retorna (True, tabela) ou (False, mensagem de erro)."""
+    try:
+        expirado = time.monotonic() - CACHE_PREVIEW["atualizado_em"] > CACHE_PREVIEW["ttl_segundos"]
+
+        if not CACHE_PREVIEW["valido"] or CACHE_PREVIEW["tamanho_pagina"] != _tamanho_pagina or CACHE_PREVIEW["marca_dagua"] is None:
+            _recarregar_cache_preview(_conexao, _tamanho_pagina)
+            CACHE_PREVIEW["atualizado_em"] = time.monotonic()
+        elif CACHE_PREVIEW["pendente"] or expirado:
+            _atualizar_cache_preview(_conexao, _tamanho_pagina)
+            CACHE_PREVIEW["atualizado_em"] = time.monotonic()
 
     except Exception as e:
-        return False, str(e)
+        limpar_cache_preview()
+        return False, f"Erro ao consultar pacientes: {e}"
 
-# ========= SELECT PACIENTE POR TEXTO =========
-def buscar_paciente_por_texto(_conexao: oracledb.Connection, _campo_where: str, _texto: str, _colunas_exibir: str) -> list[dict]:
+    if CACHE_PREVIEW["tabela"] is None:
+        linhas_ordenadas = []
+        for id_paciente in sorted(CACHE_PREVIEW["linhas"]):
+            linhas_ordenadas.append(CACHE_PREVIEW["linhas"][id_paciente])
+
+        sucesso_tabela, tabela = imprimir_resultado_tabulate_oracle(linhas_ordenadas)
+        if not sucesso_tabela:
+            return False, tabela
+        CACHE_PREVIEW["tabela"] = tabela
+
+    return True, f"{CACHE_PREVIEW['tabela']}\nExibindo {len(CACHE_PREVIEW['linhas'])} de {CACHE_PREVIEW['total']} pacientes.\n"
+
+def navegar_paginas_pacientes(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campos: str,
+                              _titulo: str, _tamanho_pagina: int = TAMANHO_PAGINA_PADRAO,
+                              _preview: bool = False) -> None:
     """
-    Busca pacientes na tabela T_PACIENTE filtrando por texto em um campo específico.
-    Retorna apenas as colunas selecionadas e converte os resultados em lista de dicionários.
-    Campos inválidos ou erros de execução retornam uma lista vazia.
+    Exibe T_PACIENTE página por página, com navegação para a próxima/anterior e o total de registros.
+    Enquanto uma página é exibida, a próxima já é buscada em segundo plano.
+    Com _preview=True mostra as colunas do preview (_campos é ignorado) e a primeira página e o total
+    vêm do cache do preview (montar_preview_pacientes), sem nova consulta enquanto ele estiver válido.
     """
+    if _preview:
+        _campos = CAMPOS_PREVIEW
+        sucesso_preview, erro_preview = montar_preview_pacientes(_conexao, _tamanho_pagina)
+        if not sucesso_preview:
+            print(f"\n{erro_preview}")
+            return
+
+        total = CACHE_PREVIEW["total"]
+        ids = sorted(CACHE_PREVIEW["linhas"])
+        sucesso, pagina = True, {
+            "linhas": [CACHE_PREVIEW["linhas"][id_paciente] for id_paciente in ids],
+            "primeiro_id": ids[0] if ids else None,
+            "ultimo_id": ids[-1] if ids else None,
+            "tem_anterior": False,
+            "tem_proxima": total > len(ids)
+        }
+    else:
+        sucesso_total, total = contar_pacientes(_conexao)
+        if not sucesso_total:
+            print(f"\nErro ao consultar pacientes no banco de dados:\n{total}")
+            return
+        sucesso, pagina = None, None
 
-    campos_validos = ["NM_COMPLETO", "ESTADO_CIVIL", "RUA", "BAIRRO", "CIDADE", "EMAIL", "TIPO_CONSULTA",
-    "ESPECIALIDADE", "STATUS_CONSULTA"]
+    total_paginas = max(1, -(-total // _tamanho_pagina))
+    numero_pagina = 1
 
-    if _campo_where.upper() not in campos_validos:
-        print("\nErro: campo inválido para busca textual.\n")
-        return []
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        if pagina is None:
+            sucesso, pagina = select_paciente_pagina(_conexao, _campos, _tamanho_pagina=_tamanho_pagina)
+
+        while True:
+            if not sucesso:
+                print(f"\nErro ao consultar pacientes no banco de dados:\n{pagina}")
+                return
+
+            futuro_proxima = None
+            if pagina["tem_proxima"] and pagina["ultimo_id"] is not None:
+                futuro_proxima = executor.submit(
+                    select_paciente_pagina, _conexao, _campos, pagina["ultimo_id"], None, _tamanho_pagina
+                )
+
+            limpar_terminal()
+            exibir_titulo_centralizado(_titulo, 60)
+            sucesso_tabela, tabela = imprimir_resultado_tabulate_oracle(pagina["linhas"])
+            print(tabela)
+            print(f"\nPágina {numero_pagina} de {total_paginas} — {total} pacientes no total.")
+
+            opcoes = []
+            if futuro_proxima is not None:
+                opcoes.append("[P] Próxima")
+            if pagina["tem_anterior"] and numero_pagina > 1:
+                opcoes.append("[A] Anterior")
+            opcoes.append("[S] Sair")
+
+            escolha = input(f"{'  '.join(opcoes)}: ").strip().upper()
+
+            if escolha.startswith("P") and futuro_proxima is not None:
+                sucesso, pagina = futuro_proxima.result()
+                numero_pagina += 1
+            elif escolha.startswith("A") and pagina["tem_anterior"] and numero_pagina > 1:
+                sucesso, pagina = select_paciente_pagina(
+                    _conexao, _campos, _antes_id=pagina["primeiro_id"], _tamanho_pagina=_tamanho_pagina
+                )
+                numero_pagina -= 1
+            elif escolha.startswith("S"):
+                return
 
-    if not _colunas_exibir.strip():
-        print("\nErro: nenhuma coluna selecionada para exibição.\n")
-        return []
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    comando_sql = f"""
-        SELECT {_colunas_exibir}
-        FROM T_PACIENTE
-        WHERE UPPER({_campo_where}) LIKE :texto
-    """
+# ==========================================================
+#   BUSCA TEXTUAL INDEXADA
+# ==========================================================
+# Prefixo : faixa (>= / <) sobre a expressão normalizada (maiúsculas e sem acentos), que usa os
+#           índices baseados em função criados por gerar_ddl_busca_textual.
+# Contém  : índice de trigramas (T_PACIENTE_TRIGRAMA) para NM_COMPLETO, RUA, BAIRRO e CIDADE;
+#           só os candidatos que têm todos os trigramas do texto são conferidos com LIKE.
+
+CAMPOS_BUSCA_TEXTUAL = ["NM_COMPLETO", "ESTADO_CIVIL", "RUA", "BAIRRO", "CIDADE", "EMAIL", "TIPO_CONSULTA",
+                        "ESPECIALIDADE", "STATUS_CONSULTA"]
+
+CAMPOS_TRIGRAMA = {
+    "NM_COMPLETO": "nome_completo",
+    "RUA": "rua",
+    "BAIRRO": "bairro",
+    "CIDADE": "cidade"
+}
+
+_ACENTOS_ORIGEM = "ÁÀÂÃÄÉÈÊËÍÌÎÏÓÒÔÕÖÚÙÛÜÇÑ"
+_ACENTOS_DESTINO = "AAAAAEEEEIIIIOOOOOUUUUCN"
+_TABELA_ACENTOS = str.maketrans(_ACENTOS_ORIGEM, _ACENTOS_DESTINO)
+
+def normalizar_texto(_texto) -> str | None:
+    """Converte o texto para maiúsculas e remove acentos (mesma regra do TRANSLATE usado no Oracle)."""
+    if _texto is None:
+        return None
+    return str(_texto).upper().translate(_TABELA_ACENTOS)
+
+def _expressao_normalizada(_coluna: str, _dialeto_bd: str) -> str:
+    """Expressão SQL normalizada da coluna; precisa ser idêntica à dos índices para que sejam usados."""
+    if _dialeto_bd == "sqlite":
+        return f"NORMALIZAR_TEXTO({_coluna})"
+    return f"TRANSLATE(UPPER({_coluna}), '{_ACENTOS_ORIGEM}', '{_ACENTOS_DESTINO}')"
+
+def gerar_ddl_busca_textual(_dialeto_bd: str = "oracle") -> list[str]:
+    """Comandos que criam os índices de prefixo e a tabela de trigramas da busca textual."""
+    comandos = []
+
+    if _dialeto_bd == "sqlite":
+        for campo in CAMPOS_BUSCA_TEXTUAL:
+            comandos.append(f"CREATE INDEX IF NOT EXISTS IX_PAC_{campo}_N ON T_PACIENTE ({_expressao_normalizada(campo, 'sqlite')})")
+        comandos.append("""
+            CREATE TABLE IF NOT EXISTS T_PACIENTE_TRIGRAMA (
+                CAMPO       VARCHAR(30) NOT NULL,
+                TRIGRAMA    VARCHAR(3) NOT NULL,
+                ID_PACIENTE INTEGER NOT NULL REFERENCES T_PACIENTE (ID_PACIENTE) ON DELETE CASCADE,
+                PRIMARY KEY (CAMPO, TRIGRAMA, ID_PACIENTE)
+            ) WITHOUT ROWID
+        """)
+        comandos.append("CREATE INDEX IF NOT EXISTS IX_PAC_TRIGRAMA_ID ON T_PACIENTE_TRIGRAMA (ID_PACIENTE)")
+    else:
+        for campo in CAMPOS_BUSCA_TEXTUAL:
+            comandos.append(f"CREATE INDEX IX_PAC_{campo}_N ON T_PACIENTE ({_expressao_normalizada(campo, 'oracle')})")
+        comandos.append("""
+            CREATE TABLE T_PACIENTE_TRIGRAMA (
+                CAMPO       VARCHAR2(30) NOT NULL,
+                TRIGRAMA    VARCHAR2(3 CHAR) NOT NULL,
+                ID_PACIENTE NUMBER NOT NULL REFERENCES T_PACIENTE (ID_PACIENTE) ON DELETE CASCADE,
+                CONSTRAINT PK_PACIENTE_TRIGRAMA PRIMARY KEY (CAMPO, TRIGRAMA, ID_PACIENTE)
+            ) ORGANIZATION INDEX
+        """)
+        comandos.append("CREATE INDEX IX_PAC_TRIGRAMA_ID ON T_PACIENTE_TRIGRAMA (ID_PACIENTE)")
+
+    return comandos
+
+def criar_estruturas_busca_textual(_conexao) -> tuple[bool, any]:
+    """Executa os comandos de gerar_ddl_busca_textual no banco. Retorna (True, None) ou (False, erro)."""
+    try:
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            for comando in gerar_ddl_busca_textual(_dialeto(conexao)):
+                cur.execute(comando)
+            conexao.commit()
+            cur.close()
+
+        return (True, None)
+
+    except Exception as e:
+        return (False, e)
+
+# None = ainda não verificado; False = tabela de trigramas ausente (busca "contém" volta ao LIKE)
+CONFIG_BUSCA_TEXTUAL = {"trigramas_disponiveis": None}
+
+def trigramas_disponiveis(_conexao) -> bool:
+    """Verifica (uma vez por execução) se a tabela T_PACIENTE_TRIGRAMA existe no banco."""
+    if CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"] is None:
+        try:
+            with emprestar_conexao(_conexao) as conexao:
+                cur = conexao.cursor()
+                cur.execute("SELECT 1 FROM T_PACIENTE_TRIGRAMA WHERE 1 = 0")
+                cur.fetchall()
+                cur.close()
+            CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"] = True
+        except Exception:
+            CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"] = False
+
+    return CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"]
+
+def preparar_busca_textual(_conexao) -> tuple[bool, any]:
+    """Reconstrói o índice de trigramas se ele estiver vazio e houver pacientes cadastrados.
+    Retorna (True, quantidade indexada) ou (False, motivo)."""
+    if not trigramas_disponiveis(_conexao):
+        return (False, "Tabela T_PACIENTE_TRIGRAMA não encontrada; a busca 'contém' usará LIKE.")
 
     try:
-        cur = _conexao.cursor()
-        cur.execute(comando_sql, {"texto": f"%{_texto.upper()}%"})
-        resultados = cur.fetchall()
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM T_PACIENTE_TRIGRAMA {_sql_limite(conexao)})", {"tamanho": 1})
+            indexado = cur.fetchone()[0] > 0
+            cur.close()
+
+        if indexado or not verifica_tabela(_conexao, "T_PACIENTE"):
+            return (True, 0)
+
+        return reconstruir_indice_trigramas(_conexao)
+
+    except Exception as e:
+        return (False, e)
 
-        colunas = [col[0].upper() for col in cur.description]
+def gerar_trigramas(_texto) -> set[str]:
+    """Trigramas (sequências de 3 caracteres) do texto normalizado."""
+    texto = normalizar_texto(_texto) or ""
+    trigramas = set()
+    for i in range(len(texto) - 2):
+        trigramas.add(texto[i:i + 3])
+    return trigramas
+
+def _linhas_trigrama(_id_paciente: int, _valores: dict) -> list[dict]:
+    """Monta as linhas de T_PACIENTE_TRIGRAMA para os campos informados ({COLUNA: valor})."""
+    linhas = []
+    for campo, valor in _valores.items():
+        for trigrama in gerar_trigramas(valor):
+            linhas.append({"campo": campo, "trigrama": trigrama, "id_paciente": _id_paciente})
+    return linhas
+
+def indexar_trigramas_paciente(_cursor, _id_paciente: int, _valores: dict) -> None:
+    """Regrava os trigramas dos campos informados ({COLUNA: valor}) de um paciente.
+    Não faz commit: roda dentro da transação de quem chamou."""
+    for campo in _valores:
+        _cursor.execute(
+            "DELETE FROM T_PACIENTE_TRIGRAMA WHERE ID_PACIENTE = :id_paciente AND CAMPO = :campo",
+            {"id_paciente": _id_paciente, "campo": campo}
+        )
+
+    linhas = _linhas_trigrama(_id_paciente, _valores)
+    if linhas:
+        _cursor.executemany(
+            "INSERT INTO T_PACIENTE_TRIGRAMA (CAMPO, TRIGRAMA, ID_PACIENTE) VALUES (:campo, :trigrama, :id_paciente)",
+            linhas
+        )
+
+def reconstruir_indice_trigramas(_conexao, _tamanho_lote: int = 5000) -> tuple[bool, any]:
+    """Recria todo o índice de trigramas a partir de T_PACIENTE.
+    Retorna (True, quantidade de pacientes indexados) ou (False, erro)."""
+    campos = ", ".join(CAMPOS_TRIGRAMA)
+    comando_insert = "INSERT INTO T_PACIENTE_TRIGRAMA (CAMPO, TRIGRAMA, ID_PACIENTE) VALUES (:campo, :trigrama, :id_paciente)"
 
-        lista_pacientes = [dict(zip(colunas, linha)) for linha in resultados]
+    try:
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute("DELETE FROM T_PACIENTE_TRIGRAMA")
+
+            indexados = 0
+            for lote in select_paciente_stream(conexao, f"ID_PACIENTE, {campos}", _tamanho_lote=_tamanho_lote,
+                                               _arraysize=_tamanho_lote, _prefetchrows=_tamanho_lote):
+                linhas = []
+                for paciente in lote:
+                    valores = {}
+                    for campo in CAMPOS_TRIGRAMA:
+                        valores[campo] = paciente[campo.lower()]
+                    linhas.extend(_linhas_trigrama(paciente["id_paciente"], valores))
+
+                if linhas:
+                    cur.executemany(comando_insert, linhas)
+                indexados += len(lote)
+
+            conexao.commit()
+            cur.close()
 
-        return lista_pacientes
+        return (True, indexados)
 
     except Exception as e:
-        print(f"\nErro ao executar consulta SQL: {e}\n")
+        return (False, e)
+
+def _faixa_prefixo(_prefixo: str) -> tuple[str, str]:
+    """Limites [inicio, fim) que cobrem todos os textos que começam com o prefixo."""
+    return _prefixo, _prefixo[:-1] + chr(ord(_prefixo[-1]) + 1)
+
+def _escapar_like(_texto: str) -> str:
+    """Escapa os curingas do LIKE (% e _) usando '\\' como caractere de escape."""
+    return _texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+# ==========================================================
+#   BUSCA APROXIMADA POR NOME (EM MEMÓRIA)
+# ==========================================================
+# Índice de trigramas de NM_COMPLETO mantido no próprio programa: construído uma vez a partir
+# de T_PACIENTE e atualizado a cada insert/update/delete feito pelo programa.
+INDICE_FUZZY = {
+    "trigramas": {},   # {trigrama: {id_paciente, ...}}
+    "nomes": {},       # {id_paciente: (nome original, nome normalizado)}
+    "construido": False,
+    "trava": threading.Lock()
+}
+
+def _trigramas_fuzzy(_texto_normalizado: str) -> set[str]:
+    """Trigramas de cada palavra com espaços nas pontas, para que nomes curtos também gerem trigramas."""
+    trigramas = set()
+    for palavra in _texto_normalizado.split():
+        palavra = f"  {palavra} "
+        for i in range(len(palavra) - 2):
+            trigramas.add(palavra[i:i + 3])
+    return trigramas
+
+def _distancia_edicao(_a: str, _b: str) -> int:
+    """Distância de Levenshtein (inserções, remoções e trocas) entre dois textos."""
+    if len(_a) < len(_b):
+        _a, _b = _b, _a
+
+    anterior = list(range(len(_b) + 1))
+    for i, caractere_a in enumerate(_a, 1):
+        atual = [i]
+        for j, caractere_b in enumerate(_b, 1):
+            atual.append(min(
+                anterior[j] + 1,
+                atual[j - 1] + 1,
+                anterior[j - 1] + (caractere_a != caractere_b)
+            ))
+        anterior = atual
+
+    return anterior[-1]
+
+def _adicionar_ao_indice_fuzzy(_id_paciente: int, _nome: str) -> None:
+    """Inclui o nome no índice (a trava deve estar com quem chamou)."""
+    nome_normalizado = normalizar_texto(_nome or "")
+    INDICE_FUZZY["nomes"][_id_paciente] = (_nome, nome_normalizado)
+    for trigrama in _trigramas_fuzzy(nome_normalizado):
+        INDICE_FUZZY["trigramas"].setdefault(trigrama, set()).add(_id_paciente)
+
+def _retirar_do_indice_fuzzy(_id_paciente: int) -> None:
+    """Remove o paciente do índice (a trava deve estar com quem chamou)."""
+    registro = INDICE_FUZZY["nomes"].pop(_id_paciente, None)
+    if registro is None:
+        return
+
+    for trigrama in _trigramas_fuzzy(registro[1]):
+        ids = INDICE_FUZZY["trigramas"].get(trigrama)
+        if ids is not None:
+            ids.discard(_id_paciente)
+            if not ids:
+                del INDICE_FUZZY["trigramas"][trigrama]
+
+def construir_indice_fuzzy(_conexao) -> tuple[bool, any]:
+    """Carrega ID_PACIENTE e NM_COMPLETO de todos os pacientes no índice em memória.
+    Retorna (True, quantidade de nomes indexados) ou (False, erro)."""
+    try:
+        with INDICE_FUZZY["trava"]:
+            INDICE_FUZZY["trigramas"] = {}
+            INDICE_FUZZY["nomes"] = {}
+            INDICE_FUZZY["construido"] = False
+
+            for lote in select_paciente_stream(_conexao, "ID_PACIENTE, NM_COMPLETO", _tamanho_lote=5000,
+                                               _arraysize=5000, _prefetchrows=5000):
+                for paciente in lote:
+                    _adicionar_ao_indice_fuzzy(paciente["id_paciente"], paciente["nm_completo"])
+
+            INDICE_FUZZY["construido"] = True
+            return (True, len(INDICE_FUZZY["nomes"]))
+
+    except Exception as e:
+        return (False, e)
+
+def atualizar_indice_fuzzy(_id_paciente: int, _nome: str) -> None:
+    """Inclui ou substitui o nome de um paciente no índice, se ele já tiver sido construído."""
+    with INDICE_FUZZY["trava"]:
+        if INDICE_FUZZY["construido"]:
+            _retirar_do_indice_fuzzy(_id_paciente)
+            _adicionar_ao_indice_fuzzy(_id_paciente, _nome)
+
+def remover_do_indice_fuzzy(_id_paciente: int = None) -> None:
+    """Remove um paciente do índice; sem ID, esvazia o índice (usado ao apagar todos os pacientes)."""
+    with INDICE_FUZZY["trava"]:
+        if _id_paciente is None:
+            INDICE_FUZZY["trigramas"] = {}
+            INDICE_FUZZY["nomes"] = {}
+        else:
+            _retirar_do_indice_fuzzy(_id_paciente)
+
+def buscar_paciente_fuzzy(_texto: str, _limite: int = 10, _candidatos: int = 200) -> list[dict]:
+    """
+    Busca aproximada por nome, sem acessar o banco (o índice precisa ter sido construído).
+    Ignora acentos e maiúsculas e tolera erros de digitação ("Joao"/"João", "Souza"/"Sousa").
+    Os _candidatos com mais trigramas em comum são ordenados pela distância de edição de cada
+    palavra pesquisada até a palavra mais parecida do nome.
+    Retorna até _limite dicionários com ID_PACIENTE, NM_COMPLETO e DISTANCIA (0 = idêntico).
+    """
+    consulta = normalizar_texto(_texto.strip())
+    palavras_consulta = consulta.split()
+    if not palavras_consulta:
         return []
 
-    finally:
-        cur.close()
+    with INDICE_FUZZY["trava"]:
+        contagem = {}
+        for trigrama in _trigramas_fuzzy(consulta):
+            for id_paciente in INDICE_FUZZY["trigramas"].get(trigrama, ()):
+                contagem[id_paciente] = contagem.get(id_paciente, 0) + 1
+
+        candidatos = sorted(contagem, key=contagem.get, reverse=True)[:_candidatos]
+        nomes = {}
+        for id_paciente in candidatos:
+            nomes[id_paciente] = INDICE_FUZZY["nomes"][id_paciente]
+
+    ranking = []
+    for id_paciente in candidatos:
+        nome, nome_normalizado = nomes[id_paciente]
+        palavras_nome = nome_normalizado.split() or [""]
+
+        distancia = 0
+        for palavra in palavras_consulta:
+            menor = None
+            for palavra_nome in palavras_nome:
+                d = _distancia_edicao(palavra, palavra_nome)
+                if menor is None or d < menor:
+                    menor = d
+            distancia += menor
+
+        ranking.append((distancia, -contagem[id_paciente], id_paciente, nome))
+
+    ranking.sort()
+
+    resultados = []
+    for distancia, _, id_paciente, nome in ranking[:_limite]:
+        resultados.append({"ID_PACIENTE": id_paciente, "NM_COMPLETO": nome, "DISTANCIA": distancia})
+
+    return resultados
+
+# ========= SELECT PACIENTE POR TEXTO =========
+def montar_busca_texto(_campo: str, _texto: str, _colunas_exibir: str, _modo: str, _dialeto_bd: str,
+                       _usar_trigramas: bool, _binds_trigramas: int = None) -> tuple[str, dict]:
+    """
+    Monta o SELECT de buscar_paciente_por_texto para um campo já validado e um texto já normalizado.
+    _usar_trigramas indica se a busca "contem" pode usar T_PACIENTE_TRIGRAMA.
+    _binds_trigramas fixa o tamanho da lista IN de trigramas, completada com o último trigrama
+    (quem reaproveita comandos preparados usa _tamanho_lista_in); o padrão é um bind por trigrama.
+    Retorna (comando_sql, parametros).
+    """
+    expressao = _expressao_normalizada(_campo, _dialeto_bd)
+
+    if _modo == "prefixo":
+        inicio, fim = _faixa_prefixo(_texto)
+        comando_sql = f"""
+            SELECT {_colunas_exibir}
+            FROM T_PACIENTE
+            WHERE {expressao} >= :inicio AND {expressao} < :fim
+        """
+        parametros = {"inicio": inicio, "fim": fim}
+
+    elif _usar_trigramas:
+        trigramas = sorted(gerar_trigramas(_texto))
+        parametros = {"campo": _campo, "quantidade": len(trigramas), "texto": f"%{_escapar_like(_texto)}%"}
+        if _binds_trigramas:
+            trigramas += [trigramas[-1]] * (_binds_trigramas - len(trigramas))
+        binds = []
+        for i, trigrama in enumerate(trigramas):
+            parametros[f"t{i}"] = trigrama
+            binds.append(f":t{i}")
+
+        comando_sql = f"""
+            SELECT {_colunas_exibir}
+            FROM T_PACIENTE
+            WHERE ID_PACIENTE IN (
+                SELECT ID_PACIENTE
+                FROM T_PACIENTE_TRIGRAMA
+                WHERE CAMPO = :campo AND TRIGRAMA IN ({", ".join(binds)})
+                GROUP BY ID_PACIENTE
+                HAVING COUNT(*) = :quantidade
+            )
+            AND {expressao} LIKE :texto ESCAPE '\\'
+        """
+
+    else:
+        # Campos sem trigramas ou textos curtos: varredura com LIKE
+        comando_sql = f"""
+            SELECT {_colunas_exibir}
+            FROM T_PACIENTE
+            WHERE {expressao} LIKE :texto ESCAPE '\\'
+        """
+        parametros = {"texto": f"%{_escapar_like(_texto)}%"}
+
+    return comando_sql, parametros
+
+def consultar_paciente_por_texto(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campo_where: str, _texto: str,
+                                 _colunas_exibir: str, _modo: str = "contem") -> tuple[bool, any]:
+    """
+    Busca por texto de buscar_paciente_por_texto, para quem precisa distinguir erro de resultado vazio
+    (ex.: o serviço HTTP). Retorna (True, [registros]) ou (False, erro); campo, modo ou colunas
+    inválidos vêm como ValueError.
+    """
+    try:
+        campo = _campo_where.upper()
+        if campo not in CAMPOS_BUSCA_TEXTUAL:
+            raise ValueError(f"Campo inválido para busca textual: {campo}")
+        if _modo not in ("contem", "prefixo"):
+            raise ValueError(f"Modo de pesquisa de texto inválido: {_modo}")
+        if not _colunas_exibir.strip():
+            raise ValueError("Nenhuma coluna selecionada para exibição.")
+
+        texto = normalizar_texto(_texto.strip())
+        if not texto:
+            return (True, [])
+
+        with emprestar_conexao(_conexao) as conexao:
+            usar_trigramas = (_modo != "prefixo" and campo in CAMPOS_TRIGRAMA and len(texto) >= 3
+                              and trigramas_disponiveis(conexao))
+            comando_sql, parametros = montar_busca_texto(campo, texto, _colunas_exibir, _modo, _dialeto(conexao), usar_trigramas)
+
+            cur = conexao.cursor()
+            cur.execute(comando_sql, parametros)
+            resultados = cur.fetchall()
+
+            colunas = [col[0].upper() for col in cur.description]
+            cur.close()
+
+        return (True, [dict(zip(colunas, linha)) for linha in resultados])
+
+    except Exception as e:
+        return (False, e)
+
+def buscar_paciente_por_texto(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campo_where: str, _texto: str,
+                              _colunas_exibir: str, _modo: str = "contem") -> list[dict]:
+    """
+    Busca pacientes na tabela T_PACIENTE filtrando por texto em um campo específico.
+    A comparação ignora maiúsculas/minúsculas e acentos. _modo pode ser:
+      "prefixo" -> o campo começa com o texto (usa os índices baseados em função);
+      "contem"  -> o campo contém o texto (usa o índice de trigramas em NM_COMPLETO, RUA, BAIRRO e CIDADE).
+    Retorna apenas as colunas selecionadas e converte os resultados em lista de dicionários.
+    Campos inválidos ou erros de execução são exibidos e retornam uma lista vazia (ver consultar_paciente_por_texto).
+    """
+    sucesso, resultado = consultar_paciente_por_texto(_conexao, _campo_where, _texto, _colunas_exibir, _modo)
+    if not sucesso:
+        print(f"\nErro ao executar consulta SQL: {resultado}\n")
+        return []
+    return resultado
 
 # ========= SELECT PACIENTE POR NÚMERO =========
-def buscar_paciente_por_numero(_conexao: oracledb.Connection, _campo: str, _operador: str, _valor: int, _colunas_exibir: str) -> list[dict]:
+def consultar_paciente_por_numero(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campo: str, _operador: str,
+                                  _valor: int, _colunas_exibir: str) -> tuple[bool, any]:
+    """
+    Busca numérica de buscar_paciente_por_numero, com campo e operador validados.
+    Retorna (True, [registros]) ou (False, erro); campo ou operador inválidos vêm como ValueError.
+    """
+    try:
+        campo = _campo.upper()
+        if campo not in COLUNAS_NUMERICAS:
+            raise ValueError(f"A coluna {campo} não é numérica.")
+        if _operador not in OPERADORES_COMPARACAO:
+            raise ValueError(f"Operador inválido: {_operador}")
+
+        comando_sql = f"SELECT {_colunas_exibir} FROM T_PACIENTE WHERE {campo} {_operador} :valor"
+
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute(comando_sql, {"valor": _valor})
+            resultados = cur.fetchall()
+            nomes_colunas = [col[0].upper() for col in cur.description]
+            cur.close()
+
+        return (True, [dict(zip(nomes_colunas, linha)) for linha in resultados])
+
+    except Exception as e:
+        return (False, e)
+
+def buscar_paciente_por_numero(_conexao: oracledb.Connection | oracledb.ConnectionPool, _campo: str, _operador: str, _valor: int, _colunas_exibir: str) -> list[dict]:
     """
     Busca pacientes na tabela T_PACIENTE filtrando por valor numérico em um campo específico.
     Retorna apenas as colunas selecionadas como lista de dicionários.
-    Erros de execução resultam em uma lista vazia.
+    Erros de execução são exibidos e resultam em uma lista vazia (ver consultar_paciente_por_numero).
     """
+    sucesso, resultado = consultar_paciente_por_numero(_conexao, _campo, _operador, _valor, _colunas_exibir)
+    if not sucesso:
+        print(f"\nErro ao executar consulta SQL: {resultado}\n")
+        return []
+    return resultado
 
-    comando_sql = f"SELECT {_colunas_exibir} FROM T_PACIENTE WHERE {_campo} {_operador} :valor"
-    cur = _conexao.cursor()
+# ========= PESQUISA COMBINADA (CONSTRUTOR DE CONSULTAS) =========
+# Combina vários filtros (texto, comparação numérica, faixa, período de datas e lista de valores)
+# em um único SELECT com parâmetros. As listas do IN são completadas até potências de 2
+# (repetindo o último valor) para que o banco reaproveite o mesmo plano de execução.
+
+COLUNAS_T_PACIENTE = [
+    "ID_PACIENTE", "NM_COMPLETO", "DT_NASCIMENTO", "SEXO", "CPF", "RG", "ESTADO_CIVIL", "BRASILEIRO",
+    "CEP", "RUA", "BAIRRO", "CIDADE", "ESTADO", "NUMERO_ENDERECO", "CELULAR", "EMAIL", "CONVENIO",
+    "DT_HORA_CONSULTA", "TIPO_CONSULTA", "ESPECIALIDADE", "STATUS_CONSULTA", "DT_CADASTRO", "DT_ULTIMA_ATUALIZACAO"
+]
+COLUNAS_NUMERICAS = ["ID_PACIENTE", "NUMERO_ENDERECO"]
+COLUNAS_DATA = ["DT_NASCIMENTO", "DT_HORA_CONSULTA", "DT_CADASTRO", "DT_ULTIMA_ATUALIZACAO"]
+OPERADORES_COMPARACAO = ["=", ">", "<", ">=", "<=", "<>"]
+
+def _validar_colunas_exibir(_colunas_exibir: str) -> str:
+    """Confere as colunas da projeção contra COLUNAS_T_PACIENTE e devolve a lista normalizada."""
+    if _colunas_exibir.strip() == "*":
+        return "*"
+
+    colunas = []
+    for coluna in _colunas_exibir.split(","):
+        coluna = coluna.strip().upper()
+        if coluna not in COLUNAS_T_PACIENTE:
+            raise ValueError(f"Coluna inválida para exibição: {coluna}")
+        colunas.append(coluna)
+
+    if not colunas:
+        raise ValueError("Nenhuma coluna selecionada para exibição.")
+
+    return ", ".join(colunas)
+
+def _converter_data_filtro(_valor, _coluna: str, _fim: bool = False):
+    """Converte 'dd/mm/aaaa' (ou date/datetime) no tipo usado na comparação com a coluna.
+    Para o fim de um período informado só com a data, devolve o dia seguinte (limite exclusivo)."""
+    if isinstance(_valor, str):
+        _valor = datetime.strptime(_valor.strip(), "%d/%m/%Y")
+
+    somente_data = not isinstance(_valor, datetime) or _valor.time() == datetime.min.time()
+    if isinstance(_valor, datetime):
+        dia = _valor.date()
+    else:
+        dia = _valor
+
+    if _fim and somente_data:
+        dia = date.fromordinal(dia.toordinal() + 1)
+        _valor = datetime.combine(dia, datetime.min.time())
+
+    if _coluna == "DT_NASCIMENTO":
+        return dia if somente_data else _valor.date()
+    if isinstance(_valor, datetime):
+        return _valor
+    return datetime.combine(dia, datetime.min.time())
+
+def _tamanho_lista_in(_quantidade: int) -> int:
+    """Menor potência de 2 que comporta a lista (limita a quantidade de textos SQL distintos)."""
+    tamanho = 1
+    while tamanho < _quantidade:
+        tamanho *= 2
+    return tamanho
+
+def montar_condicoes_paciente(_filtros: list[dict], _dialeto_bd: str = "oracle") -> tuple[list[str], dict]:
+    """
+    Converte os filtros em condições SQL (para combinar com AND) e seus parâmetros.
+    Cada filtro é um dicionário com "tipo" e "coluna":
+      {"tipo": "texto",  "coluna": "NM_COMPLETO", "valor": "silva", "modo": "contem" | "prefixo" | "igual"}
+      {"tipo": "numero", "coluna": "ID_PACIENTE", "operador": ">=", "valor": 10}
+      {"tipo": "entre",  "coluna": "NUMERO_ENDERECO" ou coluna de data, "inicio": ..., "fim": ...}
+      {"tipo": "em",     "coluna": "ESTADO", "valores": ["SP", "RJ"]}
+    Datas podem ser date/datetime ou textos 'dd/mm/aaaa'; o fim de um período só com data inclui o dia todo.
+    Colunas e operadores são validados contra listas fixas. Retorna (condicoes, parametros).
+    Filtros inválidos geram ValueError.
+    """
+    condicoes = []
+    parametros = {}
+
+    for i, filtro in enumerate(_filtros):
+        tipo = filtro.get("tipo")
+        coluna = str(filtro.get("coluna", "")).upper()
+
+        if coluna not in COLUNAS_T_PACIENTE:
+            raise ValueError(f"Coluna inválida para pesquisa: {coluna}")
+
+        if tipo == "texto":
+            if coluna in COLUNAS_NUMERICAS or coluna in COLUNAS_DATA:
+                raise ValueError(f"A coluna {coluna} não aceita pesquisa de texto.")
+            texto = normalizar_texto(str(filtro["valor"]).strip())
+            expressao = _expressao_normalizada(coluna, _dialeto_bd)
+            modo = filtro.get("modo", "contem")
+
+            if modo == "prefixo":
+                inicio, fim = _faixa_prefixo(texto)
+                condicoes.append(f"{expressao} >= :f{i}_inicio AND {expressao} < :f{i}_fim")
+                parametros[f"f{i}_inicio"] = inicio
+                parametros[f"f{i}_fim"] = fim
+            elif modo == "igual":
+                condicoes.append(f"{expressao} = :f{i}")
+                parametros[f"f{i}"] = texto
+            elif modo == "contem":
+                condicoes.append(f"{expressao} LIKE :f{i} ESCAPE '\\'")
+                parametros[f"f{i}"] = f"%{_escapar_like(texto)}%"
+            else:
+                raise ValueError(f"Modo de pesquisa de texto inválido: {modo}")
+
+        elif tipo == "numero":
+            operador = filtro.get("operador")
+            if coluna not in COLUNAS_NUMERICAS:
+                raise ValueError(f"A coluna {coluna} não é numérica.")
+            if operador not in OPERADORES_COMPARACAO:
+                raise ValueError(f"Operador inválido: {operador}")
+            condicoes.append(f"{coluna} {operador} :f{i}")
+            parametros[f"f{i}"] = filtro["valor"]
+
+        elif tipo == "entre":
+            if coluna in COLUNAS_DATA:
+                condicoes.append(f"{coluna} >= :f{i}_inicio AND {coluna} < :f{i}_fim")
+                parametros[f"f{i}_inicio"] = _converter_data_filtro(filtro["inicio"], coluna)
+                parametros[f"f{i}_fim"] = _converter_data_filtro(filtro["fim"], coluna, _fim=True)
+            elif coluna in COLUNAS_NUMERICAS:
+                condicoes.append(f"{coluna} BETWEEN :f{i}_inicio AND :f{i}_fim")
+                parametros[f"f{i}_inicio"] = filtro["inicio"]
+                parametros[f"f{i}_fim"] = filtro["fim"]
+            else:
+                raise ValueError(f"A coluna {coluna} não aceita faixa de valores.")
+
+        elif tipo == "em":
+            valores = list(filtro.get("valores") or [])
+            if not valores:
+                raise ValueError(f"Lista de valores vazia para {coluna}.")
+
+            if coluna in COLUNAS_DATA:
+                convertidos = []
+                for valor in valores:
+                    convertidos.append(_converter_data_filtro(valor, coluna))
+                valores = convertidos
+
+            valores += [valores[-1]] * (_tamanho_lista_in(len(valores)) - len(valores))
+            binds = []
+            for j, valor in enumerate(valores):
+                parametros[f"f{i}_{j}"] = valor
+                binds.append(f":f{i}_{j}")
+            condicoes.append(f"{coluna} IN ({', '.join(binds)})")
+
+        else:
+            raise ValueError(f"Tipo de filtro inválido: {tipo}")
+
+    return condicoes, parametros
+
+def montar_consulta_paciente(_filtros: list[dict], _colunas_exibir: str, _dialeto_bd: str = "oracle") -> tuple[str, dict]:
+    """
+    Monta um único SELECT em T_PACIENTE combinando todos os filtros com AND
+    (formato dos filtros em montar_condicoes_paciente). Retorna (comando_sql, parametros).
+    Colunas ou filtros inválidos geram ValueError.
+    """
+    colunas = _validar_colunas_exibir(_colunas_exibir)
+    condicoes, parametros = montar_condicoes_paciente(_filtros, _dialeto_bd)
+
+    comando_sql = f"SELECT {colunas} FROM T_PACIENTE"
+    if condicoes:
+        comando_sql += "\nWHERE " + "\n  AND ".join(condicoes)
+    comando_sql += "\nORDER BY ID_PACIENTE"
+
+    return comando_sql, parametros
 
+# ========= SELECT PACIENTE POR FILTROS COMBINADOS =========
+def consultar_paciente_composto(_conexao: oracledb.Connection | oracledb.ConnectionPool, _filtros: list[dict],
+                                _colunas_exibir: str) -> tuple[bool, any]:
+    """
+    Pesquisa combinada de buscar_paciente_composto. Retorna (True, [registros]) ou (False, erro);
+    colunas ou filtros inválidos vêm como ValueError.
+    """
     try:
-        cur.execute(comando_sql, {"valor": _valor})
-        resultados = cur.fetchall()
-        nomes_colunas = [col[0].upper() for col in cur.description]
+        with emprestar_conexao(_conexao) as conexao:
+            comando_sql, parametros = montar_consulta_paciente(_filtros, _colunas_exibir, _dialeto(conexao))
 
-        lista_pacientes = [dict(zip(nomes_colunas, linha)) for linha in resultados]
+            cur = conexao.cursor()
+            cur.execute(comando_sql, parametros)
+            resultados = cur.fetchall()
+            nomes_colunas = [col[0].upper() for col in cur.description]
+            cur.close()
 
-        return lista_pacientes
+        return (True, [dict(zip(nomes_colunas, linha)) for linha in resultados])
 
     except Exception as e:
-        print(f"\nErro ao executar consulta SQL: {e}\n")
-        return []
+        return (False, e)
 
-    finally:
-        cur.close()
+def buscar_paciente_composto(_conexao: oracledb.Connection | oracledb.ConnectionPool, _filtros: list[dict], _colunas_exibir: str) -> list[dict]:
+    """
+    Busca pacientes com vários filtros combinados (ver montar_consulta_paciente) em uma única consulta.
+    Retorna as colunas selecionadas como lista de dicionários.
+    Filtros inválidos ou erros de execução são exibidos e resultam em uma lista vazia (ver consultar_paciente_composto).
+    """
+    sucesso, resultado = consultar_paciente_composto(_conexao, _filtros, _colunas_exibir)
+    if not sucesso:
+        print(f"\nErro ao executar consulta SQL: {resultado}\n")
+        return []
+    return resultado
 
 # ========= UPDATE PACIENTE POR ID =========
 def atualizar_coluna_paciente(conn, id_paciente, coluna):
     """
-    Atualiza uma coluna específica de um paciente.
-    A função pergunta o valor correto dependendo da coluna usando match-case.
+    Atualiza um campo específico de um paciente.
+    A função pergunta o valor correto dependendo do campo (solicitar_valor_campo)
+    e grava com atualizar_pacientes_em_lote (o endereço atualiza CEP, rua, bairro, cidade e estado juntos).
     Retorna (True, None) se sucesso, ou (False, erro) se falha.
     """
     try:
-        coluna_upper = coluna.upper()
-        
-        match coluna_upper:
-            # DADOS DO PACIENTE
-            case "NM_COMPLETO":
-                valor = obter_texto("\nNome do paciente: ", "Nome inválido!")
-            case "DATA_NASCIMENTO":
-                valor = obter_data("\nData de nascimento (dd/mm/aaaa): ", "Data inválida!")
-            case "SEXO":
-                valor = obter_m_f("\nSexo [M/F]: ", "Entrada inválida! Digite M ou F.")
-            case "CPF":
-                valor = obter_cpf("\nCPF (somente números, ex: 12345678901): ", "CPF inválido!")
-            case "RG":
-                valor = obter_rg("\nRG (somente números, ex: 123456789): ", "RG inválido!")
-            case "ESTADO_CIVIL":
-                estado_civil_dict = {1: "Solteiro", 2: "Casado", 3: "Divorciado", 4: "Viuvo"}
-                valor = obter_opcao_dict("""\nEstado civil
-1 - Solteiro
-2 - Casado
-3 - Divorciado
-4 - Viuvo
-Escolha: """, "Opção inválida!", estado_civil_dict)
-            case "BRASILEIRO" | "CONVENIO":
-                valor = obter_sim_nao(f"\n{coluna.replace('_', ' ').capitalize()}? [S/N]: ", "Entrada inválida!")
-            case "ENDERECO":
-                valor = obter_endereco("\nCEP (ex: 01310200): ", "CEP inválido!")
-            case "NUMERO_ENDERECO":
-                valor = obter_int("\nNúmero da residência (ex: 123): ", "Número inválido!")
-            case "CELULAR":
-                valor = obter_texto("\nCelular (DDD + número — ex: 11987654321): ", "Número inválido!")
-            case "EMAIL":
-                valor = obter_email("\nInforme o e-mail (exemplo: exemplo@email.com)\nE-mail: ", "E-mail inválido!")
-            
-            # DADOS DA CONSULTA
-            case "DATA_HORA_CONSULTA":
-                valor = obter_data_hora("\nDigite a data e hora da consulta (ex: 25/10/2025 14:30): ", "Data e hora inválida!")
-            case "TIPO_CONSULTA":
-                tipo_consulta_dict = {1: "Retorno", 2: "Emergencia", 3: "Rotina", 4: "Exame", 5: "Geral"}
-                valor = obter_opcao_dict("""\nTipo de consulta
-1 - Retorno
-2 - Emergencia
-3 - Rotina
-4 - Exame
-5 - Geral
-Escolha: """, "Opção inválida!", tipo_consulta_dict)
-            case "ESPECIALIDADE":
-                especialidade_dict = {
-                    1: "Cardiologia", 2: "Neurologia", 3: "Ortopedia",
-                    4: "Dermatologia", 5: "Pediatria", 6: "Oftalmologia",
-                    7: "Clínico Geral"
-                }
-                valor = obter_opcao_dict("""\nEspecialidade
-1 - Cardiologia
-2 - Neurologia
-3 - Ortopedia
-4 - Dermatologia
-5 - Pediatria
-6 - Oftalmologia
-7 - Clínico Geral
-Escolha: """, "Opção inválida!", especialidade_dict)
-            case "STATUS_CONSULTA":
-                status_consulta_dict = {1: "Realizada", 2: "Cancelada", 3: "Absenteísmo"}
-                valor = obter_opcao_dict("""Status da consulta
-1 - Realizada
-2 - Cancelada
-3 - Absenteísmo
-Escolha: """, "Opção inválida!", status_consulta_dict)
-            
-            case _:
-                return (False, f"Coluna '{coluna}' não reconhecida!")
+        valor = solicitar_valor_campo(coluna)
+        if valor is None:
+            return (False, f"Coluna '{coluna}' não reconhecida!")
 
-        comando_sql = f"UPDATE T_PACIENTE SET {coluna_upper} = :valor WHERE ID_PACIENTE = :id_paciente"
-        dados_paciente = {"valor": valor, "id_paciente": id_paciente}
-
-        cur = conn.cursor()
-        cur.execute(comando_sql, dados_paciente)
-        conn.commit()
-        cur.close()
+        sucesso, resultado = atualizar_pacientes_em_lote(conn, colunas_do_campo(coluna, valor), _ids=[id_paciente])
+        if not sucesso:
+            return (False, resultado["erro"])
+        if resultado["nao_encontrados"]:
+            return (False, "Nenhum paciente encontrado com este ID para atualizar.")
 
         return (True, None)
 
     except Exception as e:
         return (False, e)
 
+# ========= UPDATE DE VÁRIOS PACIENTES (EM LOTE) =========
+# Colunas que a atualização aceita (o ID e as datas de controle não são alteradas pelo programa)
+COLUNAS_ATUALIZAVEIS = [c for c in COLUNAS_T_PACIENTE if c not in ("ID_PACIENTE", "DT_CADASTRO", "DT_ULTIMA_ATUALIZACAO")]
+
+# Datas chegam como texto e são convertidas no banco, igual ao INSERT: (expressão do SET, formato do texto)
+EXPRESSOES_SET_DATA = {
+    "DT_NASCIMENTO": ("TO_DATE({}, 'DD/MM/YYYY')", "%d/%m/%Y"),
+    "DT_HORA_CONSULTA": ("TO_TIMESTAMP({}, 'DD/MM/YYYY HH24:MI')", "%d/%m/%Y %H:%M")
+}
+
+def montar_update_pacientes(_valores: dict) -> tuple[str, dict]:
+    """
+    Monta o trecho SET de um único UPDATE com todas as colunas informadas ({COLUNA: valor}).
+    As colunas são validadas contra COLUNAS_ATUALIZAVEIS e cada valor vira um bind :v_coluna;
+    datas podem ser date/datetime ou textos 'dd/mm/aaaa' ('dd/mm/aaaa hh:mm' para DT_HORA_CONSULTA).
+    Retorna (trecho_set, parametros). Colunas inválidas e datas em formato inválido geram ValueError.
+    """
+    if not _valores:
+        raise ValueError("Nenhuma coluna informada para atualizar.")
+
+    atribuicoes = []
+    parametros = {}
+
+    # Ordem fixa: o mesmo conjunto de colunas sempre gera o mesmo texto SQL (reaproveitado pelo cache do driver)
+    for coluna in sorted(_valores):
+        valor = _valores[coluna]
+        if coluna not in COLUNAS_ATUALIZAVEIS:
+            raise ValueError(f"Coluna inválida para atualização: {coluna}")
+
+        bind = f"v_{coluna.lower()}"
+        if coluna in EXPRESSOES_SET_DATA:
+            expressao, formato = EXPRESSOES_SET_DATA[coluna]
+            if isinstance(valor, (date, datetime)):
+                valor = valor.strftime(formato)
+            elif valor is not None:
+                # Confere aqui para o erro ser de entrada (ValueError), e não do TO_DATE no banco
+                try:
+                    datetime.strptime(str(valor), formato)
+                except ValueError:
+                    raise ValueError(f"Data inválida para {coluna}: {valor!r}.")
+            atribuicoes.append(f"{coluna} = {expressao.format(':' + bind)}")
+        else:
+            atribuicoes.append(f"{coluna} = :{bind}")
+        parametros[bind] = valor
+
+    return ", ".join(atribuicoes), parametros
+
+def _executar_dml_por_linha(_cursor, _comando_sql: str, _linhas: list[dict], _dialeto_bd: str) -> list[int]:
+    """Executa o comando para todas as linhas (array binding) e devolve as linhas afetadas por cada uma."""
+    if _dialeto_bd == "sqlite":
+        # O sqlite3 não informa a contagem por linha no executemany; como roda no próprio processo,
+        # um execute por linha tem o mesmo custo (não há ida e volta pela rede)
+        contagens = []
+        for linha in _linhas:
+            _cursor.execute(_comando_sql, linha)
+            contagens.append(_cursor.rowcount)
+        return contagens
+
+    _cursor.executemany(_comando_sql, _linhas, arraydmlrowcounts=True)
+    return _cursor.getarraydmlrowcounts()
+
+def _reindexar_trigramas_em_lote(_cursor, _ids: list[int], _valores: dict) -> None:
+    """Regrava os trigramas dos campos informados ({COLUNA: valor}) para vários pacientes com o mesmo valor.
+    Não faz commit: roda dentro da transação de quem chamou."""
+    _cursor.executemany(
+        "DELETE FROM T_PACIENTE_TRIGRAMA WHERE ID_PACIENTE = :id_paciente AND CAMPO = :campo",
+        [{"id_paciente": id_paciente, "campo": campo} for id_paciente in _ids for campo in _valores]
+    )
+
+    # O valor é o mesmo para todos os pacientes: os trigramas são calculados uma vez só
+    trigramas_campo = {campo: gerar_trigramas(valor) for campo, valor in _valores.items()}
+    linhas = []
+    for id_paciente in _ids:
+        for campo, trigramas in trigramas_campo.items():
+            for trigrama in trigramas:
+                linhas.append({"campo": campo, "trigrama": trigrama, "id_paciente": id_paciente})
+
+    if linhas:
+        _cursor.executemany(
+            "INSERT INTO T_PACIENTE_TRIGRAMA (CAMPO, TRIGRAMA, ID_PACIENTE) VALUES (:campo, :trigrama, :id_paciente)",
+            linhas
+        )
+
+def atualizar_pacientes_em_lote(_conexao: oracledb.Connection | oracledb.ConnectionPool, _valores: dict,
+                                _ids: list[int] = None, _filtros: list[dict] = None,
+                                _tamanho_lote: int = 1000) -> tuple[bool, any]:
+    """
+    Aplica a mesma alteração ({COLUNA: valor}, uma ou várias colunas) a muitos pacientes com um único UPDATE.
+    Informe apenas um dos dois:
+      _ids:     lista de ID_PACIENTE, enviada por array binding (executemany), um commit a cada _tamanho_lote IDs;
+      _filtros: filtros no formato de montar_condicoes_paciente, um único UPDATE ... WHERE e um commit.
+    Os trigramas e o índice aproximado por nome acompanham as colunas alteradas.
+    Retorna (True, {"atualizados": n, "nao_encontrados": [IDs sem paciente]}).
+    Em caso de erro, o lote em andamento é desfeito e os já confirmados continuam gravados:
+    retorna (False, {"erro": erro, "atualizados": n, "nao_encontrados": [...]}) com o que foi gravado até ali.
+    """
+    atualizados = 0
+    nao_encontrados = []
+
+    try:
+        if bool(_ids) == bool(_filtros):
+            raise ValueError("Informe uma lista de IDs ou pelo menos um filtro (apenas um dos dois).")
+
+        valores = {str(coluna).upper(): valor for coluna, valor in _valores.items()}
+        trecho_set, parametros_set = montar_update_pacientes(valores)
+
+        valores_trigrama = {}
+        for campo in CAMPOS_TRIGRAMA:
+            if campo in valores:
+                valores_trigrama[campo] = valores[campo]
+
+        def _confirmar_lote(_conexao_lote, _ids_atualizados: list[int]) -> None:
+            """Commit do lote; o cache do preview e o índice aproximado acompanham cada lote confirmado."""
+            _conexao_lote.commit()
+            invalidar_cache_preview()
+            if "NM_COMPLETO" in valores:
+                for id_paciente in _ids_atualizados:
+                    atualizar_indice_fuzzy(id_paciente, valores["NM_COMPLETO"])
+
+        with emprestar_conexao(_conexao) as conexao:
+            dialeto = _dialeto(conexao)
+            reindexar = bool(valores_trigrama) and trigramas_disponiveis(conexao)
+            cur = conexao.cursor()
+
+            try:
+                if _ids:
+                    comando_sql = f"UPDATE T_PACIENTE SET {trecho_set} WHERE ID_PACIENTE = :id_paciente"
+                    ids = list(dict.fromkeys(_ids))
+
+                    for inicio in range(0, len(ids), _tamanho_lote):
+                        lote = ids[inicio:inicio + _tamanho_lote]
+                        linhas = [{**parametros_set, "id_paciente": id_paciente} for id_paciente in lote]
+                        contagens = _executar_dml_por_linha(cur, comando_sql, linhas, dialeto)
+
+                        existentes = []
+                        ausentes = []
+                        for id_paciente, contagem in zip(lote, contagens):
+                            if contagem:
+                                existentes.append(id_paciente)
+                            else:
+                                ausentes.append(id_paciente)
+
+                        if reindexar and existentes:
+                            _reindexar_trigramas_em_lote(cur, existentes, valores_trigrama)
+
+                        _confirmar_lote(conexao, existentes)
+                        atualizados += sum(contagens)
+                        nao_encontrados.extend(ausentes)
+
+                else:
+                    condicoes, parametros_filtro = montar_condicoes_paciente(_filtros, dialeto)
+                    clausula_where = "\n  AND ".join(condicoes)
+
+                    # Os IDs só são necessários para manter os índices; são lidos antes do UPDATE,
+                    # que pode alterar as próprias colunas do filtro (ex.: STATUS_CONSULTA)
+                    ids_atualizados = []
+                    if reindexar or "NM_COMPLETO" in valores:
+                        comando_ids = f"SELECT ID_PACIENTE FROM T_PACIENTE\nWHERE {clausula_where}"
+                        if dialeto == "oracle":
+                            comando_ids += "\nFOR UPDATE"
+                        cur.execute(comando_ids, parametros_filtro)
+                        ids_atualizados = [linha[0] for linha in cur.fetchall()]
+
+                    cur.execute(f"UPDATE T_PACIENTE SET {trecho_set}\nWHERE {clausula_where}", {**parametros_set, **parametros_filtro})
+                    contagem = cur.rowcount
+
+                    if reindexar:
+                        for inicio in range(0, len(ids_atualizados), _tamanho_lote):
+                            _reindexar_trigramas_em_lote(cur, ids_atualizados[inicio:inicio + _tamanho_lote], valores_trigrama)
+
+                    _confirmar_lote(conexao, ids_atualizados)
+                    atualizados = contagem
+
+            except Exception:
+                conexao.rollback()  # desfaz só o lote em andamento
+                raise
+
+            finally:
+                cur.close()
+
+        return (True, {"atualizados": atualizados, "nao_encontrados": nao_encontrados})
+
+    except Exception as e:
+        return (False, {"erro": e, "atualizados": atualizados, "nao_encontrados": nao_encontrados})
+
 # ========= DELETE PACIENTE POR ID =========
-def deletar_paciente(_conexao: oracledb.Connection, _id_paciente: int) -> tuple[bool, any]:
+def deletar_paciente(_conexao: oracledb.Connection | oracledb.ConnectionPool, _id_paciente: int) -> tuple[bool, any]:
     """Remove paciente pelo ID e retorna status da operação."""
     try:
         comando_sql = "DELETE FROM T_PACIENTE WHERE ID_PACIENTE = :id"
-        cur = _conexao.cursor()
-        cur.execute(comando_sql, {"id": _id_paciente})
 
-        if cur.rowcount == 0:
-            _conexao.rollback()
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute(comando_sql, {"id": _id_paciente})
+
+            if cur.rowcount == 0:
+                conexao.rollback()
+                cur.close()
+                return (False, "Nenhum paciente encontrado com este ID para remover.")
+
+            conexao.commit()
             cur.close()
-            return (False, "Nenhum paciente encontrado com este ID para remover.")
 
-        _conexao.commit()
-        cur.close()
+        invalidar_cache_preview([_id_paciente], 1)
+        remover_do_indice_fuzzy(_id_paciente)
         return (True, None)
     except Exception as e:
         return (False, e)
 
+# ========= DELETE DE VÁRIOS PACIENTES (EM LOTES) =========
+def _lotes_ids_filtrados(_conexao, _clausula_where: str, _parametros: dict, _tamanho_lote: int):
+    """Gera, em ordem e um lote por vez, os IDs dos pacientes que atendem à condição
+    (paginação pela chave: cada consulta começa depois do último ID do lote anterior)."""
+    comando_sql = (f"SELECT ID_PACIENTE FROM T_PACIENTE\nWHERE {_clausula_where}\n  AND ID_PACIENTE > :ultimo_id\n"
+                   f"ORDER BY ID_PACIENTE {_sql_limite(_conexao)}")
+    ultimo_id = 0
+
+    cur = _conexao.cursor()
+    while True:
+        cur.execute(comando_sql, {**_parametros, "ultimo_id": ultimo_id, "tamanho": _tamanho_lote})
+        ids = [linha[0] for linha in cur.fetchall()]
+        if not ids:
+            break
+        yield ids
+        ultimo_id = ids[-1]
+    cur.close()
+
+def _excluir_lotes_de_ids(_conexao, _cur, _lotes, _total: int, _progresso, _andamento: dict) -> None:
+    """Apaga os pacientes de cada lote de IDs, com um commit por lote. O cache do preview e o índice
+    aproximado acompanham cada lote confirmado e _andamento ({"removidos", "nao_encontrados"}) guarda
+    o que já saiu do banco. Não trata erros: quem chamou desfaz o lote em andamento."""
+    comando_sql = "DELETE FROM T_PACIENTE WHERE ID_PACIENTE = :id_paciente"
+    dialeto = _dialeto(_conexao)
+
+    for lote in _lotes:
+        contagens = _executar_dml_por_linha(_cur, comando_sql, [{"id_paciente": id_paciente} for id_paciente in lote], dialeto)
+        _conexao.commit()
+
+        ids_removidos = []
+        for id_paciente, contagem in zip(lote, contagens):
+            if contagem:
+                ids_removidos.append(id_paciente)
+            else:
+                _andamento["nao_encontrados"].append(id_paciente)
+
+        invalidar_cache_preview(ids_removidos, len(ids_removidos))
+        for id_paciente in ids_removidos:
+            remover_do_indice_fuzzy(id_paciente)
+
+        _andamento["removidos"] += len(ids_removidos)
+        if _progresso:
+            _progresso(_andamento["removidos"], max(_total, _andamento["removidos"]))
+
+def excluir_pacientes_em_lote(_conexao: oracledb.Connection | oracledb.ConnectionPool,
+                              _ids: list[int] = None, _filtros: list[dict] = None,
+                              _tamanho_lote: int = 1000, _progresso=None) -> tuple[bool, any]:
+    """
+    Remove muitos pacientes em lotes, com um commit a cada _tamanho_lote linhas
+    (transações curtas em vez de um DELETE gigante segurando undo/redo e bloqueios).
+    Informe apenas um dos dois:
+      _ids:     lista de ID_PACIENTE, enviada por array binding (executemany);
+      _filtros: filtros no formato de montar_condicoes_paciente; os IDs são lidos lote a lote e apagados da mesma forma.
+    Os trigramas saem junto (ON DELETE CASCADE) e o trigger registra cada exclusão em T_PACIENTE_EXCLUIDO.
+    _progresso, se informado, é chamado depois de cada commit com (removidos_ate_agora, total).
+    Retorna (True, {"removidos": n, "nao_encontrados": [IDs sem paciente]}).
+    Em caso de erro, o lote em andamento é desfeito e os já confirmados continuam apagados:
+    retorna (False, {"erro": erro, "removidos": n, "nao_encontrados": [...]}) com o que foi removido até ali.
+    """
+    andamento = {"removidos": 0, "nao_encontrados": []}
+
+    try:
+        if bool(_ids) == bool(_filtros):
+            raise ValueError("Informe uma lista de IDs ou pelo menos um filtro (apenas um dos dois).")
+
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+
+            try:
+                if _ids:
+                    ids = list(dict.fromkeys(_ids))
+                    total = len(ids)
+                    lotes = (ids[inicio:inicio + _tamanho_lote] for inicio in range(0, total, _tamanho_lote))
+                else:
+                    condicoes, parametros = montar_condicoes_paciente(_filtros, _dialeto(conexao))
+                    clausula_where = "\n  AND ".join(condicoes)
+                    cur.execute(f"SELECT COUNT(*) FROM T_PACIENTE\nWHERE {clausula_where}", parametros)
+                    total = int(cur.fetchone()[0])
+                    lotes = _lotes_ids_filtrados(conexao, clausula_where, parametros, _tamanho_lote)
+
+                _excluir_lotes_de_ids(conexao, cur, lotes, total, _progresso, andamento)
+
+            except Exception:
+                conexao.rollback()  # desfaz só o lote em andamento
+                raise
+
+            finally:
+                cur.close()
+
+        return (True, andamento)
+
+    except Exception as e:
+        return (False, {"erro": e, **andamento})
+
+def exibir_progresso_exclusao(_removidos: int, _total: int) -> None:
+    """Mostra o andamento de uma exclusão em lotes na mesma linha do terminal."""
+    percentual = (_removidos / _total * 100) if _total else 100.0
+    print(f"\rRemovidos: {_removidos}/{_total} ({percentual:.0f}%)", end="", flush=True)
+
 # ========= DELETE TODOS PACIENTE =========
-def limpar_todos_pacientes(_conexao: oracledb.Connection) -> tuple[bool, any]:
-    """Apaga todos os pacientes do banco e retorna status da operação."""
+def limpar_todos_pacientes(_conexao: oracledb.Connection | oracledb.ConnectionPool, _modo: str = "lotes",
+                           _tamanho_lote: int = 10000, _progresso=None) -> tuple[bool, any]:
+    """
+    Apaga todos os pacientes do banco. Modos:
+      "lotes":    lê os IDs _tamanho_lote por vez e os apaga com um commit por lote (_progresso recebe (removidos, total));
+                  cada exclusão fica registrada em T_PACIENTE_EXCLUIDO pelo trigger.
+      "truncate": TRUNCATE TABLE T_PACIENTE CASCADE no Oracle (esvazia também T_PACIENTE_TRIGRAMA), sem undo
+                  por linha e sem volta. Como o TRUNCATE não dispara triggers, grava uma única marca de limpeza
+                  (ID_PACIENTE nulo) em T_PACIENTE_EXCLUIDO para a exportação incremental.
+                  O SQLite não tem TRUNCATE: apaga trigramas e pacientes em uma transação e deixa a mesma marca única.
+    Retorna (True, quantidade de pacientes apagados).
+    Em caso de erro, o que estava pendente é desfeito e o que já foi confirmado continua apagado:
+    retorna (False, {"erro": erro, "removidos": n}) com o que foi removido até ali.
+    """
+    andamento = {"removidos": 0, "nao_encontrados": []}
+
     try:
-        comando_sql = "DELETE FROM T_PACIENTE"
-        cur = _conexao.cursor()
-        cur.execute(comando_sql)
-        
-        _conexao.commit()
-        cur.close()
-        
-        return (True, None)
+        if _modo not in ("lotes", "truncate"):
+            raise ValueError(f"Modo de limpeza inválido: {_modo}")
+
+        with emprestar_conexao(_conexao) as conexao:
+            dialeto = _dialeto(conexao)
+            cur = conexao.cursor()
+
+            try:
+                cur.execute("SELECT COUNT(*) FROM T_PACIENTE")
+                total = int(cur.fetchone()[0])
+
+                if _modo == "lotes":
+                    lotes = _lotes_ids_filtrados(conexao, "1 = 1", {}, _tamanho_lote)
+                    _excluir_lotes_de_ids(conexao, cur, lotes, total, _progresso, andamento)
+
+                elif dialeto == "sqlite":
+                    cur.execute("SELECT COALESCE(MAX(ID_EXCLUSAO), 0) FROM T_PACIENTE_EXCLUIDO")
+                    ultima_exclusao = cur.fetchone()[0]
+
+                    if trigramas_disponiveis(conexao):
+                        cur.execute("DELETE FROM T_PACIENTE_TRIGRAMA")  # filhos antes: evita a cascata linha a linha
+                    cur.execute("DELETE FROM T_PACIENTE")
+                    removidos = cur.rowcount
+
+                    # Troca as marcas linha a linha do trigger pela marca única de limpeza
+                    cur.execute("DELETE FROM T_PACIENTE_EXCLUIDO WHERE ID_EXCLUSAO > :ultima", {"ultima": ultima_exclusao})
+                    cur.execute("INSERT INTO T_PACIENTE_EXCLUIDO (ID_PACIENTE) VALUES (NULL)")
+                    conexao.commit()
+
+                    andamento["removidos"] = removidos
+                    limpar_cache_preview()
+                    remover_do_indice_fuzzy()
+
+                else:
+                    # Confere antes do TRUNCATE (que não tem volta) se a tabela de exclusões foi criada
+                    try:
+                        cur.execute("SELECT 1 FROM T_PACIENTE_EXCLUIDO WHERE 1 = 0")
+                        registrar_limpeza = True
+                    except Exception:
+                        registrar_limpeza = False
+
+                    cur.execute("TRUNCATE TABLE T_PACIENTE CASCADE")
+                    andamento["removidos"] = total
+                    limpar_cache_preview()
+                    remover_do_indice_fuzzy()
+
+                    if registrar_limpeza:
+                        cur.execute("INSERT INTO T_PACIENTE_EXCLUIDO (ID_PACIENTE) VALUES (NULL)")
+                        conexao.commit()
+
+            except Exception:
+                conexao.rollback()  # desfaz só o que ainda não foi confirmado
+                raise
+
+            finally:
+                cur.close()
+
+        return (True, andamento["removidos"])
 
     except Exception as e:
-        return (False, e)
+        return (False, {"erro": e, "removidos": andamento["removidos"]})
 
 # ==========================================================
 #   EXPORTAR PACIENTES PARA JSON
 # ==========================================================
 
 # ========= EXPORTAR PACIENTES PARA JSON =========
+def _valor_json(_valor):
+    """Converte datas para o formato usado nas exportações (dd/mm/aaaa [hh:mm]); datas repetidas vêm do cache."""
+    if isinstance(_valor, datetime):
+        return _texto_data_hora(_valor)
+    if isinstance(_valor, date):
+        return _texto_data(_valor)
+    raise TypeError(f"Tipo não serializável em JSON: {type(_valor).__name__}")
+
 def exportar_para_json(_dados: list[dict], _nome_arquivo: str = "pacientes.json") -> tuple[bool, any]:
     try:
         if not _dados:
             return (False, "Nenhum dado recebido para exportar.")
 
-        for item in _dados:
-            for chave, valor in item.items():
-                if isinstance(valor, datetime):
-                    item[chave] = valor.strftime("%d/%m/%Y %H:%M")
-                elif isinstance(valor, date):
-                    item[chave] = valor.strftime("%d/%m/%Y")
-
-        # Salva os dados em um arquivo JSON
+        # Salva os dados em um arquivo JSON (as datas são convertidas na escrita, sem alterar _dados)
         with open(_nome_arquivo, "w", encoding="utf-8") as arquivo_json:
-            json.dump(_dados, arquivo_json, ensure_ascii=False, indent=4)
+            json.dump(_dados, arquivo_json, ensure_ascii=False, indent=4, default=_valor_json)
 
         return (True, None)
 
     except Exception as e:
         return (False, e)
-
@@ -0,0 +1,368 @@
+# ==========================================================
+#   CADASTRO DE PACIENTES - VERSÃO ASSÍNCRONA (ASYNCIO)
+# ==========================================================
+# Versões async das funções de CRUD de cadastro_paciente.py, com os mesmos retornos:
+#   insert_paciente_async, select_paciente_async, select_paciente_por_id_async,
+#   buscar_paciente_por_texto_async, buscar_paciente_por_numero_async, buscar_paciente_composto_async,
+#   atualizar_coluna_paciente_async, deletar_paciente_async
+#
+# Origens aceitas:
+#   - pool assíncrono do Oracle (criar_pool_oracledb_async -> oracledb.create_pool_async, modo thin);
+#   - pool local de SQLite (criar_pool_sqlite_async), que roda as funções síncronas em threads
+#     (asyncio.to_thread), uma conexão por vez para cada thread, sem precisar de um Oracle no ar.
+#
+# Várias consultas podem ficar em andamento ao mesmo tempo (asyncio.gather ou executar_concorrente):
+#   sucesso, pool = criar_pool_sqlite_async("pacientes_local.db", 4)
+#   resultados = await executar_concorrente([select_paciente_por_id_async(pool, "*", i) for i in ids], 8)
+
+from __future__ import annotations
+
+# --- Bibliotecas padrão ---
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
+
+# --- Módulo do cadastro ---
+from cadastro_paciente import (
+    oracledb,
+    COMANDO_INSERT_PACIENTE,
+    CHAVES_DADOS_PACIENTE,
+    CAMPOS_BUSCA_TEXTUAL,
+    CAMPOS_TRIGRAMA,
+    COLUNAS_NUMERICAS,
+    OPERADORES_COMPARACAO,
+    CONFIG_BUSCA_TEXTUAL,
+    conectar_sqlite,
+    normalizar_texto,
+    montar_busca_texto,
+    montar_consulta_paciente,
+    montar_update_pacientes,
+    colunas_do_campo,
+    insert_paciente,
+    select_paciente,
+    select_paciente_por_id,
+    buscar_paciente_por_texto,
+    buscar_paciente_por_numero,
+    buscar_paciente_composto,
+    atualizar_pacientes_em_lote,
+    deletar_paciente,
+    invalidar_cache_preview,
+    atualizar_indice_fuzzy,
+    remover_do_indice_fuzzy,
+    _linhas_trigrama,
+    _dialeto,
+)
+
+
+# ========= POOLS ASSÍNCRONOS =========
+def criar_pool_oracledb_async(_user: str, _password: str, _dsn: str, _min: int = 1, _max: int = 8,
+                              _incremento: int = 1, _tamanho_cache_sql: int = 50) -> tuple[bool, any]:
+    """Cria o pool assíncrono do Oracle (oracledb.create_pool_async, modo thin).
+    Retorna (True, pool) ou (False, erro)."""
+    try:
+        pool = oracledb.create_pool_async(
+            user = _user,
+            password = _password,
+            dsn = _dsn,
+            min = _min,
+            max = _max,
+            increment = _incremento,
+            stmtcachesize = _tamanho_cache_sql
+        )
+
+        return (True, pool)
+
+    except Exception as e:
+        return (False, e)
+
+def criar_pool_sqlite_async(_caminho: str = "pacientes_local.db", _tamanho: int = 4) -> tuple[bool, any]:
+    """
+    Pool local que substitui o Oracle nos testes: _tamanho conexões SQLite (WAL) para o mesmo arquivo.
+    Cada operação empresta uma conexão livre e roda a função síncrona equivalente em uma thread.
+    Retorna (True, pool) ou (False, erro).
+    """
+    conexoes = []
+    for _ in range(_tamanho):
+        sucesso, conexao = conectar_sqlite(_caminho)
+        if not sucesso:
+            for aberta in conexoes:
+                aberta.close()
+            return (False, conexao)
+        conexoes.append(conexao)
+
+    livres = asyncio.Queue()
+    for conexao in conexoes:
+        livres.put_nowait(conexao)
+
+    return (True, {"caminho": _caminho, "conexoes": conexoes, "livres": livres})
+
+async def fechar_pool_async(_pool) -> None:
+    """Fecha o pool assíncrono (Oracle) ou as conexões do pool local de SQLite."""
+    if isinstance(_pool, dict):
+        for conexao in _pool["conexoes"]:
+            conexao.close()
+    else:
+        await _pool.close()
+
+@asynccontextmanager
+async def emprestar_conexao_async(_origem):
+    """Empresta uma conexão do pool (Oracle ou SQLite local) e a devolve ao final do bloco;
+    com uma conexão avulsa, usa a própria."""
+    if isinstance(_origem, dict):
+        conexao = await _origem["livres"].get()
+        try:
+            yield conexao
+        finally:
+            _origem["livres"].put_nowait(conexao)
+    elif not isinstance(_origem, sqlite3.Connection) and isinstance(_origem, oracledb.AsyncConnectionPool):
+        async with _origem.acquire() as conexao:
+            yield conexao
+    else:
+        yield _origem
+
+async def executar_concorrente(_corrotinas, _limite: int = 8) -> list:
+    """Executa as corrotinas com no máximo _limite em andamento ao mesmo tempo.
+    Retorna os resultados na mesma ordem das corrotinas."""
+    semaforo = asyncio.Semaphore(_limite)
+
+    async def _com_limite(_corrotina):
+        async with semaforo:
+            return await _corrotina
+
+    return await asyncio.gather(*(_com_limite(c) for c in _corrotinas))
+
+# ========= AUXILIARES (ORACLE ASYNC) =========
+async def _consultar_async(_conexao, _comando_sql: str, _parametros: dict, _minusculas: bool = False,
+                           _arraysize: int = 1000) -> list[dict]:
+    """Executa o SELECT e devolve as linhas como dicionários (chaves em maiúsculas, ou minúsculas como select_paciente)."""
+    cur = _conexao.cursor()
+    try:
+        cur.arraysize = _arraysize
+        await cur.execute(_comando_sql, _parametros)
+        linhas = await cur.fetchall()
+        colunas = [col[0].lower() if _minusculas else col[0].upper() for col in cur.description]
+    finally:
+        cur.close()
+
+    return [dict(zip(colunas, linha)) for linha in linhas]
+
+async def _trigramas_disponiveis_async(_conexao) -> bool:
+    """Mesma verificação de trigramas_disponiveis (uma vez por execução), para conexões assíncronas."""
+    if CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"] is None:
+        cur = _conexao.cursor()
+        try:
+            await cur.execute("SELECT 1 FROM T_PACIENTE_TRIGRAMA WHERE 1 = 0")
+            CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"] = True
+        except Exception:
+            CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"] = False
+        finally:
+            cur.close()
+
+    return CONFIG_BUSCA_TEXTUAL["trigramas_disponiveis"]
+
+async def _indexar_trigramas_async(_cursor, _id_paciente: int, _valores: dict) -> None:
+    """Versão async de indexar_trigramas_paciente. Não faz commit."""
+    await _cursor.executemany(
+        "DELETE FROM T_PACIENTE_TRIGRAMA WHERE ID_PACIENTE = :id_paciente AND CAMPO = :campo",
+        [{"id_paciente": _id_paciente, "campo": campo} for campo in _valores]
+    )
+
+    linhas = _linhas_trigrama(_id_paciente, _valores)
+    if linhas:
+        await _cursor.executemany(
+            "INSERT INTO T_PACIENTE_TRIGRAMA (CAMPO, TRIGRAMA, ID_PACIENTE) VALUES (:campo, :trigrama, :id_paciente)",
+            linhas
+        )
+
+# ========= INSERT PACIENTE =========
+async def insert_paciente_async(_origem, _dados_paciente: dict) -> tuple[bool, any]:
+    """Versão async de insert_paciente. Retorna (True, None) ou (False, erro)."""
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(insert_paciente, conexao, _dados_paciente)
+
+            parametros = {chave: _dados_paciente.get(chave) for chave in CHAVES_DADOS_PACIENTE}
+
+            cur = conexao.cursor()
+            id_var = cur.var(oracledb.DB_TYPE_NUMBER)
+            await cur.execute(COMANDO_INSERT_PACIENTE.rstrip() + " RETURNING ID_PACIENTE INTO :id_paciente",
+                              {**parametros, "id_paciente": id_var})
+            id_paciente = int(id_var.getvalue()[0])
+
+            if await _trigramas_disponiveis_async(conexao):
+                valores_trigrama = {}
+                for campo, chave in CAMPOS_TRIGRAMA.items():
+                    valores_trigrama[campo] = parametros[chave]
+                await _indexar_trigramas_async(cur, id_paciente, valores_trigrama)
+
+            await conexao.commit()
+            cur.close()
+
+        invalidar_cache_preview()
+        atualizar_indice_fuzzy(id_paciente, parametros["nome_completo"])
+
+        return (True, None)
+
+    except Exception as e:
+        return (False, e)
+
+# ========= SELECT PACIENTE =========
+async def select_paciente_async(_origem, _campos: str) -> tuple[bool, any]:
+    """Versão async de select_paciente (chaves em minúsculas). Retorna (True, lista) ou (False, erro)."""
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(select_paciente, conexao, _campos)
+
+            return (True, await _consultar_async(conexao, f"SELECT {_campos} FROM T_PACIENTE", {}, _minusculas=True))
+
+    except Exception as e:
+        return (False, e)
+
+async def select_paciente_por_id_async(_origem, campos: str, _id_paciente: int) -> tuple[bool, any]:
+    """Versão async de select_paciente_por_id. Retorna (True, lista) ou (False, mensagem de erro)."""
+    if not _id_paciente:
+        return False, "Erro: é necessário informar o ID do paciente."
+
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(select_paciente_por_id, conexao, campos, _id_paciente)
+
+            resultados = await _consultar_async(
+                conexao, f"SELECT {campos} FROM T_PACIENTE WHERE id_paciente = :id_paciente",
+                {"id_paciente": _id_paciente}, _minusculas=True, _arraysize=2
+            )
+            return True, resultados
+
+    except Exception as e:
+        return False, str(e)
+
+# ========= SELECT PACIENTE POR TEXTO / NÚMERO / FILTROS =========
+async def buscar_paciente_por_texto_async(_origem, _campo_where: str, _texto: str,
+                                          _colunas_exibir: str, _modo: str = "contem") -> list[dict]:
+    """Versão async de buscar_paciente_por_texto. Campos inválidos ou erros retornam uma lista vazia."""
+    campo = _campo_where.upper()
+    texto = normalizar_texto(_texto.strip())
+    if campo not in CAMPOS_BUSCA_TEXTUAL or not _colunas_exibir.strip() or not texto:
+        return []
+
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(buscar_paciente_por_texto, conexao, campo, _texto, _colunas_exibir, _modo)
+
+            usar_trigramas = (_modo != "prefixo" and campo in CAMPOS_TRIGRAMA and len(texto) >= 3
+                              and await _trigramas_disponiveis_async(conexao))
+            comando_sql, parametros = montar_busca_texto(campo, texto, _colunas_exibir, _modo, "oracle", usar_trigramas)
+            return await _consultar_async(conexao, comando_sql, parametros)
+
+    except Exception as e:
+        print(f"\nErro ao executar consulta SQL: {e}\n")
+        return []
+
+async def buscar_paciente_por_numero_async(_origem, _campo: str, _operador: str, _valor: int, _colunas_exibir: str) -> list[dict]:
+    """Versão async de buscar_paciente_por_numero (campo e operador validados contra as listas fixas).
+    Erros resultam em uma lista vazia."""
+    campo = _campo.upper()
+    if campo not in COLUNAS_NUMERICAS or _operador not in OPERADORES_COMPARACAO:
+        print("\nErro: campo ou operador inválido para pesquisa numérica.\n")
+        return []
+
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(buscar_paciente_por_numero, conexao, campo, _operador, _valor, _colunas_exibir)
+
+            comando_sql = f"SELECT {_colunas_exibir} FROM T_PACIENTE WHERE {campo} {_operador} :valor"
+            return await _consultar_async(conexao, comando_sql, {"valor": _valor})
+
+    except Exception as e:
+        print(f"\nErro ao executar consulta SQL: {e}\n")
+        return []
+
+async def buscar_paciente_composto_async(_origem, _filtros: list[dict], _colunas_exibir: str) -> list[dict]:
+    """Versão async de buscar_paciente_composto. Filtros inválidos ou erros resultam em uma lista vazia."""
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(buscar_paciente_composto, conexao, _filtros, _colunas_exibir)
+
+            comando_sql, parametros = montar_consulta_paciente(_filtros, _colunas_exibir, "oracle")
+            return await _consultar_async(conexao, comando_sql, parametros)
+
+    except Exception as e:
+        print(f"\nErro ao executar consulta SQL: {e}\n")
+        return []
+
+# ========= UPDATE PACIENTE POR ID =========
+async def atualizar_coluna_paciente_async(_origem, _id_paciente: int, _coluna: str, _valor) -> tuple[bool, any]:
+    """
+    Versão async de atualizar_coluna_paciente. Como não pode perguntar pelo terminal, recebe o valor pronto
+    (mesmos campos do menu de atualização, ver colunas_do_campo, ou o nome da coluna de T_PACIENTE).
+    Retorna (True, None) se sucesso, ou (False, erro) se falha.
+    """
+    try:
+        valores = colunas_do_campo(_coluna, _valor)
+
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                sucesso, resultado = await asyncio.to_thread(atualizar_pacientes_em_lote, conexao, valores, [_id_paciente])
+                if not sucesso:
+                    return (False, resultado["erro"])
+                if resultado["nao_encontrados"]:
+                    return (False, "Nenhum paciente encontrado com este ID para atualizar.")
+                return (True, None)
+
+            trecho_set, parametros = montar_update_pacientes(valores)
+
+            cur = conexao.cursor()
+            await cur.execute(f"UPDATE T_PACIENTE SET {trecho_set} WHERE ID_PACIENTE = :id_paciente",
+                              {**parametros, "id_paciente": _id_paciente})
+            if cur.rowcount == 0:
+                await conexao.rollback()
+                cur.close()
+                return (False, "Nenhum paciente encontrado com este ID para atualizar.")
+
+            valores_trigrama = {campo: valores[campo] for campo in CAMPOS_TRIGRAMA if campo in valores}
+            if valores_trigrama and await _trigramas_disponiveis_async(conexao):
+                await _indexar_trigramas_async(cur, _id_paciente, valores_trigrama)
+
+            await conexao.commit()
+            cur.close()
+
+        invalidar_cache_preview()
+        if "NM_COMPLETO" in valores:
+            atualizar_indice_fuzzy(_id_paciente, valores["NM_COMPLETO"])
+
+        return (True, None)
+
+    except Exception as e:
+        return (False, e)
+
+# ========= DELETE PACIENTE POR ID =========
+async def deletar_paciente_async(_origem, _id_paciente: int) -> tuple[bool, any]:
+    """Versão async de deletar_paciente. Retorna (True, None) ou (False, erro)."""
+    try:
+        async with emprestar_conexao_async(_origem) as conexao:
+            if _dialeto(conexao) == "sqlite":
+                return await asyncio.to_thread(deletar_paciente, conexao, _id_paciente)
+
+            cur = conexao.cursor()
+            await cur.execute("DELETE FROM T_PACIENTE WHERE ID_PACIENTE = :id", {"id": _id_paciente})
+
+            if cur.rowcount == 0:
+                await conexao.rollback()
+                cur.close()
+                return (False, "Nenhum paciente encontrado com este ID para remover.")
+
+            await conexao.commit()
+            cur.close()
+
+        invalidar_cache_preview([_id_paciente], 1)
+        remover_do_indice_fuzzy(_id_paciente)
+        return (True, None)
+
+    except Exception as e:
+        return (False, e)
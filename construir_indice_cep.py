@@ -0,0 +1,40 @@
+# ==========================================================
+#   CONSTRUÇÃO DO ÍNDICE OFFLINE DE CEP
+# ==========================================================
+# Converte um arquivo CSV com a base de CEPs no índice binário usado pelo
+# resolvedor offline (configurar_resolvedor_cep("indice")).
+#
+# Uso (no terminal):
+#   python construir_indice_cep.py base_ceps.csv indice_cep.bin
+#   python construir_indice_cep.py base_ceps.csv indice_cep.bin --delimitador ";"
+#
+# O CSV precisa de cabeçalho com as colunas: cep, logradouro, bairro, cidade (ou localidade), estado (ou uf).
+
+import sys
+import time
+import argparse
+
+from cadastro_paciente import construir_indice_cep
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Gera o índice binário de CEPs a partir de um CSV.")
+    parser.add_argument("csv", help="arquivo CSV com a base de CEPs")
+    parser.add_argument("indice", nargs="?", default="indice_cep.bin", help="arquivo de saída (padrão: indice_cep.bin)")
+    parser.add_argument("--delimitador", default=None, help="delimitador do CSV (detectado automaticamente se omitido)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    sucesso, resultado = construir_indice_cep(args.csv, args.indice, args.delimitador)
+    duracao = time.perf_counter() - inicio
+
+    if not sucesso:
+        print(f"Erro ao construir o índice de CEP: {resultado}")
+        return 1
+
+    print(f"Índice '{args.indice}' gerado com {resultado} CEPs em {duracao:.2f}s.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
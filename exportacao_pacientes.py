@@ -0,0 +1,645 @@
+# ==========================================================
+#   EXPORTAÇÃO DE PACIENTES
+# ==========================================================
+# Exportações da tabela T_PACIENTE direto do cursor, em lotes:
+#   - JSON / NDJSON (com gzip opcional)         -> exportar_pacientes_stream
+#   - Parquet / Arrow IPC (requer pyarrow)       -> exportar_pacientes_colunar
+#   - CSV (com divisão em partes)                -> exportar_pacientes_csv
+#   - paralela por faixas de ID, com manifesto   -> exportar_pacientes_paralelo
+#   - incremental (delta) com marca d'água       -> exportar_pacientes_delta
+#
+# Fica separado de cadastro_paciente.py para que o programa só carregue este módulo
+# (e o pyarrow) quando o usuário escolhe a opção de exportação no menu.
+
+from __future__ import annotations
+
+# --- Bibliotecas padrão ---
+import os
+import csv
+import json
+import gzip
+import time
+import sqlite3
+from datetime import datetime, timedelta
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+# --- Módulo do cadastro ---
+from cadastro_paciente import (
+    oracledb,
+    COLUNAS_T_PACIENTE,
+    COLUNAS_NUMERICAS,
+    COLUNAS_DATA,
+    conectar_sqlite,
+    emprestar_conexao,
+    select_paciente_stream,
+    parametro_timestamp,
+    _dialeto,
+    _valor_json,
+)
+
+
+def _carregar_pyarrow() -> tuple:
+    """Importa o pyarrow (pacote opcional) no primeiro uso. Retorna (pyarrow, pyarrow.parquet) ou (None, None)."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None, None
+    return pyarrow, pyarrow.parquet
+
+# ========= EXPORTAR PACIENTES EM STREAMING =========
+def _abrir_arquivo_exportacao(_nome_arquivo: str, _compactar: bool = None):
+    """Abre o arquivo de saída em modo texto; usa gzip quando pedido ou quando o nome termina em '.gz'."""
+    if _compactar is None:
+        _compactar = _nome_arquivo.lower().endswith(".gz")
+
+    if _compactar:
+        return gzip.open(_nome_arquivo, "wt", encoding="utf-8", newline="")
+    return open(_nome_arquivo, "w", encoding="utf-8", newline="")
+
+def exportar_pacientes_stream(_conexao: oracledb.Connection | oracledb.ConnectionPool, _nome_arquivo: str = "pacientes.json",
+                              _campos: str = "*", _formato: str = "json", _compactar: bool = None,
+                              _tamanho_lote: int = 1000, _filtro_sql: str = "ORDER BY ID_PACIENTE",
+                              _parametros: dict = None) -> tuple[bool, any]:
+    """
+    Exporta T_PACIENTE direto do cursor para o arquivo, lote a lote, sem carregar a tabela em memória.
+    _formato: "json" (array, um objeto por linha) ou "ndjson" (um objeto JSON por linha, sem colchetes).
+    _compactar: True/False força o gzip; None decide pela extensão '.gz'.
+    A memória usada fica limitada a um lote de _tamanho_lote linhas.
+    Retorna (True, quantidade_exportada) ou (False, erro).
+    """
+    if _formato not in ("json", "ndjson"):
+        return (False, f"Formato de exportação inválido: {_formato}")
+
+    quantidade = 0
+    try:
+        with _abrir_arquivo_exportacao(_nome_arquivo, _compactar) as arquivo:
+            if _formato == "json":
+                arquivo.write("[")
+
+            for lote in select_paciente_stream(_conexao, _campos, _tamanho_lote=_tamanho_lote,
+                                               _arraysize=_tamanho_lote, _prefetchrows=_tamanho_lote,
+                                               _filtro_sql=_filtro_sql, _parametros=_parametros):
+                linhas = []
+                for registro in lote:
+                    linhas.append(json.dumps(registro, ensure_ascii=False, default=_valor_json))
+
+                if _formato == "json":
+                    separador = ",\n    " if quantidade else "\n    "
+                    arquivo.write(separador + ",\n    ".join(linhas))
+                else:
+                    arquivo.write("\n".join(linhas) + "\n")
+
+                quantidade += len(linhas)
+
+            if _formato == "json":
+                arquivo.write("\n]\n" if quantidade else "]\n")
+
+        return (True, quantidade)
+
+    except Exception as e:
+        return (False, e)
+
+# ========= EXPORTAR PACIENTES EM FORMATO COLUNAR (PARQUET / ARROW) =========
+# Mantém os tipos do banco (inteiros, datas e timestamps) em vez de texto formatado.
+# Colunas com poucos valores distintos são gravadas com codificação de dicionário.
+COLUNAS_DICIONARIO = ["SEXO", "ESTADO_CIVIL", "BRASILEIRO", "ESTADO", "CONVENIO",
+                      "TIPO_CONSULTA", "ESPECIALIDADE", "STATUS_CONSULTA"]
+
+def _colunas_dos_campos(_campos: str) -> list[str]:
+    """Nomes das colunas (em minúsculas, como em select_paciente_stream) de uma lista de campos do SELECT."""
+    if _campos.strip() == "*":
+        return [c.lower() for c in COLUNAS_T_PACIENTE]
+    return [c.strip().lower() for c in _campos.split(",") if c.strip()]
+
+def _esquema_arrow_paciente(_colunas: list[str]):
+    """Monta o schema Arrow das colunas informadas conforme os tipos de T_PACIENTE."""
+    pa, _ = _carregar_pyarrow()
+    campos = []
+    for coluna in _colunas:
+        nome = coluna.upper()
+        if nome in COLUNAS_NUMERICAS:
+            tipo = pa.int64()
+        elif nome == "DT_NASCIMENTO":
+            tipo = pa.date32()
+        elif nome in COLUNAS_DATA:
+            tipo = pa.timestamp("us")  # microssegundos: o TIMESTAMP guarda frações de segundo
+        elif nome in COLUNAS_DICIONARIO:
+            tipo = pa.dictionary(pa.int32(), pa.string())
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(coluna, tipo))
+    return pa.schema(campos)
+
+def _lote_para_arrow(_lote: list[dict], _esquema):
+    """Converte um lote de dicionários em RecordBatch, coluna a coluna."""
+    pa, _ = _carregar_pyarrow()
+    colunas = []
+    for campo in _esquema:
+        valores = [registro[campo.name] for registro in _lote]
+        if pa.types.is_date32(campo.type):
+            valores = [v.date() if isinstance(v, datetime) else v for v in valores]
+        colunas.append(pa.array(valores, type=campo.type))
+    return pa.RecordBatch.from_arrays(colunas, schema=_esquema)
+
+def exportar_pacientes_colunar(_conexao: oracledb.Connection | oracledb.ConnectionPool, _nome_arquivo: str = "pacientes.parquet",
+                               _campos: str = "*", _formato: str = "parquet", _tamanho_lote: int = 10000,
+                               _compressao: str = "zstd", _filtro_sql: str = "ORDER BY ID_PACIENTE",
+                               _parametros: dict = None) -> tuple[bool, any]:
+    """
+    Exporta T_PACIENTE para Parquet (_formato="parquet") ou Arrow IPC (_formato="arrow"),
+    gravando cada lote do cursor como um row group / record batch.
+    O Arrow é gravado no formato IPC de stream (ler com pyarrow.ipc.open_stream), que aceita
+    um dicionário diferente a cada lote nas colunas codificadas.
+    Requer o pacote pyarrow. Retorna (True, quantidade_exportada) ou (False, erro).
+    """
+    pa, pq = _carregar_pyarrow()
+    if pa is None:
+        return (False, "Exportação colunar requer o pacote pyarrow (pip install pyarrow).")
+    if _formato not in ("parquet", "arrow"):
+        return (False, f"Formato de exportação inválido: {_formato}")
+
+    quantidade = 0
+    escritor = None
+    try:
+        esquema = None
+        for lote in select_paciente_stream(_conexao, _campos, _tamanho_lote=_tamanho_lote,
+                                           _arraysize=_tamanho_lote, _prefetchrows=_tamanho_lote,
+                                           _filtro_sql=_filtro_sql, _parametros=_parametros):
+            if escritor is None:
+                esquema = _esquema_arrow_paciente(list(lote[0].keys()))
+                if _formato == "parquet":
+                    escritor = pq.ParquetWriter(_nome_arquivo, esquema, compression=_compressao)
+                else:
+                    escritor = pa.ipc.new_stream(_nome_arquivo, esquema,
+                                                 options=pa.ipc.IpcWriteOptions(compression=_compressao))
+
+            escritor.write_batch(_lote_para_arrow(lote, esquema))
+            quantidade += len(lote)
+
+        if escritor is None:
+            esquema = _esquema_arrow_paciente(_colunas_dos_campos(_campos))
+            if _formato == "parquet":
+                escritor = pq.ParquetWriter(_nome_arquivo, esquema, compression=_compressao)
+            else:
+                escritor = pa.ipc.new_stream(_nome_arquivo, esquema)
+
+        escritor.close()
+        escritor = None
+
+        return (True, quantidade)
+
+    except Exception as e:
+        return (False, e)
+
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+# ========= EXPORTAR PACIENTES PARA CSV =========
+def exportar_pacientes_csv(_conexao: oracledb.Connection | oracledb.ConnectionPool, _nome_arquivo: str = "pacientes.csv",
+                           _campos: str = "*", _tamanho_lote: int = 1000, _linhas_por_arquivo: int = None,
+                           _delimitador: str = ";", _compactar: bool = None,
+                           _filtro_sql: str = "ORDER BY ID_PACIENTE", _parametros: dict = None) -> tuple[bool, any]:
+    """
+    Exporta T_PACIENTE para CSV lote a lote, com cabeçalho e datas em ISO 8601 (aaaa-mm-dd [hh:mm:ss]).
+    Com _linhas_por_arquivo, divide a saída em partes (pacientes_0001.csv, pacientes_0002.csv, ...),
+    cada uma com seu próprio cabeçalho.
+    Retorna (True, {"linhas": quantidade, "arquivos": [nomes]}) ou (False, erro).
+    """
+    quantidade = 0
+    arquivos = []
+    arquivo = None
+    try:
+        base, extensao = _nome_arquivo, ""
+        for sufixo in (".csv.gz", ".csv"):
+            if _nome_arquivo.lower().endswith(sufixo):
+                base, extensao = _nome_arquivo[:-len(sufixo)], _nome_arquivo[-len(sufixo):]
+                break
+
+        colunas = None
+        linhas_no_arquivo = 0
+        for lote in select_paciente_stream(_conexao, _campos, _tamanho_lote=_tamanho_lote,
+                                           _arraysize=_tamanho_lote, _prefetchrows=_tamanho_lote,
+                                           _filtro_sql=_filtro_sql, _parametros=_parametros):
+            if colunas is None:
+                colunas = list(lote[0].keys())
+
+            inicio = 0
+            while inicio < len(lote):
+                if arquivo is None or (_linhas_por_arquivo and linhas_no_arquivo >= _linhas_por_arquivo):
+                    if arquivo is not None:
+                        arquivo.close()
+                    if _linhas_por_arquivo:
+                        nome = f"{base}_{len(arquivos) + 1:04d}{extensao}"
+                    else:
+                        nome = _nome_arquivo
+                    arquivo = _abrir_arquivo_exportacao(nome, _compactar)
+                    escritor = csv.writer(arquivo, delimiter=_delimitador)
+                    escritor.writerow(colunas)
+                    arquivos.append(nome)
+                    linhas_no_arquivo = 0
+
+                fim = len(lote)
+                if _linhas_por_arquivo:
+                    fim = min(fim, inicio + _linhas_por_arquivo - linhas_no_arquivo)
+
+                escritor.writerows(
+                    [v.isoformat(sep=" ") if isinstance(v, datetime) else v for v in registro.values()]
+                    for registro in lote[inicio:fim]
+                )
+                linhas_no_arquivo += fim - inicio
+                quantidade += fim - inicio
+                inicio = fim
+
+        if arquivo is None:
+            arquivo = _abrir_arquivo_exportacao(_nome_arquivo, _compactar)
+            csv.writer(arquivo, delimiter=_delimitador).writerow(_colunas_dos_campos(_campos))
+            arquivos.append(_nome_arquivo)
+
+        arquivo.close()
+        arquivo = None
+
+        return (True, {"linhas": quantidade, "arquivos": arquivos})
+
+    except Exception as e:
+        return (False, e)
+
+    finally:
+        if arquivo is not None:
+            arquivo.close()
+
+# ========= EXPORTAÇÃO PARALELA POR FAIXAS DE ID =========
+# Divide T_PACIENTE em faixas de ID_PACIENTE; cada faixa é lida em sua própria sessão do pool
+# (ou em sua própria conexão SQLite) e gravada em um arquivo separado (shard).
+# Um manifesto JSON lista os shards, suas faixas e quantidades de linhas.
+EXTENSOES_EXPORTACAO = {"json": ".json", "ndjson": ".ndjson", "csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+def calcular_faixas_id(_conexao: oracledb.Connection | oracledb.ConnectionPool, _particoes: int) -> list[tuple[int, int]]:
+    """Divide o intervalo [MIN(ID_PACIENTE), MAX(ID_PACIENTE)] em até _particoes faixas contíguas de mesma largura."""
+    with emprestar_conexao(_conexao) as conexao:
+        cur = conexao.cursor()
+        cur.execute("SELECT MIN(ID_PACIENTE), MAX(ID_PACIENTE) FROM T_PACIENTE")
+        id_min, id_max = cur.fetchone()
+        cur.close()
+
+    if id_min is None:
+        return []
+
+    id_min, id_max = int(id_min), int(id_max)
+    largura = max(1, -(-(id_max - id_min + 1) // max(1, _particoes)))
+
+    faixas = []
+    inicio = id_min
+    while inicio <= id_max:
+        fim = min(inicio + largura - 1, id_max)
+        faixas.append((inicio, fim))
+        inicio = fim + 1
+    return faixas
+
+@contextmanager
+def _origem_para_trabalhador(_origem):
+    """Origem de dados usada por uma thread de exportação: o próprio pool (cada chamada empresta uma sessão),
+    uma conexão SQLite nova para o mesmo arquivo, ou a conexão recebida (que então é compartilhada)."""
+    if isinstance(_origem, sqlite3.Connection):
+        caminho = _origem.execute("PRAGMA database_list").fetchone()[2]
+        if caminho:
+            sucesso, conexao = conectar_sqlite(caminho)
+            if not sucesso:
+                raise conexao
+            try:
+                yield conexao
+            finally:
+                conexao.close()
+            return
+    yield _origem
+
+def _exportar_faixa(_origem, _nome_arquivo: str, _formato: str, _campos: str, _compactar: bool,
+                    _tamanho_lote: int, _id_inicio: int, _id_fim: int) -> dict:
+    """Exporta uma faixa de IDs para um shard e devolve sua entrada no manifesto. Erros são propagados."""
+    inicio = time.perf_counter()
+    filtro_sql = "WHERE ID_PACIENTE BETWEEN :id_inicio AND :id_fim ORDER BY ID_PACIENTE"
+    parametros = {"id_inicio": _id_inicio, "id_fim": _id_fim}
+
+    with _origem_para_trabalhador(_origem) as origem:
+        if _formato == "csv":
+            sucesso, resultado = exportar_pacientes_csv(origem, _nome_arquivo, _campos, _tamanho_lote,
+                                                        _compactar=_compactar, _filtro_sql=filtro_sql,
+                                                        _parametros=parametros)
+            if sucesso:
+                resultado = resultado["linhas"]
+        elif _formato in ("parquet", "arrow"):
+            sucesso, resultado = exportar_pacientes_colunar(origem, _nome_arquivo, _campos, _formato, _tamanho_lote,
+                                                            _filtro_sql=filtro_sql, _parametros=parametros)
+        else:
+            sucesso, resultado = exportar_pacientes_stream(origem, _nome_arquivo, _campos, _formato, _compactar,
+                                                           _tamanho_lote, filtro_sql, parametros)
+
+    if not sucesso:
+        raise RuntimeError(f"Falha ao exportar IDs {_id_inicio}-{_id_fim}: {resultado}")
+
+    return {
+        "arquivo": os.path.basename(_nome_arquivo),
+        "id_inicio": _id_inicio,
+        "id_fim": _id_fim,
+        "linhas": resultado,
+        "segundos": round(time.perf_counter() - inicio, 3)
+    }
+
+def exportar_pacientes_paralelo(_conexao: oracledb.Connection | oracledb.ConnectionPool, _diretorio: str = "exportacao_pacientes",
+                                _formato: str = "ndjson", _campos: str = "*", _trabalhadores: int = 4,
+                                _particoes: int = None, _compactar: bool = False, _tamanho_lote: int = 1000,
+                                _unir: bool = False, _nome_unido: str = None) -> tuple[bool, any]:
+    """
+    Exporta T_PACIENTE em paralelo: a tabela é dividida em _particoes faixas de ID (padrão: uma por trabalhador),
+    cada faixa vira um shard em _diretorio e o manifesto é salvo em _diretorio/manifesto.json.
+    Para paralelismo real no Oracle, passe um pool com max >= _trabalhadores.
+    Com _unir=True os shards são unidos em um único arquivo (unir_shards_exportacao).
+    Retorna (True, manifesto) ou (False, erro).
+    """
+    if _formato not in EXTENSOES_EXPORTACAO:
+        return (False, f"Formato de exportação inválido: {_formato}")
+
+    try:
+        inicio = time.perf_counter()
+        os.makedirs(_diretorio, exist_ok=True)
+
+        faixas = calcular_faixas_id(_conexao, _particoes or _trabalhadores)
+        extensao = EXTENSOES_EXPORTACAO[_formato]
+        if _compactar and _formato in ("json", "ndjson", "csv"):
+            extensao += ".gz"
+
+        with ThreadPoolExecutor(max_workers=max(1, _trabalhadores)) as executor:
+            futuros = []
+            for numero, (id_inicio, id_fim) in enumerate(faixas, start=1):
+                nome_shard = os.path.join(_diretorio, f"pacientes_{numero:04d}{extensao}")
+                futuros.append(executor.submit(_exportar_faixa, _conexao, nome_shard, _formato, _campos,
+                                               _compactar, _tamanho_lote, id_inicio, id_fim))
+            shards = [futuro.result() for futuro in futuros]
+
+        manifesto = {
+            "tabela": "T_PACIENTE",
+            "formato": _formato,
+            "compactado": bool(_compactar and _formato in ("json", "ndjson", "csv")),
+            "campos": _campos,
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "trabalhadores": _trabalhadores,
+            "total_linhas": sum(shard["linhas"] for shard in shards),
+            "segundos": round(time.perf_counter() - inicio, 3),
+            "shards": shards
+        }
+
+        caminho_manifesto = os.path.join(_diretorio, "manifesto.json")
+        with open(caminho_manifesto, "w", encoding="utf-8") as arquivo:
+            json.dump(manifesto, arquivo, ensure_ascii=False, indent=4)
+
+        if _unir:
+            nome_unido = _nome_unido or os.path.join(_diretorio, f"pacientes{extensao}")
+            sucesso, erro = unir_shards_exportacao(caminho_manifesto, nome_unido)
+            if not sucesso:
+                return (False, erro)
+            manifesto["arquivo_unido"] = nome_unido
+
+        return (True, manifesto)
+
+    except Exception as e:
+        return (False, e)
+
+def unir_shards_exportacao(_caminho_manifesto: str, _nome_arquivo: str) -> tuple[bool, any]:
+    """
+    Une os shards listados no manifesto em um único arquivo do mesmo formato, na ordem das faixas de ID.
+    Os shards são lidos em sequência, sem carregar todos em memória.
+    Retorna (True, quantidade_de_linhas) ou (False, erro).
+    """
+    try:
+        with open(_caminho_manifesto, "r", encoding="utf-8") as arquivo:
+            manifesto = json.load(arquivo)
+
+        diretorio = os.path.dirname(_caminho_manifesto)
+        formato = manifesto["formato"]
+        caminhos = [os.path.join(diretorio, shard["arquivo"]) for shard in manifesto["shards"]]
+        quantidade = 0
+
+        if formato in ("parquet", "arrow"):
+            pa, pq = _carregar_pyarrow()
+            if pa is None:
+                return (False, "União de shards Parquet/Arrow requer o pacote pyarrow (pip install pyarrow).")
+
+            escritor = None
+            try:
+                for caminho in caminhos:
+                    if formato == "parquet":
+                        leitor = pq.ParquetFile(caminho)
+                        esquema, lotes = leitor.schema_arrow, leitor.iter_batches()
+                    else:
+                        leitor = pa.ipc.open_stream(caminho)
+                        esquema, lotes = leitor.schema, leitor
+
+                    if escritor is None:
+                        if formato == "parquet":
+                            escritor = pq.ParquetWriter(_nome_arquivo, esquema, compression="zstd")
+                        else:
+                            escritor = pa.ipc.new_stream(_nome_arquivo, esquema)
+
+                    for lote in lotes:
+                        escritor.write_batch(lote)
+                        quantidade += lote.num_rows
+            finally:
+                if escritor is not None:
+                    escritor.close()
+
+            return (True, quantidade)
+
+        with _abrir_arquivo_exportacao(_nome_arquivo, manifesto["compactado"]) as saida:
+            if formato == "json":
+                saida.write("[")
+
+            for numero, caminho in enumerate(caminhos):
+                if manifesto["compactado"]:
+                    entrada = gzip.open(caminho, "rt", encoding="utf-8", newline="")
+                else:
+                    entrada = open(caminho, "r", encoding="utf-8", newline="")
+
+                with entrada:
+                    if formato == "csv":
+                        cabecalho = entrada.readline()
+                        if numero == 0:
+                            saida.write(cabecalho)
+                        for linha in entrada:
+                            saida.write(linha)
+                            quantidade += 1
+
+                    elif formato == "ndjson":
+                        for linha in entrada:
+                            saida.write(linha)
+                            quantidade += 1
+
+                    else:
+                        # Os shards JSON têm um objeto por linha entre "[" e "]"
+                        for linha in entrada:
+                            registro = linha.strip().rstrip(",")
+                            if registro in ("[", "]", "[]", ""):
+                                continue
+                            saida.write((",\n    " if quantidade else "\n    ") + registro)
+                            quantidade += 1
+
+            if formato == "json":
+                saida.write("\n]\n" if quantidade else "]\n")
+
+        return (True, quantidade)
+
+    except Exception as e:
+        return (False, e)
+
+# ========= EXPORTAÇÃO INCREMENTAL (DELTA) =========
+# Exporta apenas o que mudou desde a última execução, usando DT_ULTIMA_ATUALIZACAO como marca d'água.
+# As exclusões vêm de T_PACIENTE_EXCLUIDO (preenchida pelo trigger trg_t_paciente_exclusao);
+# ID_PACIENTE nulo indica que todos os pacientes foram apagados.
+# Cada linha do NDJSON gerado é uma operação:
+#   {"operacao": "exclusao", "id_paciente": 7, "dt_exclusao": "..."}
+#   {"operacao": "limpeza", "dt_exclusao": "..."}
+#   {"operacao": "upsert", "paciente": {...}}
+# As exclusões vêm antes dos upserts (IDs nunca são reaproveitados, então a ordem é segura).
+CONFIG_EXPORTACAO_DELTA = {
+    "arquivo_marca_dagua": "marca_dagua_exportacao.json",
+    "sobreposicao_segundos": 5  # relê alterações recentes para não perder transações confirmadas com atraso
+}
+
+def _agora_banco(_conexao) -> datetime:
+    """Data/hora atual segundo o banco, no mesmo relógio usado pelos DEFAULTs e triggers de T_PACIENTE."""
+    cur = _conexao.cursor()
+    if _dialeto(_conexao) == "sqlite":
+        cur.execute("SELECT STRFTIME('%Y-%m-%d %H:%M:%f', 'now', 'localtime')")
+        agora = datetime.strptime(cur.fetchone()[0], "%Y-%m-%d %H:%M:%S.%f")
+    else:
+        cur.execute("SELECT CAST(SYSTIMESTAMP AS TIMESTAMP) FROM DUAL")
+        agora = cur.fetchone()[0]
+    cur.close()
+    return agora
+
+def ler_marca_dagua_exportacao(_caminho: str = None) -> dict | None:
+    """Lê o arquivo de marca d'água da exportação delta. Retorna None se ainda não houve exportação."""
+    caminho = _caminho or CONFIG_EXPORTACAO_DELTA["arquivo_marca_dagua"]
+    if not os.path.exists(caminho):
+        return None
+
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        marca = json.load(arquivo)
+    marca["marca_dagua"] = datetime.fromisoformat(marca["marca_dagua"])
+    return marca
+
+def _salvar_marca_dagua_exportacao(_caminho: str, _dados: dict) -> None:
+    """Grava a marca d'água em um arquivo temporário e o renomeia, para nunca deixar o arquivo pela metade."""
+    temporario = _caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        json.dump(_dados, arquivo, ensure_ascii=False, indent=4, default=str)
+    os.replace(temporario, _caminho)
+
+def exportar_pacientes_delta(_conexao: oracledb.Connection | oracledb.ConnectionPool, _nome_arquivo: str = None,
+                             _campos: str = "*", _compactar: bool = None, _tamanho_lote: int = 1000,
+                             _arquivo_marca_dagua: str = None) -> tuple[bool, any]:
+    """
+    Exporta em NDJSON os pacientes inseridos/alterados e as exclusões desde a última exportação delta.
+    Na primeira execução (sem marca d'água) exporta a tabela inteira como upserts.
+    A marca d'água só é atualizada depois que o arquivo foi gravado por completo.
+    Retorna (True, resumo) ou (False, erro).
+    """
+    caminho_marca = _arquivo_marca_dagua or CONFIG_EXPORTACAO_DELTA["arquivo_marca_dagua"]
+
+    try:
+        marca_anterior = ler_marca_dagua_exportacao(caminho_marca)
+
+        with emprestar_conexao(_conexao) as conexao:
+            ate = _agora_banco(conexao)
+            if marca_anterior is None:
+                desde = None
+            else:
+                desde = marca_anterior["marca_dagua"] - timedelta(seconds=CONFIG_EXPORTACAO_DELTA["sobreposicao_segundos"])
+
+            nome_arquivo = _nome_arquivo or f"pacientes_delta_{ate:%Y%m%d_%H%M%S}.ndjson" + (".gz" if _compactar else "")
+            parametros = {"ate": parametro_timestamp(conexao, ate)}
+            filtro_sql = "WHERE DT_ULTIMA_ATUALIZACAO <= :ate"
+            if desde is not None:
+                parametros["desde"] = parametro_timestamp(conexao, desde)
+                filtro_sql = "WHERE DT_ULTIMA_ATUALIZACAO >= :desde AND DT_ULTIMA_ATUALIZACAO <= :ate"
+
+            excluidos = 0
+            atualizados = 0
+            with _abrir_arquivo_exportacao(nome_arquivo, _compactar) as arquivo:
+                if desde is not None:
+                    cur = conexao.cursor()
+                    cur.execute(
+                        """SELECT ID_PACIENTE, DT_EXCLUSAO FROM T_PACIENTE_EXCLUIDO
+                           WHERE DT_EXCLUSAO >= :desde AND DT_EXCLUSAO <= :ate
+                           ORDER BY DT_EXCLUSAO""",
+                        parametros
+                    )
+                    lote = cur.fetchmany(_tamanho_lote)
+                    while lote:
+                        linhas = []
+                        for id_paciente, dt_exclusao in lote:
+                            if id_paciente is None:
+                                operacao = {"operacao": "limpeza", "dt_exclusao": dt_exclusao}
+                            else:
+                                operacao = {"operacao": "exclusao", "id_paciente": int(id_paciente), "dt_exclusao": dt_exclusao}
+                            linhas.append(json.dumps(operacao, ensure_ascii=False, default=_valor_json))
+                        arquivo.write("\n".join(linhas) + "\n")
+                        excluidos += len(linhas)
+                        lote = cur.fetchmany(_tamanho_lote)
+                    cur.close()
+
+                for lote in select_paciente_stream(conexao, _campos, _tamanho_lote=_tamanho_lote,
+                                                   _arraysize=_tamanho_lote, _prefetchrows=_tamanho_lote,
+                                                   _filtro_sql=filtro_sql + " ORDER BY ID_PACIENTE",
+                                                   _parametros=parametros):
+                    linhas = []
+                    for registro in lote:
+                        linhas.append(json.dumps({"operacao": "upsert", "paciente": registro},
+                                                 ensure_ascii=False, default=_valor_json))
+                    arquivo.write("\n".join(linhas) + "\n")
+                    atualizados += len(linhas)
+
+        resumo = {
+            "tipo": "completa" if desde is None else "incremental",
+            "desde": desde,
+            "marca_dagua": ate,
+            "arquivo": nome_arquivo,
+            "atualizados": atualizados,
+            "excluidos": excluidos
+        }
+        _salvar_marca_dagua_exportacao(caminho_marca, {
+            "marca_dagua": ate.isoformat(),
+            "ultima_exportacao": nome_arquivo,
+            "tipo": resumo["tipo"],
+            "atualizados": atualizados,
+            "excluidos": excluidos
+        })
+
+        return (True, resumo)
+
+    except Exception as e:
+        return (False, e)
+
+def limpar_exclusoes_exportadas(_conexao: oracledb.Connection | oracledb.ConnectionPool, _arquivo_marca_dagua: str = None) -> tuple[bool, any]:
+    """Apaga de T_PACIENTE_EXCLUIDO as exclusões já cobertas pela última exportação delta
+    (respeitando a janela de sobreposição). Retorna (True, quantidade_apagada) ou (False, erro)."""
+    try:
+        marca = ler_marca_dagua_exportacao(_arquivo_marca_dagua)
+        if marca is None:
+            return (True, 0)
+
+        limite = marca["marca_dagua"] - timedelta(seconds=CONFIG_EXPORTACAO_DELTA["sobreposicao_segundos"])
+
+        with emprestar_conexao(_conexao) as conexao:
+            cur = conexao.cursor()
+            cur.execute("DELETE FROM T_PACIENTE_EXCLUIDO WHERE DT_EXCLUSAO < :limite",
+                        {"limite": parametro_timestamp(conexao, limite)})
+            apagados = cur.rowcount
+            conexao.commit()
+            cur.close()
+
+        return (True, apagados)
+
+    except Exception as e:
+        return (False, e)
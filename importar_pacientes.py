@@ -0,0 +1,93 @@
+# ==========================================================
+#   IMPORTAÇÃO EM LOTE DE PACIENTES
+# ==========================================================
+# Carrega pacientes de um arquivo CSV, JSON ou NDJSON (um objeto JSON por linha)
+# para a tabela T_PACIENTE usando insert_pacientes_em_lote (executemany).
+#
+# As colunas/chaves do arquivo seguem o dicionário de solicitar_dados_paciente:
+#   nome_completo, data_nascimento (dd/mm/aaaa), sexo, cpf, rg, estado_civil, brasileiro,
+#   cep, rua, bairro, cidade, estado, numero_endereco, celular, email, convenio,
+#   data_hora_consulta (dd/mm/aaaa hh:mm), tipo_consulta, especialidade, status_consulta
+#
+# Uso (no terminal):
+#   python importar_pacientes.py pacientes_legado.csv --user rm000000 --password 123 --dsn host:1521/ORCL
+#   python importar_pacientes.py pacientes.json --lote 5000
+#   python importar_pacientes.py pacientes.json --inicio 20001   (retoma uma importação interrompida)
+#
+# Usuário, senha e DSN também podem vir das variáveis ORACLE_USER, ORACLE_PASSWORD e ORACLE_DSN.
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import itertools
+
+from cadastro_paciente import conectar_oracledb, insert_pacientes_em_lote
+
+
+def ler_pacientes(_caminho: str):
+    """Gera os dicionários de pacientes do arquivo, conforme a extensão (.csv, .json ou .ndjson/.jsonl)."""
+    extensao = os.path.splitext(_caminho)[1].lower()
+
+    if extensao == ".csv":
+        with open(_caminho, "r", encoding="utf-8-sig", newline="") as arquivo:
+            for linha in csv.DictReader(arquivo):
+                if linha.get("numero_endereco", "").strip().isdigit():
+                    linha["numero_endereco"] = int(linha["numero_endereco"])
+                yield linha
+
+    elif extensao in (".ndjson", ".jsonl"):
+        with open(_caminho, "r", encoding="utf-8") as arquivo:
+            for linha in arquivo:
+                if linha.strip():
+                    yield json.loads(linha)
+
+    elif extensao == ".json":
+        with open(_caminho, "r", encoding="utf-8") as arquivo:
+            yield from json.load(arquivo)
+
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {extensao}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Importa pacientes em lote para a tabela T_PACIENTE.")
+    parser.add_argument("arquivo", help="arquivo .csv, .json ou .ndjson com os pacientes")
+    parser.add_argument("--lote", type=int, default=1000, help="linhas por lote/commit (padrão: 1000)")
+    parser.add_argument("--inicio", type=int, default=1, help="primeira linha do arquivo a importar (padrão: 1)")
+    parser.add_argument("--user", default=os.environ.get("ORACLE_USER"))
+    parser.add_argument("--password", default=os.environ.get("ORACLE_PASSWORD"))
+    parser.add_argument("--dsn", default=os.environ.get("ORACLE_DSN"))
+    args = parser.parse_args()
+
+    ok, conn = conectar_oracledb(args.user, args.password, args.dsn)
+    if not ok:
+        print(f"Erro ao conectar ao banco de dados: {conn}")
+        return 1
+
+    inicio = time.perf_counter()
+    sucesso, resultado = insert_pacientes_em_lote(conn, itertools.islice(ler_pacientes(args.arquivo), args.inicio - 1, None), args.lote)
+    duracao = time.perf_counter() - inicio
+    conn.close()
+
+    if not sucesso:
+        print(f"Erro na importação: {resultado['erro']}")
+        if resultado["processados"]:
+            # Os lotes anteriores ao erro já estão gravados: a importação recomeça da linha seguinte
+            print(f"{resultado['inseridos']} pacientes já importados; para continuar, use --inicio {args.inicio + resultado['processados']}.")
+        return 1
+
+    print(f"{resultado['inseridos']} pacientes importados em {duracao:.2f}s.")
+
+    if resultado["erros"]:
+        print(f"{len(resultado['erros'])} linhas rejeitadas:")
+        for posicao, mensagem in resultado["erros"]:
+            print(f"  linha {args.inicio + posicao}: {mensagem}")
+
+    return 0 if not resultado["erros"] else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@
 #         pip install tabulate
 #         pip install requests
 #         pip install pandas
+#         pip install pyarrow   (opcional, para exportar em Parquet/Arrow)
 
 # COMANDO SQL PARA ORACLE:
 
@@ -49,6 +50,31 @@ FOR EACH ROW
 BEGIN
     :NEW.DT_ULTIMA_ATUALIZACAO := SYSTIMESTAMP;
 END;
+
+-- Índice usado pela atualização incremental do preview (registros alterados desde a última leitura)
+CREATE INDEX IX_PACIENTE_DT_ATUALIZACAO ON T_PACIENTE (DT_ULTIMA_ATUALIZACAO);
+
+-- Registro de exclusões (tombstones) usado pela exportação delta
+-- ID_PACIENTE nulo indica que todos os pacientes foram apagados de uma vez
+CREATE TABLE T_PACIENTE_EXCLUIDO (
+    ID_EXCLUSAO        NUMBER GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    ID_PACIENTE        NUMBER,
+    DT_EXCLUSAO        TIMESTAMP DEFAULT SYSTIMESTAMP NOT NULL
+);
+
+CREATE INDEX IX_PAC_EXCLUIDO_DT ON T_PACIENTE_EXCLUIDO (DT_EXCLUSAO);
+
+-- Trigger que registra cada paciente removido
+CREATE OR REPLACE TRIGGER trg_t_paciente_exclusao
+AFTER DELETE ON T_PACIENTE
+FOR EACH ROW
+BEGIN
+    INSERT INTO T_PACIENTE_EXCLUIDO (ID_PACIENTE) VALUES (:OLD.ID_PACIENTE);
+END;
+
+-- Busca textual indexada (índices de prefixo e tabela de trigramas T_PACIENTE_TRIGRAMA):
+-- execute uma vez no Python: criar_estruturas_busca_textual(conn)
+-- (os comandos podem ser vistos com gerar_ddl_busca_textual())
 """
 
 # Este programa utiliza a API pública do ViaCEP para consultar informações de endereços
@@ -59,6 +85,7 @@ END;
 
 # Execute o programa pelo arquivo principal: main.py
 # (no terminal: python main.py)
+# Sem Oracle, com o banco SQLite local: PACIENTES_BACKEND=sqlite python main.py
 
 from cadastro_paciente import *
 
@@ -98,14 +125,30 @@ campos_dict = {
 
 
 try:
-    user = "rm561833"
-    password = "070406"
-    dsn = "oracle.fiap.com.br:1521/ORCL"
-    ok, conn = conectar_oracledb(user, password, dsn)
-    conectado = bool(conn)
+    if CONFIG_BACKEND["tipo"] == "sqlite":
+        # Banco local (PACIENTES_BACKEND=sqlite): mesmo esquema, sem precisar do Oracle
+        ok, conn = abrir_backend("sqlite")
+    else:
+        user = "rm561833"
+        password = "070406"
+        dsn = "oracle.fiap.com.br:1521/ORCL"
+        # Pool de sessões: cada operação empresta uma sessão e a devolve ao final
+        ok, conn = abrir_backend("oracle", _user=user, _password=password, _dsn=dsn, _min=1, _max=4, _incremento=1)
+    conectado = ok
 except Exception as e:
     conectado = False
 
+if conectado:
+    # Pré-carrega o cache de CEP com os endereços já cadastrados
+    aquecer_cache_cep(conn)
+
+    # Garante que o índice de trigramas da busca textual esteja preenchido
+    preparar_busca_textual(conn)
+
+    # Se existir o índice offline de CEP, ele é consultado antes do ViaCEP
+    if os.path.exists(CONFIG_RESOLVEDOR_CEP["caminho_indice"]):
+        configurar_resolvedor_cep("indice_e_viacep")
+
 while conectado:
     limpar_terminal()
     exibir_titulo_centralizado("AXCESS TECH - SISTEMA DE GERENCIAMENTO DE PACIENTE", 60)
@@ -114,10 +157,15 @@ while conectado:
     print("3 - ATUALIZAR REGISTROS")
     print("4 - REMOVER REGISTRO")
     print("5 - LIMPAR TODOS OS REGISTROS")
-    print("6 - EXPORTAÇÃO PARA JSON")
+    print("6 - EXPORTAÇÃO DE PACIENTES (JSON/CSV/PARQUET)")
     print("0 - SAIR")
     print("")
 
+    estatisticas_cep = obter_estatisticas_cache_cep()
+    print(f"Cache de CEP: {estatisticas_cep['acertos']} acertos | {estatisticas_cep['falhas']} falhas | {estatisticas_cep['entradas']} entradas")
+
+    print(f"{descrever_backend(conn)}\n")
+
     escolha_menu = obter_int_intervalado("Escolha: ", "Entrada inválida.", 0, 6)
 
     match escolha_menu:
@@ -159,9 +207,11 @@ while conectado:
                     print("2 - POR ID DO PACIENTE")
                     print("3 - PESQUISA DE TEXTO")
                     print("4 - PESQUISA NUMÉRICA")
+                    print("5 - PESQUISA APROXIMADA POR NOME")
+                    print("6 - PESQUISA COMBINADA (VÁRIOS FILTROS)")
                     print("0 - VOLTAR\n")
 
-                    escolha_submenu = obter_int_intervalado("Escolha: ", "Entrada inválida.", 0, 5)
+                    escolha_submenu = obter_int_intervalado("Escolha: ", "Entrada inválida.", 0, 6)
 
                     match escolha_submenu:
                         case 0:  # VOLTAR
@@ -176,21 +226,7 @@ while conectado:
                                 campos_dict
                             )
 
-                            sucesso, busca = select_paciente(conn, texto)
-                            if sucesso:
-                                sucesso, tabela = imprimir_resultado_tabulate_oracle(busca)
-                                if sucesso:
-                                    limpar_terminal()
-                                    exibir_titulo_centralizado("CONSULTA - TODOS OS PACIENTES", 60)
-                                    print(tabela)
-                                else:
-                                    limpar_terminal()
-                                    print("\nErro ao formatar os resultados:")
-                                    print(tabela)
-                            else:
-                                limpar_terminal()
-                                print("\nErro ao consultar pacientes no banco de dados:")
-                                print(busca)
+                            navegar_paginas_pacientes(conn, texto, "CONSULTA - TODOS OS PACIENTES")
 
                             deseja_exportar = obter_sim_nao(
                                 "\nDeseja exportar essa consulta para um arquivo JSON? (S/N): ",
@@ -207,11 +243,14 @@ while conectado:
                                 elif not nome_arquivo.lower().endswith(".json"):
                                     nome_arquivo += ".json"
 
-                                sucesso_export, erro_export = exportar_para_json(busca, nome_arquivo)
+                                # Grava lote a lote direto do cursor, sem carregar a tabela inteira em memória
+                                from exportacao_pacientes import exportar_pacientes_stream
+                                sucesso_export, resultado_export = exportar_pacientes_stream(conn, nome_arquivo, texto)
+
                                 if sucesso_export:
-                                    print(f"\nConsulta exportada com sucesso para '{nome_arquivo}'!")
+                                    print(f"\nConsulta exportada com sucesso para '{nome_arquivo}'! ({resultado_export} paciente(s))")
                                 else:
-                                    print(f"\nErro ao exportar para JSON: {erro_export}")
+                                    print(f"\nErro ao exportar para JSON: {resultado_export}")
 
                             input("\nAperte ENTER para voltar ao menu de consulta...")
 
@@ -219,22 +258,12 @@ while conectado:
                             limpar_terminal()
                             exibir_titulo_centralizado("CONSULTA - PACIENTE POR ID", 60)
 
-                            sucesso_select, resultados_preview = select_paciente(
-                                conn, "ID_PACIENTE, NM_COMPLETO, TIPO_CONSULTA, STATUS_CONSULTA"
-                            )
-
-                            if sucesso_select:
-                                sucesso_preview, tabela_preview = imprimir_resultado_tabulate_oracle(resultados_preview)
-                            else:
-                                sucesso_preview = False
-                                tabela_preview = f"Erro ao consultar pacientes: {resultados_preview}"
+                            sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
 
                             if sucesso_preview:
                                 resp = True
                                 while resp:
-                                    limpar_terminal()
-                                    exibir_titulo_centralizado("CONSULTA - PACIENTE POR ID", 60)
-                                    print(tabela_preview)
+                                    navegar_paginas_pacientes(conn, CAMPOS_PREVIEW, "CONSULTA - PACIENTE POR ID", _preview=True)
 
                                     resp = obter_sim_nao("Deseja pesquisar consulta por ID? (S/N): ", "Erro. Digite S ou N.")
                                     if resp:
@@ -305,22 +334,12 @@ while conectado:
                             limpar_terminal()
                             exibir_titulo_centralizado("PESQUISA DE TEXTO - PACIENTES", 60)
 
-                            sucesso_select, resultados_preview = select_paciente(
-                                conn, "ID_PACIENTE, NM_COMPLETO, TIPO_CONSULTA, STATUS_CONSULTA"
-                            )
-
-                            if sucesso_select:
-                                sucesso_preview, tabela_preview = imprimir_resultado_tabulate_oracle(resultados_preview)
-                            else:
-                                sucesso_preview = False
-                                tabela_preview = f"Erro ao consultar pacientes: {resultados_preview}"
+                            sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
 
                             if sucesso_preview:
                                 resp = True
                                 while resp:
-                                    limpar_terminal()
-                                    exibir_titulo_centralizado("PESQUISA DE TEXTO - PACIENTES", 60)
-                                    print(tabela_preview)
+                                    navegar_paginas_pacientes(conn, CAMPOS_PREVIEW, "PESQUISA DE TEXTO - PACIENTES", _preview=True)
 
                                     resp = obter_sim_nao("Deseja pesquisar paciente por texto? (S/N): ", "Erro. Digite S ou N.")
                                     print("")
@@ -355,6 +374,16 @@ Escolha: """,
 
                                         texto_pesquisa = obter_texto("\nDigite o texto a ser pesquisado: ", "Entrada inválida!")
 
+                                        print()
+                                        modo_pesquisa = obter_opcao_dict(
+"""Tipo de pesquisa:
+1 - Contém o texto
+2 - Começa com o texto
+Escolha: """,
+                                            "Opção inválida!",
+                                            {1: "contem", 2: "prefixo"}
+                                        )
+
                                         limpar_terminal()
                                         exibir_titulo_centralizado("PESQUISA DE TEXTO - PACIENTES", 60)
                                         texto_colunas, lista_colunas = obter_multiplas_opcoes_dict(
@@ -363,7 +392,7 @@ Escolha: """,
                                             campos_dict
                                         )
 
-                                        resultados = buscar_paciente_por_texto(conn, campo_busca, texto_pesquisa, texto_colunas)
+                                        resultados = buscar_paciente_por_texto(conn, campo_busca, texto_pesquisa, texto_colunas, modo_pesquisa)
 
                                         if not resultados:
                                             limpar_terminal()
@@ -414,22 +443,12 @@ Escolha: """,
                             limpar_terminal()
                             exibir_titulo_centralizado("PESQUISA NUMÉRICA - PACIENTES", 60)
 
-                            sucesso_select, resultados_preview = select_paciente(
-                                conn, "ID_PACIENTE, NM_COMPLETO, TIPO_CONSULTA, STATUS_CONSULTA"
-                            )
-
-                            if sucesso_select:
-                                sucesso_preview, tabela_preview = imprimir_resultado_tabulate_oracle(resultados_preview)
-                            else:
-                                sucesso_preview = False
-                                tabela_preview = f"Erro ao consultar pacientes: {resultados_preview}"
+                            sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
 
                             if sucesso_preview:
                                 resp = True
                                 while resp:
-                                    limpar_terminal()
-                                    exibir_titulo_centralizado("PESQUISA NUMÉRICA - PACIENTES", 60)
-                                    print(tabela_preview)
+                                    navegar_paginas_pacientes(conn, CAMPOS_PREVIEW, "PESQUISA NUMÉRICA - PACIENTES", _preview=True)
 
                                     resp = obter_sim_nao("Deseja pesquisar paciente por valor numérico? (S/N): ", "Erro. Digite S ou N.")
                                     if not resp:
@@ -524,28 +543,170 @@ Escolha: """,
                                 print(f"\nNão foi possível exibir o preview dos pacientes.\n{tabela_preview}")
                                 input("\nAperte ENTER para voltar ao menu principal...")
 
-        case 3: 
-            sucesso_select, resultados_preview = select_paciente(
-                conn, "ID_PACIENTE, NM_COMPLETO, TIPO_CONSULTA, STATUS_CONSULTA"
-            )
+                        case 5:  # PESQUISA APROXIMADA POR NOME
+                            limpar_terminal()
+                            exibir_titulo_centralizado("PESQUISA APROXIMADA POR NOME", 60)
 
-            if sucesso_select:
-                sucesso_preview, tabela_preview = imprimir_resultado_tabulate_oracle(resultados_preview)
-            else:
-                sucesso_preview = False
-                tabela_preview = f"Erro ao consultar pacientes: {resultados_preview}"
+                            sucesso_indice = True
+                            if not INDICE_FUZZY["construido"]:
+                                print("Carregando os nomes dos pacientes...")
+                                sucesso_indice, erro_indice = construir_indice_fuzzy(conn)
+
+                            if not sucesso_indice:
+                                print(f"\nErro ao carregar os nomes dos pacientes: {erro_indice}")
+                                input("\nAperte ENTER para voltar ao menu de consulta...")
+                                continue
+
+                            resp = True
+                            while resp:
+                                nome_pesquisa = obter_texto("\nDigite o nome (ou parte dele): ", "Entrada inválida!")
+                                resultados = buscar_paciente_fuzzy(nome_pesquisa)
+
+                                limpar_terminal()
+                                exibir_titulo_centralizado("PESQUISA APROXIMADA POR NOME", 60)
+
+                                if not resultados:
+                                    print(f"\nNenhum paciente parecido com '{nome_pesquisa}'.")
+                                else:
+                                    sucesso, tabela = imprimir_resultado_tabulate_oracle(resultados)
+                                    print(tabela)
+
+                                resp = obter_sim_nao("\nDeseja pesquisar outro nome? (S/N): ", "Erro. Digite S ou N.")
+
+                        case 6:  # PESQUISA COMBINADA
+                            resp = True
+                            while resp:
+                                limpar_terminal()
+                                exibir_titulo_centralizado("PESQUISA COMBINADA - PACIENTES", 60)
+                                filtros = solicitar_filtros_pesquisa()
+                                if not filtros:
+                                    # Sem filtro a consulta traria a tabela inteira de uma vez
+                                    print("\nNenhum filtro informado. Informe pelo menos um filtro para pesquisar.")
+                                    resp = obter_sim_nao("\nDeseja fazer outra pesquisa combinada? (S/N): ", "Erro. Digite S ou N.")
+                                    continue
+
+                                limpar_terminal()
+                                exibir_titulo_centralizado("PESQUISA COMBINADA - PACIENTES", 60)
+                                texto_colunas, lista_colunas = obter_multiplas_opcoes_dict(
+                                    campos_msg,
+                                    "Erro! Escolha os campos separando os números por ',' .",
+                                    campos_dict
+                                )
+
+                                resultados = buscar_paciente_composto(conn, filtros, texto_colunas)
+
+                                limpar_terminal()
+                                if not resultados:
+                                    print("\nNenhum paciente encontrado com os filtros informados.")
+                                else:
+                                    sucesso, tabela = imprimir_resultado_tabulate_oracle(resultados)
+                                    exibir_titulo_centralizado(f"RESULTADOS - {len(filtros)} FILTRO(S)", 60)
+                                    print(tabela)
+
+                                    if sucesso:
+                                        deseja_exportar = obter_sim_nao(
+                                            "\nDeseja exportar o resultado desta pesquisa para um arquivo JSON? (S/N): ",
+                                            "Entrada inválida! Digite 'S' para Sim ou 'N' para Não."
+                                        )
+
+                                        if deseja_exportar:
+                                            nome_arquivo = input(
+                                                "\nDigite o nome do arquivo (ex: pesquisa_combinada.json): "
+                                            ).strip()
+
+                                            if not nome_arquivo:
+                                                nome_arquivo = "pesquisa_combinada.json"
+                                            elif not nome_arquivo.lower().endswith(".json"):
+                                                nome_arquivo += ".json"
+
+                                            sucesso_export, erro_export = exportar_para_json(resultados, nome_arquivo)
+                                            if sucesso_export:
+                                                print(f"\nPesquisa exportada com sucesso para '{nome_arquivo}'!")
+                                            else:
+                                                print(f"\nErro ao exportar para JSON: {erro_export}")
+
+                                resp = obter_sim_nao("\nDeseja fazer outra pesquisa combinada? (S/N): ", "Erro. Digite S ou N.")
+
+        case 3: 
+            sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
 
             if sucesso_preview:
                 resp = True
                 while resp:
-                    limpar_terminal()
-                    exibir_titulo_centralizado("ATUALIZAR REGISTROS", 60)
-                    print(tabela_preview)
+                    navegar_paginas_pacientes(conn, CAMPOS_PREVIEW, "ATUALIZAR REGISTROS", _preview=True)
 
                     resp = obter_sim_nao("Deseja atualizar algum paciente? (S/N): ", "Erro. Digite S ou N.")
                     if not resp:
                         break
 
+                    print()
+                    modo_atualizacao = obter_opcao_dict(
+"""Como deseja atualizar?
+1 - Um paciente (pelo ID)
+2 - Vários pacientes de uma vez (lista de IDs ou filtros)
+Escolha: """,
+                        "Opção inválida!",
+                        {1: "um", 2: "lote"}
+                    )
+
+                    if modo_atualizacao == "lote":
+                        limpar_terminal()
+                        exibir_titulo_centralizado("ATUALIZAÇÃO EM LOTE", 60)
+
+                        selecao = obter_opcao_dict(
+"""Quais pacientes serão atualizados?
+1 - Lista de IDs (ex: 1, 5, 10-20)
+2 - Pacientes que atendem a filtros
+Escolha: """,
+                            "Opção inválida!",
+                            {1: "ids", 2: "filtros"}
+                        )
+
+                        ids_lote = None
+                        filtros_lote = None
+                        if selecao == "ids":
+                            ids_lote = obter_lista_ids("\nIDs dos pacientes: ", "Entrada inválida! Separe os IDs por ',' e as faixas por '-'.")
+                            descricao_lote = f"{len(ids_lote)} ID(s) informado(s)"
+                        else:
+                            filtros_lote = solicitar_filtros_pesquisa()
+                            if not filtros_lote:
+                                print("\nNenhum filtro informado. Atualização cancelada.")
+                                input("\nAperte ENTER para continuar...")
+                                continue
+                            descricao_lote = f"pacientes que atendem a {len(filtros_lote)} filtro(s)"
+
+                        limpar_terminal()
+                        exibir_titulo_centralizado("ATUALIZAÇÃO EM LOTE", 60)
+                        valores_lote = solicitar_valores_atualizacao()
+
+                        limpar_terminal()
+                        exibir_titulo_centralizado("ATUALIZAÇÃO EM LOTE", 60)
+                        print(f"\nPacientes: {descricao_lote}")
+                        for coluna, valor in valores_lote.items():
+                            print(f"  {coluna} = {valor}")
+
+                        confirmar = obter_sim_nao("\nConfirma a atualização? (S/N): ", "Erro. Digite S ou N.")
+                        if confirmar:
+                            sucesso_update, resultado = atualizar_pacientes_em_lote(conn, valores_lote, ids_lote, filtros_lote)
+
+                            limpar_terminal()
+                            if sucesso_update:
+                                print(f"\n{resultado['atualizados']} paciente(s) atualizado(s) com sucesso!")
+                                if resultado["nao_encontrados"]:
+                                    print(f"IDs não encontrados: {', '.join(str(i) for i in resultado['nao_encontrados'])}")
+                                sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
+                            else:
+                                print(f"\nErro na atualização em lote: {resultado['erro']}")
+                                if resultado["atualizados"]:
+                                    # Os lotes confirmados antes do erro continuam gravados
+                                    print(f"{resultado['atualizados']} paciente(s) já tinham sido atualizados antes do erro.")
+                                sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
+                        else:
+                            print("\nAtualização cancelada.")
+
+                        input("\nAperte ENTER para continuar...")
+                        continue
+
                     _id_paciente = obter_int("\nDigite o ID do paciente que deseja atualizar: ", "ID inválido. Digite um número inteiro.")
 
                     sucesso, resultados = select_paciente_por_id(conn, "*", _id_paciente)
@@ -607,6 +768,7 @@ Escolha: """,
                     if sucesso_update:
                         limpar_terminal()
                         print(f"\nCampo '{campo}' atualizado com sucesso!")
+                        sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
                     else:
                         limpar_terminal()
                         print(f"\nErro ao atualizar o campo '{campo}': {erro}")
@@ -621,25 +783,62 @@ Escolha: """,
             limpar_terminal()
             exibir_titulo_centralizado("REMOVER REGISTRO", 60)
 
-            sucesso_select, resultados_preview = select_paciente(
-                conn, "ID_PACIENTE, NM_COMPLETO, TIPO_CONSULTA, STATUS_CONSULTA"
-            )
-
-            if sucesso_select:
-                sucesso_preview, tabela_preview = imprimir_resultado_tabulate_oracle(resultados_preview)
-            else:
-                sucesso_preview = False
-                tabela_preview = f"Erro ao consultar pacientes: {resultados_preview}"
+            sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
 
             if sucesso_preview:
                 resp = True
                 while resp:
-                    limpar_terminal()
-                    exibir_titulo_centralizado("REMOVER REGISTRO", 60)
-                    print(tabela_preview)
+                    navegar_paginas_pacientes(conn, CAMPOS_PREVIEW, "REMOVER REGISTRO", _preview=True)
 
-                    resp = obter_sim_nao("Deseja remover algum paciente por ID? (S/N): ", "Erro. Digite S ou N.")
+                    resp = obter_sim_nao("Deseja remover algum paciente? (S/N): ", "Erro. Digite S ou N.")
                     if resp:
+                        print()
+                        modo_remocao = obter_opcao_dict(
+"""Como deseja remover?
+1 - Um paciente (pelo ID)
+2 - Lista de IDs (ex: 1, 5, 10-20)
+3 - Pacientes que atendem a filtros
+Escolha: """,
+                            "Opção inválida!",
+                            {1: "um", 2: "ids", 3: "filtros"}
+                        )
+
+                        if modo_remocao != "um":
+                            ids_remocao = None
+                            filtros_remocao = None
+                            if modo_remocao == "ids":
+                                ids_remocao = obter_lista_ids("\nIDs dos pacientes: ", "Entrada inválida! Separe os IDs por ',' e as faixas por '-'.")
+                                mensagem_confirmacao = f"\nTem certeza que deseja remover até {len(ids_remocao)} paciente(s) da lista? (S/N): "
+                            else:
+                                filtros_remocao = solicitar_filtros_pesquisa()
+                                sucesso_contagem, quantidade = contar_pacientes(conn, filtros_remocao) if filtros_remocao else (False, "nenhum filtro informado")
+                                if not sucesso_contagem:
+                                    print(f"\nRemoção cancelada: {quantidade}")
+                                    input("\nAperte ENTER para continuar...")
+                                    continue
+                                mensagem_confirmacao = f"\n{quantidade} paciente(s) atendem aos filtros. Tem certeza que deseja removê-los? (S/N): "
+
+                            confirmar = obter_sim_nao(mensagem_confirmacao, "Erro. Digite S ou N.")
+                            if confirmar:
+                                print()
+                                sucesso, resultado = excluir_pacientes_em_lote(conn, ids_remocao, filtros_remocao, _progresso=exibir_progresso_exclusao)
+                                if sucesso:
+                                    print(f"\n\n{resultado['removidos']} paciente(s) removido(s) com sucesso!")
+                                    if resultado["nao_encontrados"]:
+                                        print(f"IDs não encontrados: {', '.join(str(i) for i in resultado['nao_encontrados'])}")
+                                    sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
+                                else:
+                                    print(f"\n\nErro ao remover pacientes: {resultado['erro']}")
+                                    if resultado["removidos"]:
+                                        # Os lotes confirmados antes do erro continuam apagados
+                                        print(f"{resultado['removidos']} paciente(s) já tinham sido removidos antes do erro.")
+                                    sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
+                            else:
+                                print("\nOperação cancelada pelo usuário.")
+
+                            input("\nAperte ENTER para continuar...")
+                            continue
+
                         _id_paciente = obter_int("\nDigite o ID do paciente a ser removido: ", "ID inválido. Digite um número inteiro.")
 
                         confirmar = obter_sim_nao(f"\nTem certeza que deseja remover o paciente ID {_id_paciente}? (S/N): ", "Erro. Digite S ou N.")
@@ -647,6 +846,7 @@ Escolha: """,
                             sucesso, erro = deletar_paciente(conn, _id_paciente)
                             if sucesso:
                                 print(f"\nPaciente ID {_id_paciente} removido com sucesso!")
+                                sucesso_preview, tabela_preview = montar_preview_pacientes(conn)
                             else:
                                 print(f"\nErro ao remover paciente: {erro}")
 
@@ -662,31 +862,127 @@ Escolha: """,
             limpar_terminal()
             exibir_titulo_centralizado("LIMPAR TODOS OS REGISTROS", 60)
 
-            confirmar = obter_sim_nao("Tem certeza que deseja apagar TODOS os registros de pacientes? (S/N): ", "Erro. Digite S ou N.")
+            modo_limpeza = obter_opcao_dict(
+"""Como deseja apagar os registros?
+1 - Em lotes (commit a cada 10.000 pacientes, com progresso; registra cada exclusão)
+2 - Rápido (TRUNCATE: apaga tudo de uma vez e NÃO pode ser desfeito)
+0 - Voltar
+Escolha: """,
+                "Opção inválida!",
+                {1: "lotes", 2: "truncate", 0: None}
+            )
+
+            if modo_limpeza == "lotes":
+                confirmar = obter_sim_nao("\nTem certeza que deseja apagar TODOS os registros de pacientes em lotes? (S/N): ", "Erro. Digite S ou N.")
+            elif modo_limpeza == "truncate":
+                print("\nATENÇÃO: o modo rápido esvazia a tabela imediatamente, sem possibilidade de desfazer.")
+                confirmar = input("Para confirmar, digite APAGAR TUDO: ").strip().upper() == "APAGAR TUDO"
+            else:
+                confirmar = False
+
             if confirmar:
-                sucesso, erro = limpar_todos_pacientes(conn)
+                print()
+                sucesso, resultado = limpar_todos_pacientes(conn, modo_limpeza, _progresso=exibir_progresso_exclusao)
                 if sucesso:
-                    print("\nTodos os registros de pacientes foram apagados com sucesso!")
+                    print(f"\n\nTodos os registros de pacientes foram apagados com sucesso! ({resultado} paciente(s))")
                 else:
-                    print(f"\nErro ao apagar registros: {erro}")
+                    print(f"\n\nErro ao apagar registros: {resultado['erro']}")
+                    if resultado["removidos"]:
+                        print(f"{resultado['removidos']} paciente(s) já tinham sido apagados antes do erro.")
             else:
                 print("\nOperação cancelada pelo usuário.")
 
             input("\nAperte ENTER para voltar ao menu principal...")
-        case 6:  # EXPORTAÇÃO PARA JSON
+        case 6:  # EXPORTAÇÃO DE PACIENTES
+            # Carregado só aqui: o módulo de exportação (e o pyarrow) não pesa no início do programa
+            from exportacao_pacientes import (
+                exportar_pacientes_stream, exportar_pacientes_csv, exportar_pacientes_colunar,
+                exportar_pacientes_paralelo, exportar_pacientes_delta,
+                ler_marca_dagua_exportacao, limpar_exclusoes_exportadas
+            )
+
             limpar_terminal()
-            exibir_titulo_centralizado("EXPORTAÇÃO PARA JSON", 60)
+            exibir_titulo_centralizado("EXPORTAÇÃO DE PACIENTES", 60)
+
+            formato = obter_opcao_dict("""Formato do arquivo:
+1 - JSON (lista de pacientes)
+2 - NDJSON (um paciente por linha)
+3 - CSV
+4 - PARQUET (colunar, mantém os tipos)
+5 - ARROW IPC (colunar, mantém os tipos)
+6 - DELTA NDJSON (só o que mudou desde a última exportação delta)
+Escolha: """, "Opção inválida!", {1: "json", 2: "ndjson", 3: "csv", 4: "parquet", 5: "arrow", 6: "delta"})
+
+            if formato == "delta":
+                marca = ler_marca_dagua_exportacao()
+                if marca is None:
+                    print("\nNenhuma exportação delta anterior: todos os pacientes serão exportados.")
+                else:
+                    print(f"\nÚltima exportação delta: {marca['marca_dagua']:%d/%m/%Y %H:%M:%S}")
+
+                compactar = obter_sim_nao("\nCompactar o arquivo com gzip? (S/N): ", "Erro. Digite S ou N.")
+                sucesso, resultado = exportar_pacientes_delta(conn, _compactar=compactar)
+
+                if sucesso:
+                    print(f"\nExportação delta ({resultado['tipo']}) salva em '{resultado['arquivo']}': "
+                          f"{resultado['atualizados']} paciente(s) novo(s)/alterado(s) e {resultado['excluidos']} exclusão(ões).")
+                    sucesso_limpeza, apagados = limpar_exclusoes_exportadas(conn)
+                    if not sucesso_limpeza:
+                        print(f"Aviso: não foi possível limpar o registro de exclusões: {apagados}")
+                else:
+                    print(f"\nErro na exportação delta: {resultado}")
+
+                input("\nAperte ENTER para voltar ao menu principal...")
+                continue
+
+            compactar = False
+            if formato in ("json", "ndjson", "csv"):
+                compactar = obter_sim_nao("\nCompactar o arquivo com gzip? (S/N): ", "Erro. Digite S ou N.")
+
+            paralelo = obter_sim_nao("\nExportar em paralelo, dividindo a tabela por faixas de ID? (S/N): ", "Erro. Digite S ou N.")
+            if paralelo:
+                trabalhadores = obter_int_intervalado("\nQuantidade de trabalhadores (1 a 4): ", "Entrada inválida.", 1, 4)
+                unir = obter_sim_nao("\nUnir as partes em um único arquivo ao final? (S/N): ", "Erro. Digite S ou N.")
+
+                diretorio = input("\nDigite o nome da pasta de exportação (padrão: exportacao_pacientes): ").strip()
+                if not diretorio:
+                    diretorio = "exportacao_pacientes"
+
+                sucesso, resultado = exportar_pacientes_paralelo(conn, diretorio, formato, "*", trabalhadores,
+                                                                 _compactar=compactar, _unir=unir)
+
+                if sucesso:
+                    print(f"\nExportação concluída em {resultado['segundos']}s! "
+                          f"{resultado['total_linhas']} paciente(s) em {len(resultado['shards'])} parte(s) na pasta '{diretorio}'.")
+                    print(f"Manifesto salvo em '{os.path.join(diretorio, 'manifesto.json')}'.")
+                    if unir:
+                        print(f"Arquivo único: '{resultado['arquivo_unido']}'.")
+                else:
+                    print(f"\nErro ao exportar pacientes: {resultado}")
+
+                input("\nAperte ENTER para voltar ao menu principal...")
+                continue
 
             # Perguntar ao usuário o nome do arquivo (opcional)
-            nome_arquivo = input("Digite o nome do arquivo para exportação (padrão: pacientes.json): ").strip()
+            extensao = f".{formato}.gz" if compactar else f".{formato}"
+            nome_arquivo = input(f"\nDigite o nome do arquivo para exportação (padrão: pacientes{extensao}): ").strip()
             if not nome_arquivo:
-                nome_arquivo = "pacientes.json"
+                nome_arquivo = f"pacientes{extensao}"
+            elif not nome_arquivo.lower().endswith(extensao):
+                nome_arquivo = nome_arquivo.removesuffix(f".{formato}") + extensao
 
-            sucesso, erro = exportar_para_json(conn, nome_arquivo)
+            if formato == "csv":
+                sucesso, resultado = exportar_pacientes_csv(conn, nome_arquivo, "*", _compactar=compactar)
+                if sucesso:
+                    resultado = resultado["linhas"]
+            elif formato in ("parquet", "arrow"):
+                sucesso, resultado = exportar_pacientes_colunar(conn, nome_arquivo, "*", formato)
+            else:
+                sucesso, resultado = exportar_pacientes_stream(conn, nome_arquivo, "*", formato, compactar)
 
             if sucesso:
-                print(f"\nExportação concluída com sucesso! Arquivo salvo como '{nome_arquivo}'.")
+                print(f"\nExportação concluída com sucesso! {resultado} paciente(s) salvos em '{nome_arquivo}'.")
             else:
-                print(f"\nErro ao exportar para JSON: {erro}")
+                print(f"\nErro ao exportar pacientes: {resultado}")
 
             input("\nAperte ENTER para voltar ao menu principal...")
\ No newline at end of file
@@ -0,0 +1,437 @@
+# ==========================================================
+#   REPOSITÓRIO DE PACIENTES (INSTRUÇÕES PREPARADAS)
+# ==========================================================
+# PacienteRepository concentra o acesso a T_PACIENTE em um conjunto fixo de comandos SQL:
+#   - as colunas pedidas são validadas e reordenadas na ordem da tabela, então a mesma projeção
+#     sempre gera o mesmo texto SQL (o Oracle faz só soft parse a partir da segunda execução);
+#   - cada comando tem o seu cursor, preparado uma vez e reaproveitado nas execuções seguintes;
+#   - o cache de instruções do cliente (stmtcachesize) é configurado na sessão do repositório;
+#   - estatisticas() informa quantos comandos foram preparados e executados
+#     (e, no Oracle, os contadores de parse/execute da sessão, quando o usuário pode ler V$MYSTAT).
+#
+# Uso:
+#   with PacienteRepository(pool) as repositorio:
+#       sucesso, pacientes = repositorio.buscar_por_numero("ID_PACIENTE", ">=", 10, "NM_COMPLETO, CIDADE")
+#       print(repositorio.estatisticas())
+#
+# Um repositório usa uma única sessão: crie um por thread.
+
+from __future__ import annotations
+
+# --- Bibliotecas padrão ---
+from collections import OrderedDict
+
+# --- Módulo do cadastro ---
+from cadastro_paciente import (
+    oracledb,
+    COLUNAS_T_PACIENTE,
+    COLUNAS_NUMERICAS,
+    OPERADORES_COMPARACAO,
+    CAMPOS_BUSCA_TEXTUAL,
+    CAMPOS_TRIGRAMA,
+    CAMPOS_PREVIEW,
+    COMANDO_INSERT_PACIENTE,
+    CHAVES_DADOS_PACIENTE,
+    TAMANHO_PAGINA_PADRAO,
+    adquirir_conexao,
+    liberar_conexao,
+    montar_update_pacientes,
+    montar_busca_texto,
+    normalizar_texto,
+    gerar_trigramas,
+    trigramas_disponiveis,
+    invalidar_cache_preview,
+    atualizar_indice_fuzzy,
+    remover_do_indice_fuzzy,
+    _dialeto,
+    _sql_limite,
+    _linhas_trigrama,
+    _tamanho_lista_in,
+    _preparar_cursor_streaming,
+    _aplicar_fabrica_dict,
+)
+
+# Projeções com nome, além de '*' e de listas de colunas avulsas
+PROJECOES_PACIENTE = {
+    "completa": COLUNAS_T_PACIENTE,
+    "preview": [c.strip() for c in CAMPOS_PREVIEW.split(",")],
+    "contato": ["ID_PACIENTE", "NM_COMPLETO", "CELULAR", "EMAIL"],
+    "consulta": ["ID_PACIENTE", "NM_COMPLETO", "DT_HORA_CONSULTA", "TIPO_CONSULTA", "ESPECIALIDADE", "STATUS_CONSULTA"],
+}
+
+# Contadores de sessão do Oracle (exigem permissão de leitura em V$MYSTAT e V$STATNAME)
+COMANDO_ESTATISTICAS_SESSAO = """
+    SELECT n.NAME, s.VALUE
+    FROM V$MYSTAT s
+    JOIN V$STATNAME n ON n.STATISTIC# = s.STATISTIC#
+    WHERE n.NAME IN ('parse count (total)', 'parse count (hard)', 'execute count', 'session cursor cache hits')
+"""
+
+
+def normalizar_projecao(_colunas) -> tuple[str, ...]:
+    """
+    Converte a projeção pedida ('*', nome de PROJECOES_PACIENTE, texto 'A, B' ou lista) em uma tupla de colunas
+    validadas contra COLUNAS_T_PACIENTE, sem repetição e na ordem da tabela.
+    Colunas inválidas geram ValueError.
+    """
+    if isinstance(_colunas, str):
+        texto = _colunas.strip()
+        if texto == "*":
+            return tuple(COLUNAS_T_PACIENTE)
+        if texto.lower() in PROJECOES_PACIENTE:
+            return tuple(PROJECOES_PACIENTE[texto.lower()])
+        _colunas = texto.split(",")
+
+    pedidas = set()
+    for coluna in _colunas:
+        coluna = coluna.strip().upper()
+        if coluna not in COLUNAS_T_PACIENTE:
+            raise ValueError(f"Coluna inválida: {coluna}")
+        pedidas.add(coluna)
+
+    if not pedidas:
+        raise ValueError("Nenhuma coluna selecionada.")
+
+    return tuple(c for c in COLUNAS_T_PACIENTE if c in pedidas)
+
+
+class PacienteRepository:
+    """
+    Acesso a T_PACIENTE por comandos fixos e validados, com cursores reaproveitados.
+    Aceita uma conexão (Oracle ou SQLite) ou um pool; com pool, empresta uma sessão até fechar().
+    Os métodos seguem o contrato das funções de cadastro_paciente: retornam (True, resultado) ou (False, erro),
+    e os registros vêm como dicionários com as chaves em maiúsculas, na ordem das colunas pedidas.
+    """
+
+    def __init__(self, _origem, _tamanho_cache_sql: int = 50, _max_cursores: int = 20):
+        self._pool = None
+        if _dialeto(_origem) == "oracle" and isinstance(_origem, oracledb.ConnectionPool):
+            self._pool = _origem
+            self._conexao = adquirir_conexao(_origem)
+        else:
+            self._conexao = _origem
+
+        self._dialeto = _dialeto(self._conexao)
+        if self._dialeto == "oracle":
+            # O cache de instruções do cliente guarda os comandos preparados mesmo depois que o cursor fecha
+            self._conexao.stmtcachesize = max(self._conexao.stmtcachesize, _tamanho_cache_sql)
+
+        self._max_cursores = _max_cursores
+        self._cursores = OrderedDict()   # chave do comando -> cursor preparado (o mais antigo é fechado primeiro)
+        self._comandos = {}              # chave do comando -> texto SQL (cada texto é montado uma única vez)
+        self._contadores = {"preparos": 0, "execucoes": 0, "cursores_reaproveitados": 0, "cursores_fechados": 0}
+
+    # ========= CICLO DE VIDA =========
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _tipo, _erro, _rastreamento):
+        self.fechar()
+
+    def fechar(self) -> None:
+        """Fecha os cursores preparados e devolve a sessão ao pool (se veio de um)."""
+        for cur in self._cursores.values():
+            try:
+                cur.close()
+            except Exception:
+                pass
+        self._cursores.clear()
+
+        if self._pool is not None and self._conexao is not None:
+            liberar_conexao(self._pool, self._conexao)
+            self._conexao = None
+
+    # ========= COMANDOS PREPARADOS =========
+    def _comando(self, _chave: tuple, _montar) -> str:
+        """Texto SQL da chave; é montado (pela função _montar) só na primeira vez."""
+        comando_sql = self._comandos.get(_chave)
+        if comando_sql is None:
+            comando_sql = _montar()
+            self._comandos[_chave] = comando_sql
+        return comando_sql
+
+    def _cursor(self, _chave: tuple, _montar, _colunas: tuple = None, _linhas_por_busca: int = 1000):
+        """Cursor já preparado para o comando da chave. Na primeira vez o cursor é criado, preparado
+        (prepare no Oracle) e configurado; nas seguintes é o mesmo objeto, sem novo parse."""
+        cur = self._cursores.get(_chave)
+        if cur is not None:
+            self._cursores.move_to_end(_chave)
+            self._contadores["cursores_reaproveitados"] += 1
+            return cur
+
+        comando_sql = self._comando(_chave, _montar)
+        cur = self._conexao.cursor()
+        if self._dialeto == "oracle":
+            cur.prepare(comando_sql)
+        if _colunas is not None:
+            _preparar_cursor_streaming(cur, _linhas_por_busca, _linhas_por_busca)
+        self._contadores["preparos"] += 1
+
+        self._cursores[_chave] = cur
+        if len(self._cursores) > self._max_cursores:
+            _, mais_antigo = self._cursores.popitem(last=False)
+            mais_antigo.close()
+            self._contadores["cursores_fechados"] += 1
+
+        return cur
+
+    def _executar(self, _chave: tuple, _montar, _parametros, _colunas: tuple = None,
+                  _linhas_por_busca: int = 1000, _varias_linhas: bool = False):
+        """Executa o comando da chave no seu cursor. No Oracle, execute(None) reaproveita o comando preparado;
+        no SQLite o texto é sempre o mesmo e cai no cache de instruções do próprio sqlite3."""
+        cur = self._cursor(_chave, _montar, _colunas, _linhas_por_busca)
+        comando_sql = None if self._dialeto == "oracle" else self._comandos[_chave]
+
+        if _varias_linhas:
+            cur.executemany(comando_sql, _parametros)
+        else:
+            cur.execute(comando_sql, _parametros)
+        self._contadores["execucoes"] += 1
+
+        # O oracledb descarta a fábrica de linhas a cada execução: ela é aplicada de novo antes do fetch
+        if _colunas is not None:
+            _aplicar_fabrica_dict(cur, list(_colunas))
+        return cur
+
+    @staticmethod
+    def _ordenar(_linhas: list[dict], _pedidas: list[str]) -> list[dict]:
+        """Devolve as linhas com as chaves na ordem em que as colunas foram pedidas."""
+        return [{c: linha[c] for c in _pedidas} for linha in _linhas]
+
+    def _pedidas(self, _colunas) -> tuple[tuple, list[str]]:
+        """(projeção normalizada para o SQL, colunas na ordem pedida para o resultado)."""
+        projecao = normalizar_projecao(_colunas)
+        if isinstance(_colunas, str) and (_colunas.strip() == "*" or _colunas.strip().lower() in PROJECOES_PACIENTE):
+            return projecao, list(projecao)
+
+        partes = _colunas.split(",") if isinstance(_colunas, str) else _colunas
+        return projecao, list(dict.fromkeys(c.strip().upper() for c in partes))
+
+    # ========= CONSULTAS =========
+    def buscar_por_id(self, _id_paciente: int, _colunas="*") -> tuple[bool, any]:
+        """Paciente pelo ID. Retorna (True, [registro]) ou (True, []) se não existir."""
+        try:
+            projecao, pedidas = self._pedidas(_colunas)
+            cur = self._executar(
+                ("por_id", projecao),
+                lambda: f"SELECT {', '.join(projecao)} FROM T_PACIENTE WHERE ID_PACIENTE = :id_paciente",
+                {"id_paciente": _id_paciente}, projecao, _linhas_por_busca=2
+            )
+            return (True, self._ordenar(cur.fetchall(), pedidas))
+
+        except Exception as e:
+            return (False, e)
+
+    def listar_pagina(self, _apos_id: int = 0, _colunas="preview", _tamanho_pagina: int = TAMANHO_PAGINA_PADRAO) -> tuple[bool, any]:
+        """Próxima página em ordem de ID (paginação por chave, depois de _apos_id). Retorna (True, [registros])."""
+        try:
+            projecao, pedidas = self._pedidas(_colunas)
+            cur = self._executar(
+                ("pagina", projecao),
+                lambda: (f"SELECT {', '.join(projecao)} FROM T_PACIENTE WHERE ID_PACIENTE > :chave "
+                         f"ORDER BY ID_PACIENTE {_sql_limite(self._conexao)}"),
+                {"chave": _apos_id, "tamanho": _tamanho_pagina}, projecao, _linhas_por_busca=_tamanho_pagina
+            )
+            return (True, self._ordenar(cur.fetchall(), pedidas))
+
+        except Exception as e:
+            return (False, e)
+
+    def buscar_por_numero(self, _campo: str, _operador: str, _valor: int, _colunas="*") -> tuple[bool, any]:
+        """Pacientes com _campo (numérico) comparado a _valor pelo operador. Retorna (True, [registros])."""
+        try:
+            campo = _campo.upper()
+            if campo not in COLUNAS_NUMERICAS:
+                raise ValueError(f"A coluna {campo} não é numérica.")
+            if _operador not in OPERADORES_COMPARACAO:
+                raise ValueError(f"Operador inválido: {_operador}")
+
+            projecao, pedidas = self._pedidas(_colunas)
+            cur = self._executar(
+                ("numero", campo, _operador, projecao),
+                lambda: f"SELECT {', '.join(projecao)} FROM T_PACIENTE WHERE {campo} {_operador} :valor ORDER BY ID_PACIENTE",
+                {"valor": _valor}, projecao
+            )
+            return (True, self._ordenar(cur.fetchall(), pedidas))
+
+        except Exception as e:
+            return (False, e)
+
+    def buscar_por_texto(self, _campo: str, _texto: str, _colunas="*", _modo: str = "contem") -> tuple[bool, any]:
+        """
+        Mesma busca de buscar_paciente_por_texto (sem acentos e sem diferenciar maiúsculas).
+        Na busca por trigramas a lista IN é completada até a próxima potência de 2,
+        para que textos de tamanhos diferentes reaproveitem poucos comandos.
+        """
+        try:
+            campo = _campo.upper()
+            if campo not in CAMPOS_BUSCA_TEXTUAL:
+                raise ValueError(f"Campo inválido para busca textual: {campo}")
+
+            texto = normalizar_texto(_texto.strip())
+            if not texto:
+                return (True, [])
+
+            if _modo not in ("contem", "prefixo"):
+                raise ValueError(f"Modo de pesquisa de texto inválido: {_modo}")
+
+            projecao, pedidas = self._pedidas(_colunas)
+            usar_trigramas = (_modo == "contem" and campo in CAMPOS_TRIGRAMA and len(texto) >= 3
+                              and trigramas_disponiveis(self._conexao))
+            binds_trigramas = _tamanho_lista_in(len(gerar_trigramas(texto))) if usar_trigramas else None
+
+            # Mesmo SQL de buscar_paciente_por_texto; cada chave é preparada uma vez e reaproveitada
+            comando_sql, parametros = montar_busca_texto(campo, texto, ", ".join(projecao), _modo, self._dialeto,
+                                                         usar_trigramas, binds_trigramas)
+            chave = ("texto", _modo, usar_trigramas, campo, binds_trigramas, projecao)
+            montar = lambda: comando_sql.rstrip() + "\n            ORDER BY ID_PACIENTE"
+
+            cur = self._executar(chave, montar, parametros, projecao)
+            return (True, self._ordenar(cur.fetchall(), pedidas))
+
+        except Exception as e:
+            return (False, e)
+
+    def contar(self) -> tuple[bool, any]:
+        """Retorna (True, total de pacientes) ou (False, erro)."""
+        try:
+            cur = self._executar(("contar",), lambda: "SELECT COUNT(*) FROM T_PACIENTE", {})
+            return (True, int(cur.fetchone()[0]))
+
+        except Exception as e:
+            return (False, e)
+
+    # ========= ALTERAÇÕES =========
+    def _reindexar_trigramas(self, _id_paciente: int, _valores: dict) -> None:
+        """Regrava os trigramas dos campos informados ({COLUNA: valor}) com os dois cursores fixos do índice."""
+        self._executar(
+            ("trigrama_excluir",),
+            lambda: "DELETE FROM T_PACIENTE_TRIGRAMA WHERE ID_PACIENTE = :id_paciente AND CAMPO = :campo",
+            [{"id_paciente": _id_paciente, "campo": campo} for campo in _valores], _varias_linhas=True
+        )
+
+        linhas = _linhas_trigrama(_id_paciente, _valores)
+        if linhas:
+            self._executar(
+                ("trigrama_inserir",),
+                lambda: "INSERT INTO T_PACIENTE_TRIGRAMA (CAMPO, TRIGRAMA, ID_PACIENTE) VALUES (:campo, :trigrama, :id_paciente)",
+                linhas, _varias_linhas=True
+            )
+
+    def inserir(self, _dados_paciente: dict) -> tuple[bool, any]:
+        """Insere um paciente (dicionário de solicitar_dados_paciente). Retorna (True, ID gerado) ou (False, erro)."""
+        try:
+            parametros = {chave: _dados_paciente.get(chave) for chave in CHAVES_DADOS_PACIENTE}
+
+            if self._dialeto == "sqlite":
+                cur = self._executar(("inserir",), lambda: COMANDO_INSERT_PACIENTE, parametros)
+                id_paciente = cur.lastrowid
+            else:
+                cur = self._cursor(("inserir",), lambda: COMANDO_INSERT_PACIENTE.rstrip() + " RETURNING ID_PACIENTE INTO :id_paciente")
+                id_var = cur.var(oracledb.DB_TYPE_NUMBER)
+                cur.execute(None, {**parametros, "id_paciente": id_var})
+                self._contadores["execucoes"] += 1
+                id_paciente = int(id_var.getvalue()[0])
+
+            if trigramas_disponiveis(self._conexao):
+                self._reindexar_trigramas(id_paciente, {campo: parametros[chave] for campo, chave in CAMPOS_TRIGRAMA.items()})
+
+            self._conexao.commit()
+
+            invalidar_cache_preview()
+            atualizar_indice_fuzzy(id_paciente, parametros["nome_completo"])
+
+            return (True, id_paciente)
+
+        except Exception as e:
+            self._conexao.rollback()
+            return (False, e)
+
+    def atualizar(self, _id_paciente: int, _valores: dict) -> tuple[bool, any]:
+        """
+        Atualiza uma ou várias colunas ({COLUNA: valor}, ver montar_update_pacientes) de um paciente.
+        Cada conjunto de colunas tem o seu comando fixo. Retorna (True, linhas alteradas) ou (False, erro).
+        """
+        try:
+            valores = {str(coluna).upper(): valor for coluna, valor in _valores.items()}
+            trecho_set, parametros = montar_update_pacientes(valores)
+
+            cur = self._executar(
+                ("atualizar", tuple(sorted(valores))),
+                lambda: f"UPDATE T_PACIENTE SET {trecho_set} WHERE ID_PACIENTE = :id_paciente",
+                {**parametros, "id_paciente": _id_paciente}
+            )
+            alteradas = cur.rowcount
+
+            valores_trigrama = {campo: valores[campo] for campo in CAMPOS_TRIGRAMA if campo in valores}
+            if alteradas and valores_trigrama and trigramas_disponiveis(self._conexao):
+                self._reindexar_trigramas(_id_paciente, valores_trigrama)
+
+            self._conexao.commit()
+
+            if alteradas:
+                invalidar_cache_preview()
+                if "NM_COMPLETO" in valores:
+                    atualizar_indice_fuzzy(_id_paciente, valores["NM_COMPLETO"])
+
+            return (True, alteradas)
+
+        except Exception as e:
+            self._conexao.rollback()
+            return (False, e)
+
+    def excluir(self, _id_paciente: int) -> tuple[bool, any]:
+        """Remove um paciente pelo ID. Retorna (True, linhas removidas) ou (False, erro)."""
+        try:
+            cur = self._executar(("excluir",), lambda: "DELETE FROM T_PACIENTE WHERE ID_PACIENTE = :id_paciente",
+                                 {"id_paciente": _id_paciente})
+            removidas = cur.rowcount
+            self._conexao.commit()
+
+            if removidas:
+                invalidar_cache_preview([_id_paciente], removidas)
+                remover_do_indice_fuzzy(_id_paciente)
+
+            return (True, removidas)
+
+        except Exception as e:
+            self._conexao.rollback()
+            return (False, e)
+
+    # ========= ESTATÍSTICAS =========
+    def _estatisticas_sessao(self) -> dict | None:
+        """Contadores de parse/execute da sessão Oracle, ou None (SQLite ou sem permissão em V$MYSTAT)."""
+        if self._dialeto != "oracle":
+            return None
+        try:
+            cur = self._conexao.cursor()
+            cur.execute(COMANDO_ESTATISTICAS_SESSAO)
+            valores = dict(cur.fetchall())
+            cur.close()
+        except Exception:
+            return None
+
+        return {
+            "parses": int(valores.get("parse count (total)", 0)),
+            "parses_hard": int(valores.get("parse count (hard)", 0)),
+            "execucoes": int(valores.get("execute count", 0)),
+            "acertos_cache_cursor": int(valores.get("session cursor cache hits", 0)),
+        }
+
+    def estatisticas(self) -> dict:
+        """
+        Contadores do repositório:
+          preparos                comandos preparados (um por cursor criado; o ideal é parar de crescer);
+          execucoes               execuções feitas pelos cursores preparados;
+          cursores_reaproveitados execuções que usaram um cursor já preparado;
+          comandos_distintos      textos SQL diferentes gerados até agora;
+          cursores_abertos / cursores_fechados (descartados pelo limite _max_cursores);
+          cache_sql               tamanho do cache de instruções da sessão (Oracle);
+          sessao                  parse count (total/hard) e execute count do Oracle, quando disponíveis.
+        """
+        estatisticas = dict(self._contadores)
+        estatisticas["comandos_distintos"] = len(self._comandos)
+        estatisticas["cursores_abertos"] = len(self._cursores)
+        estatisticas["cache_sql"] = self._conexao.stmtcachesize if self._dialeto == "oracle" else None
+        estatisticas["sessao"] = self._estatisticas_sessao()
+        return estatisticas
@@ -0,0 +1,459 @@
+# ==========================================================
+#   SERVIÇO HTTP DE PACIENTES (JSON)
+# ==========================================================
+# Expõe o CRUD de T_PACIENTE por HTTP/JSON, usando as mesmas funções do menu (cadastro_paciente.py)
+# sobre o pool de sessões Oracle ou, para testes locais, um conjunto de conexões SQLite.
+# Cada requisição roda em uma thread (ThreadingHTTPServer); listagens grandes e exportações
+# são enviadas em partes (Transfer-Encoding: chunked), lote a lote, direto do cursor.
+#
+# Endpoints:
+#   POST   /pacientes                  cadastra (corpo: dicionário de solicitar_dados_paciente)
+#   GET    /pacientes/<id>?campos=...  busca por ID
+#   GET    /pacientes?campo=NM_COMPLETO&texto=silva&modo=contem|prefixo   busca por texto
+#   GET    /pacientes?campo=NUMERO_ENDERECO&operador=>=&valor=100          busca numérica
+#   GET    /pacientes?apos_id=0&limite=20                                   página (keyset)
+#   GET    /pacientes                  lista todos (em partes)
+#   POST   /pacientes/busca            busca composta (corpo: {"filtros": [...], "campos": "..."})
+#   PATCH  /pacientes/<id>             atualiza (corpo: {"STATUS_CONSULTA": "Realizada", ...})
+#   DELETE /pacientes/<id>             remove
+#   GET    /pacientes/exportacao?formato=json|ndjson   exporta T_PACIENTE (em partes)
+# Os pacientes saem sempre com as colunas em minúsculas (ex: "nm_completo"), em qualquer endpoint.
+#
+# Uso (no terminal):
+#   python servico_pacientes.py --user rm000000 --password 123 --dsn host:1521/ORCL --porta 8080
+#   python servico_pacientes.py --sqlite pacientes_local.db --conexoes 8
+#
+# Usuário, senha e DSN também podem vir das variáveis ORACLE_USER, ORACLE_PASSWORD e ORACLE_DSN.
+
+import os
+import re
+import sys
+import json
+import queue
+import argparse
+from contextlib import contextmanager
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cadastro_paciente import (
+    CHAVES_DADOS_PACIENTE,
+    CAMPOS_BUSCA_TEXTUAL,
+    COLUNAS_NUMERICAS,
+    OPERADORES_COMPARACAO,
+    TAMANHO_PAGINA_PADRAO,
+    criar_pool_oracledb,
+    conectar_sqlite,
+    insert_paciente,
+    select_paciente_stream,
+    select_paciente_por_id,
+    select_paciente_pagina,
+    consultar_paciente_por_texto,
+    consultar_paciente_por_numero,
+    consultar_paciente_composto,
+    montar_condicoes_paciente,
+    colunas_do_campo,
+    atualizar_pacientes_em_lote,
+    deletar_paciente,
+    _validar_colunas_exibir,
+    _valor_json,
+)
+
+TAMANHO_LOTE_STREAM = 500
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+# Origem dos dados do serviço: pool Oracle (as funções emprestam uma sessão por chamada)
+# ou fila de conexões SQLite (uma conexão por requisição, devolvida ao final).
+ORIGEM_SERVICO = {
+    "pool": None,
+    "conexoes_sqlite": None
+}
+
+
+# ========= CONEXÕES DO SERVIÇO =========
+def configurar_origem_oracle(_user: str, _password: str, _dsn: str, _tamanho_pool: int) -> tuple[bool, any]:
+    """Cria o pool Oracle usado pelo serviço. Retorna (True, pool) ou (False, erro)."""
+    sucesso, pool = criar_pool_oracledb(_user, _password, _dsn, _min=1, _max=_tamanho_pool)
+    if sucesso:
+        ORIGEM_SERVICO["pool"] = pool
+    return (sucesso, pool)
+
+def configurar_origem_sqlite(_caminho: str, _quantidade: int) -> tuple[bool, any]:
+    """Abre _quantidade conexões SQLite para o mesmo arquivo (modo WAL: leituras em paralelo, uma escrita por vez).
+    Retorna (True, fila de conexões) ou (False, erro)."""
+    conexoes = queue.Queue()
+    for _ in range(_quantidade):
+        sucesso, conexao = conectar_sqlite(_caminho)
+        if not sucesso:
+            fechar_origem()
+            return (False, conexao)
+        conexoes.put(conexao)
+
+    ORIGEM_SERVICO["conexoes_sqlite"] = conexoes
+    return (True, conexoes)
+
+def fechar_origem() -> None:
+    """Fecha o pool Oracle ou as conexões SQLite do serviço."""
+    if ORIGEM_SERVICO["pool"] is not None:
+        ORIGEM_SERVICO["pool"].close()
+        ORIGEM_SERVICO["pool"] = None
+
+    conexoes = ORIGEM_SERVICO["conexoes_sqlite"]
+    if conexoes is not None:
+        while not conexoes.empty():
+            conexoes.get_nowait().close()
+        ORIGEM_SERVICO["conexoes_sqlite"] = None
+
+@contextmanager
+def origem_requisicao():
+    """Entrega a origem para as funções de CRUD durante uma requisição:
+    o pool Oracle, ou uma conexão SQLite emprestada da fila e devolvida ao final."""
+    conexoes = ORIGEM_SERVICO["conexoes_sqlite"]
+    if conexoes is None:
+        yield ORIGEM_SERVICO["pool"]
+        return
+
+    conexao = conexoes.get()
+    try:
+        yield conexao
+    finally:
+        conexoes.put(conexao)
+
+# ========= REGRAS DOS ENDPOINTS =========
+class ErroRequisicao(Exception):
+    """Erro com o status HTTP a devolver (parâmetros inválidos, paciente não encontrado...)."""
+
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+
+def _parametro(_consulta: dict, _nome: str, _padrao: str = None) -> str | None:
+    valores = _consulta.get(_nome)
+    return valores[0] if valores else _padrao
+
+def _inteiro(_texto, _nome: str) -> int:
+    try:
+        return int(_texto)
+    except (TypeError, ValueError):
+        raise ErroRequisicao(400, f"Parâmetro '{_nome}' deve ser um número inteiro.")
+
+def _campos_validos(_campos: str) -> str:
+    try:
+        return _validar_colunas_exibir(_campos)
+    except ValueError as e:
+        raise ErroRequisicao(400, str(e))
+
+def cadastrar_paciente(_dados: dict) -> dict:
+    """POST /pacientes. Chaves ausentes são gravadas como nulas; o nome é obrigatório."""
+    if not isinstance(_dados, dict) or not str(_dados.get("nome_completo") or "").strip():
+        raise ErroRequisicao(400, "Informe ao menos 'nome_completo'.")
+
+    desconhecidas = set(_dados) - set(CHAVES_DADOS_PACIENTE)
+    if desconhecidas:
+        raise ErroRequisicao(400, f"Chaves desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+    dados_paciente = {chave: _dados.get(chave) for chave in CHAVES_DADOS_PACIENTE}
+    with origem_requisicao() as origem:
+        sucesso, erro = insert_paciente(origem, dados_paciente)
+
+    if not sucesso:
+        raise ErroRequisicao(400, f"Erro ao cadastrar paciente: {erro}")
+    return {"cadastrado": True}
+
+def obter_paciente(_id_paciente: int, _consulta: dict) -> dict:
+    """GET /pacientes/<id>."""
+    campos = _campos_validos(_parametro(_consulta, "campos", "*"))
+    with origem_requisicao() as origem:
+        sucesso, resultado = select_paciente_por_id(origem, campos, _id_paciente)
+
+    if not sucesso:
+        raise ErroRequisicao(500, f"Erro ao buscar paciente: {resultado}")
+    if not resultado:
+        raise ErroRequisicao(404, f"Paciente {_id_paciente} não encontrado.")
+    return resultado[0]
+
+def _resultado_busca(_retorno: tuple[bool, any]) -> list[dict]:
+    """Registros de uma consulta (True, [registros]); entrada inválida (ValueError) vira 400 e falha do banco, 500.
+    As buscas devolvem as colunas em maiúsculas: as chaves passam para minúsculas, como na busca por ID,
+    na página e na listagem em partes, para o recurso /pacientes ter um único formato."""
+    sucesso, resultado = _retorno
+    if not sucesso:
+        status = 400 if isinstance(resultado, ValueError) else 500
+        raise ErroRequisicao(status, f"Erro na pesquisa: {resultado}")
+    return [{coluna.lower(): valor for coluna, valor in registro.items()} for registro in resultado]
+
+def pesquisar_pacientes(_consulta: dict) -> list[dict] | dict:
+    """GET /pacientes com campo=... (texto ou número) ou com limite=... (página keyset)."""
+    campos = _campos_validos(_parametro(_consulta, "campos", "*"))
+    campo = (_parametro(_consulta, "campo") or "").upper()
+
+    if campo in COLUNAS_NUMERICAS:
+        operador = _parametro(_consulta, "operador", "=")
+        if operador not in OPERADORES_COMPARACAO:
+            raise ErroRequisicao(400, f"Operador inválido: {operador}")
+        valor = _inteiro(_parametro(_consulta, "valor"), "valor")
+        with origem_requisicao() as origem:
+            return _resultado_busca(consultar_paciente_por_numero(origem, campo, operador, valor, campos))
+
+    if campo:
+        texto = _parametro(_consulta, "texto", "")
+        modo = _parametro(_consulta, "modo", "contem")
+        if campo not in CAMPOS_BUSCA_TEXTUAL or modo not in ("contem", "prefixo") or not texto.strip():
+            raise ErroRequisicao(400, "Busca por texto exige campo válido, texto e modo 'contem' ou 'prefixo'.")
+        with origem_requisicao() as origem:
+            return _resultado_busca(consultar_paciente_por_texto(origem, campo, texto, campos, modo))
+
+    limite = _inteiro(_parametro(_consulta, "limite", TAMANHO_PAGINA_PADRAO), "limite")
+    apos_id = _parametro(_consulta, "apos_id")
+    with origem_requisicao() as origem:
+        sucesso, pagina = select_paciente_pagina(origem, campos, _apos_id=None if apos_id is None else _inteiro(apos_id, "apos_id"),
+                                                 _tamanho_pagina=max(1, min(limite, 1000)))
+    if not sucesso:
+        raise ErroRequisicao(500, f"Erro ao listar pacientes: {pagina}")
+    return pagina
+
+def pesquisar_pacientes_composto(_corpo: dict) -> list[dict]:
+    """POST /pacientes/busca. Filtros no formato de montar_condicoes_paciente."""
+    filtros = _corpo.get("filtros") if isinstance(_corpo, dict) else None
+    if not filtros or not isinstance(filtros, list):
+        raise ErroRequisicao(400, "Informe 'filtros' como uma lista.")
+
+    # Filtros inválidos são erro do cliente: validados antes de emprestar uma conexão
+    if not all(isinstance(filtro, dict) for filtro in filtros):
+        raise ErroRequisicao(400, "Cada filtro deve ser um objeto JSON.")
+    try:
+        montar_condicoes_paciente(filtros)
+    except KeyError as e:
+        raise ErroRequisicao(400, f"Filtro incompleto: falta {e}.")
+    except (ValueError, TypeError) as e:
+        raise ErroRequisicao(400, f"Filtro inválido: {e}")
+
+    campos = _campos_validos(_corpo.get("campos", "*"))
+    with origem_requisicao() as origem:
+        return _resultado_busca(consultar_paciente_composto(origem, filtros, campos))
+
+def alterar_paciente(_id_paciente: int, _valores: dict) -> dict:
+    """PATCH /pacientes/<id>. Aceita os campos do menu de atualização (ex: ENDERECO, DATA_NASCIMENTO)
+    ou as colunas de T_PACIENTE."""
+    if not isinstance(_valores, dict) or not _valores:
+        raise ErroRequisicao(400, "Informe ao menos um campo para atualizar.")
+
+    colunas = {}
+    for campo, valor in _valores.items():
+        try:
+            colunas.update(colunas_do_campo(campo.upper(), valor))
+        except (AttributeError, KeyError, TypeError):
+            raise ErroRequisicao(400, f"Valor inválido para o campo {campo}.")
+
+    with origem_requisicao() as origem:
+        sucesso, resultado = atualizar_pacientes_em_lote(origem, colunas, _ids=[_id_paciente])
+
+    if not sucesso:
+        status = 400 if isinstance(resultado["erro"], ValueError) else 500
+        raise ErroRequisicao(status, f"Erro ao atualizar paciente: {resultado['erro']}")
+    if resultado["nao_encontrados"]:
+        raise ErroRequisicao(404, f"Paciente {_id_paciente} não encontrado.")
+    return {"atualizado": True}
+
+def remover_paciente(_id_paciente: int) -> dict:
+    """DELETE /pacientes/<id>."""
+    with origem_requisicao() as origem:
+        sucesso, erro = deletar_paciente(origem, _id_paciente)
+
+    if not sucesso:
+        # deletar_paciente devolve texto quando o ID não existe e a exceção nos demais erros
+        raise ErroRequisicao(404 if isinstance(erro, str) else 500, str(erro))
+    return {"removido": True}
+
+# ========= HANDLER HTTP =========
+ROTA_PACIENTE_ID = re.compile(r"^/pacientes/(\d+)$")
+
+class ManipuladorPacientes(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ServicoPacientes/1.0"
+    # Cabeçalho e corpo saem em escritas separadas; sem TCP_NODELAY o keep-alive esperaria o ACK atrasado (~40ms)
+    disable_nagle_algorithm = True
+
+    def log_message(self, formato, *args):
+        if self.server.registrar_acessos:
+            super().log_message(formato, *args)
+
+    # --- Respostas ---
+    def _responder_json(self, _status: int, _conteudo) -> None:
+        corpo = json.dumps(_conteudo, ensure_ascii=False, default=_valor_json).encode("utf-8")
+        self.send_response(_status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _escrever_parte(self, _texto: str) -> None:
+        dados = _texto.encode("utf-8")
+        if dados:
+            self.wfile.write(f"{len(dados):X}\r\n".encode("ascii") + dados + b"\r\n")
+
+    def _responder_stream(self, _campos: str, _formato: str) -> None:
+        """Envia T_PACIENTE em partes, um lote do cursor por vez, sem montar a resposta inteira em memória."""
+        with origem_requisicao() as origem:
+            lotes = select_paciente_stream(origem, _campos, _tamanho_lote=TAMANHO_LOTE_STREAM,
+                                           _arraysize=TAMANHO_LOTE_STREAM, _prefetchrows=TAMANHO_LOTE_STREAM,
+                                           _filtro_sql="ORDER BY ID_PACIENTE")
+            try:
+                # Lê o primeiro lote antes do cabeçalho: um erro de banco ainda pode virar uma resposta 500
+                primeiro_lote = next(lotes, [])
+            except Exception as e:
+                raise ErroRequisicao(500, f"Erro ao listar pacientes: {e}")
+
+            tipo = "application/x-ndjson" if _formato == "ndjson" else "application/json"
+            self.send_response(200)
+            self.send_header("Content-Type", f"{tipo}; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            quantidade = 0
+            try:
+                if _formato == "json":
+                    self._escrever_parte("[")
+
+                lote = primeiro_lote
+                while lote:
+                    linhas = [json.dumps(registro, ensure_ascii=False, default=_valor_json) for registro in lote]
+                    if _formato == "json":
+                        self._escrever_parte(("," if quantidade else "") + ",".join(linhas))
+                    else:
+                        self._escrever_parte("\n".join(linhas) + "\n")
+                    quantidade += len(linhas)
+                    lote = next(lotes, [])
+
+                if _formato == "json":
+                    self._escrever_parte("]")
+                self.wfile.write(b"0\r\n\r\n")
+
+            except Exception as e:
+                # Com o cabeçalho já enviado, o erro só pode ser sinalizado encerrando a conexão sem a parte final
+                self.log_error("Exportação interrompida após %d linhas: %s", quantidade, e)
+                self.close_connection = True
+            finally:
+                lotes.close()
+
+    def _ler_corpo_json(self):
+        tamanho = _inteiro(self.headers.get("Content-Length", "0"), "Content-Length")
+        if tamanho > TAMANHO_MAXIMO_CORPO:
+            raise ErroRequisicao(413, "Corpo da requisição muito grande.")
+        try:
+            return json.loads(self.rfile.read(tamanho) or b"null")
+        except ValueError:
+            raise ErroRequisicao(400, "Corpo da requisição não é um JSON válido.")
+
+    def _tratar(self, _acao) -> None:
+        try:
+            _acao()
+        except ErroRequisicao as e:
+            self._responder_json(e.status, {"erro": e.mensagem})
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            self.log_error("Erro inesperado: %s", e)
+            self._responder_json(500, {"erro": str(e)})
+
+    # --- Métodos HTTP ---
+    def do_GET(self) -> None:
+        self._tratar(self._get)
+
+    def do_POST(self) -> None:
+        self._tratar(self._post)
+
+    def do_PATCH(self) -> None:
+        self._tratar(self._patch)
+
+    def do_DELETE(self) -> None:
+        self._tratar(self._delete)
+
+    def _get(self) -> None:
+        url = urlsplit(self.path)
+        consulta = parse_qs(url.query)
+        rota_id = ROTA_PACIENTE_ID.match(url.path)
+
+        if rota_id:
+            self._responder_json(200, obter_paciente(int(rota_id.group(1)), consulta))
+        elif url.path == "/pacientes/exportacao":
+            formato = _parametro(consulta, "formato", "json")
+            if formato not in ("json", "ndjson"):
+                raise ErroRequisicao(400, f"Formato de exportação inválido: {formato}")
+            self._responder_stream(_campos_validos(_parametro(consulta, "campos", "*")), formato)
+        elif url.path == "/pacientes":
+            if "campo" in consulta or "limite" in consulta or "apos_id" in consulta:
+                self._responder_json(200, pesquisar_pacientes(consulta))
+            else:
+                self._responder_stream(_campos_validos(_parametro(consulta, "campos", "*")), "json")
+        else:
+            raise ErroRequisicao(404, "Rota não encontrada.")
+
+    def _post(self) -> None:
+        path = urlsplit(self.path).path
+        if path == "/pacientes":
+            self._responder_json(201, cadastrar_paciente(self._ler_corpo_json()))
+        elif path == "/pacientes/busca":
+            self._responder_json(200, pesquisar_pacientes_composto(self._ler_corpo_json()))
+        else:
+            raise ErroRequisicao(404, "Rota não encontrada.")
+
+    def _patch(self) -> None:
+        rota_id = ROTA_PACIENTE_ID.match(urlsplit(self.path).path)
+        if not rota_id:
+            raise ErroRequisicao(404, "Rota não encontrada.")
+        self._responder_json(200, alterar_paciente(int(rota_id.group(1)), self._ler_corpo_json()))
+
+    def _delete(self) -> None:
+        rota_id = ROTA_PACIENTE_ID.match(urlsplit(self.path).path)
+        if not rota_id:
+            raise ErroRequisicao(404, "Rota não encontrada.")
+        self._responder_json(200, remover_paciente(int(rota_id.group(1))))
+
+def criar_servidor(_host: str, _porta: int, _registrar_acessos: bool = True) -> ThreadingHTTPServer:
+    """Cria o servidor (uma thread por conexão). A origem dos dados deve ser configurada antes."""
+    servidor = ThreadingHTTPServer((_host, _porta), ManipuladorPacientes)
+    servidor.daemon_threads = True
+    servidor.registrar_acessos = _registrar_acessos
+    return servidor
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON com o CRUD de pacientes.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--sqlite", metavar="ARQUIVO", help="usa o banco SQLite local em vez do Oracle")
+    parser.add_argument("--conexoes", type=int, default=8, help="sessões do pool / conexões SQLite (padrão: 8)")
+    parser.add_argument("--silencioso", action="store_true", help="não registra cada requisição no terminal")
+    parser.add_argument("--user", default=os.environ.get("ORACLE_USER"))
+    parser.add_argument("--password", default=os.environ.get("ORACLE_PASSWORD"))
+    parser.add_argument("--dsn", default=os.environ.get("ORACLE_DSN"))
+    args = parser.parse_args()
+
+    if args.sqlite:
+        sucesso, erro = configurar_origem_sqlite(args.sqlite, args.conexoes)
+    elif args.user and args.password and args.dsn:
+        sucesso, erro = configurar_origem_oracle(args.user, args.password, args.dsn, args.conexoes)
+    else:
+        print("Informe --sqlite ou usuário, senha e DSN (argumentos ou ORACLE_USER / ORACLE_PASSWORD / ORACLE_DSN).")
+        return 1
+
+    if not sucesso:
+        print(f"Erro ao conectar: {erro}")
+        return 1
+
+    servidor = criar_servidor(args.host, args.porta, not args.silencioso)
+    print(f"Serviço de pacientes em http://{args.host}:{args.porta} (Ctrl+C para encerrar)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando...")
+    finally:
+        servidor.server_close()
+        fechar_origem()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
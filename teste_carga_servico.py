@@ -0,0 +1,191 @@
+# ==========================================================
+#   TESTE DE CARGA DO SERVIÇO HTTP DE PACIENTES
+# ==========================================================
+# Dispara requisições concorrentes contra servico_pacientes.py e mostra requisições/s e latências p50/p99
+# por endpoint. Sem --url, sobe o serviço nesta mesma execução sobre um banco SQLite temporário
+# com --pacientes registros sintéticos (não precisa de Oracle).
+#
+# Mistura de requisições (por cliente, em conexões keep-alive):
+#   busca por ID, busca por texto, busca numérica, página, atualização e cadastro.
+#
+# Uso (no terminal):
+#   python teste_carga_servico.py
+#   python teste_carga_servico.py --clientes 16 --duracao 20 --pacientes 5000
+#   python teste_carga_servico.py --url http://127.0.0.1:8080
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+import http.client
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark_tabela import gerar_pacientes_sinteticos, dados_cadastro
+
+# (nome, peso) -> quantas vezes cada tipo de requisição aparece na mistura
+MISTURA_REQUISICOES = [
+    ("buscar_id", 40),
+    ("buscar_texto", 20),
+    ("buscar_numero", 10),
+    ("pagina", 10),
+    ("atualizar", 10),
+    ("cadastrar", 10),
+]
+
+
+def subir_servico_local(_pacientes: int, _conexoes: int) -> tuple[str, callable]:
+    """Popula um SQLite temporário e sobe o serviço em uma thread. Retorna (url, função para encerrar)."""
+    import servico_pacientes
+    from cadastro_paciente import conectar_sqlite, insert_paciente
+
+    diretorio = tempfile.mkdtemp(prefix="carga_pacientes_")
+    caminho = os.path.join(diretorio, "pacientes_carga.db")
+
+    sucesso, conexao = conectar_sqlite(caminho)
+    if not sucesso:
+        raise RuntimeError(f"Erro ao criar o banco local: {conexao}")
+    for paciente in gerar_pacientes_sinteticos(_pacientes):
+        sucesso, erro = insert_paciente(conexao, dados_cadastro(paciente))
+        if not sucesso:
+            raise RuntimeError(f"Erro ao popular o banco local: {erro}")
+    conexao.close()
+
+    sucesso, erro = servico_pacientes.configurar_origem_sqlite(caminho, _conexoes)
+    if not sucesso:
+        raise RuntimeError(f"Erro ao abrir o banco local: {erro}")
+
+    servidor = servico_pacientes.criar_servidor("127.0.0.1", 0, _registrar_acessos=False)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    def encerrar():
+        servidor.shutdown()
+        servidor.server_close()
+        servico_pacientes.fechar_origem()
+
+    return f"http://127.0.0.1:{servidor.server_address[1]}", encerrar
+
+
+def montar_requisicao(_tipo: str, _aleatorio: random.Random, _maior_id: int) -> tuple[str, str, dict | None]:
+    """Retorna (método, caminho, corpo) para um tipo da mistura."""
+    id_paciente = _aleatorio.randint(1, _maior_id)
+    match _tipo:
+        case "buscar_id":
+            return "GET", f"/pacientes/{id_paciente}?campos=ID_PACIENTE,NM_COMPLETO,STATUS_CONSULTA", None
+        case "buscar_texto":
+            texto = _aleatorio.choice(["silva", "souza", "oliveira", "carla", "joao", "pereira"])
+            return "GET", f"/pacientes?campo=NM_COMPLETO&texto={texto}&campos=ID_PACIENTE,NM_COMPLETO", None
+        case "buscar_numero":
+            return "GET", f"/pacientes?campo=NUMERO_ENDERECO&operador=%3D&valor={_aleatorio.randint(1, 3000)}&campos=ID_PACIENTE", None
+        case "pagina":
+            return "GET", f"/pacientes?apos_id={id_paciente}&limite=20&campos=ID_PACIENTE,NM_COMPLETO", None
+        case "atualizar":
+            return "PATCH", f"/pacientes/{id_paciente}", {"STATUS_CONSULTA": _aleatorio.choice(["Agendada", "Realizada", "Cancelada"])}
+        case _:
+            paciente = gerar_pacientes_sinteticos(1, _aleatorio.randint(0, 10 ** 6))[0]
+            return "POST", "/pacientes", dados_cadastro(paciente)
+
+
+def executar_cliente(_url: str, _fim: float, _semente: int, _maior_id: int) -> dict:
+    """Um cliente com conexão keep-alive enviando requisições até _fim. Retorna {tipo: [latências]} e erros."""
+    destino = urlsplit(_url)
+    conexao = http.client.HTTPConnection(destino.hostname, destino.port, timeout=30)
+    aleatorio = random.Random(_semente)
+    tipos = [nome for nome, peso in MISTURA_REQUISICOES for _ in range(peso)]
+
+    latencias = {nome: [] for nome, _ in MISTURA_REQUISICOES}
+    erros = {}
+    while time.perf_counter() < _fim:
+        tipo = aleatorio.choice(tipos)
+        metodo, caminho, corpo = montar_requisicao(tipo, aleatorio, _maior_id)
+        cabecalhos = {"Content-Type": "application/json"} if corpo is not None else {}
+        dados = json.dumps(corpo).encode("utf-8") if corpo is not None else None
+
+        inicio = time.perf_counter()
+        try:
+            conexao.request(metodo, caminho, body=dados, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            resposta.read()
+            status = resposta.status
+        except (OSError, http.client.HTTPException) as e:
+            conexao.close()
+            status = type(e).__name__
+        latencia = time.perf_counter() - inicio
+
+        # 404 é esperado em IDs removidos/inexistentes; o resto conta como erro
+        if status in (200, 201, 404):
+            latencias[tipo].append(latencia)
+        else:
+            erros[f"{tipo} {status}"] = erros.get(f"{tipo} {status}", 0) + 1
+
+    conexao.close()
+    return {"latencias": latencias, "erros": erros}
+
+
+def percentil(_valores: list[float], _p: int) -> float:
+    """Percentil _p (1 a 99) das latências, em segundos."""
+    if len(_valores) < 2:
+        return _valores[0] if _valores else 0.0
+    return statistics.quantiles(_valores, n=100, method="inclusive")[_p - 1]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP de pacientes.")
+    parser.add_argument("--url", help="serviço já em execução (padrão: sobe um serviço local com SQLite)")
+    parser.add_argument("--clientes", type=int, default=8, help="clientes simultâneos (padrão: 8)")
+    parser.add_argument("--duracao", type=float, default=10.0, help="duração do teste em segundos (padrão: 10)")
+    parser.add_argument("--pacientes", type=int, default=2000, help="registros do banco local (padrão: 2000)")
+    parser.add_argument("--maior-id", type=int, help="maior ID usado nas buscas (padrão: --pacientes)")
+    parser.add_argument("--conexoes", type=int, default=8, help="conexões SQLite do serviço local (padrão: 8)")
+    args = parser.parse_args()
+
+    encerrar = None
+    url = args.url
+    if not url:
+        print(f"Populando banco SQLite temporário com {args.pacientes} pacientes...")
+        url, encerrar = subir_servico_local(args.pacientes, args.conexoes)
+
+    maior_id = args.maior_id or args.pacientes
+    print(f"Carga em {url}: {args.clientes} clientes por {args.duracao:.0f}s\n")
+
+    inicio = time.perf_counter()
+    fim = inicio + args.duracao
+    with ThreadPoolExecutor(max_workers=args.clientes) as executor:
+        resultados = list(executor.map(lambda semente: executar_cliente(url, fim, semente, maior_id), range(args.clientes)))
+    tempo_total = time.perf_counter() - inicio
+
+    if encerrar:
+        encerrar()
+
+    print(f"{'endpoint':<15} | {'req':>7} | {'req/s':>8} | {'p50':>8} | {'p99':>8}")
+    print("-" * 58)
+    todas = []
+    for tipo, _ in MISTURA_REQUISICOES:
+        latencias = [latencia for resultado in resultados for latencia in resultado["latencias"][tipo]]
+        todas.extend(latencias)
+        print(f"{tipo:<15} | {len(latencias):>7} | {len(latencias) / tempo_total:>8.1f} | "
+              f"{percentil(latencias, 50) * 1000:>6.1f}ms | {percentil(latencias, 99) * 1000:>6.1f}ms")
+    print("-" * 58)
+    print(f"{'total':<15} | {len(todas):>7} | {len(todas) / tempo_total:>8.1f} | "
+          f"{percentil(todas, 50) * 1000:>6.1f}ms | {percentil(todas, 99) * 1000:>6.1f}ms")
+
+    erros = {}
+    for resultado in resultados:
+        for chave, quantidade in resultado["erros"].items():
+            erros[chave] = erros.get(chave, 0) + quantidade
+    if erros:
+        print("\nErros:")
+        for chave, quantidade in sorted(erros.items()):
+            print(f"  {quantidade:>6}  {chave}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())